@@ -0,0 +1,97 @@
+"""
+Count connections (TCP handshakes, plus TLS ones against real Otodom) opened by
+the crawl against local mock server: long-lived keep-alive connection pool vs
+former session closed after every request.
+
+Run from project root:
+    $ python -m benchmarks.bench_connections --pages 3 --workers 4
+"""
+import argparse
+import json
+import time
+from typing import Any, Dict
+
+from requests import Response
+from requests.sessions import Session
+
+from benchmarks.mock_server import MockOtodomServer
+from scraper.otodom_scraper import OtoDomScraper
+
+
+class PerRequestSessionScraper(OtoDomScraper):
+    """
+    Former behaviour - session used as context manager for every request,
+    which closes its connection pool afterwards.
+    """
+
+    def _init_session(self) -> Session:
+        session: Session = super()._init_session()
+        get = session.get
+
+        def get_and_close(*args: Any, **kwargs: Any) -> Response:
+            with session:
+                return get(*args, **kwargs)
+
+        session.get = get_and_close
+
+        return session
+
+
+def crawl(
+    scraper_class: type, args: argparse.Namespace
+) -> Dict[str, Any]:
+    with MockOtodomServer(pages=args.pages, latency=args.latency) as server:
+        params: Dict[str, Any] = {
+            **OtoDomScraper.PARAMS,
+            "search_base_url": server.search_base_url,
+            "result_base_url": server.result_base_url,
+            "page_limit": args.pages,
+            "workers": args.workers,
+            "requests_per_second": 0,
+            "verbose_logging": False,
+            "incremental": False,
+            "http_cache": {"enabled": False},
+            "checkpoint_file": None,
+            "throttle": {"enabled": False},
+        }
+
+        wall_start: float = time.perf_counter()
+        with scraper_class(params=params) as scraper:
+            adverts: int = sum(1 for _ in scraper.iter_site())
+        wall: float = time.perf_counter() - wall_start
+
+        return {
+            "adverts": adverts,
+            "requests": server.requests_served,
+            "connections_opened": server.connections_opened,
+            "wall_seconds": wall,
+        }
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    results: Dict[str, Any] = {
+        "config": vars(args),
+        "per_request_session": crawl(
+            scraper_class=PerRequestSessionScraper, args=args
+        ),
+        "keep_alive_pool": crawl(scraper_class=OtoDomScraper, args=args),
+    }
+    results["handshakes_saved"] = (
+        results["per_request_session"]["connections_opened"]
+        - results["keep_alive_pool"]["connections_opened"]
+    )
+
+    return results
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--pages", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--latency", type=float, default=0.01)
+
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    print(json.dumps(run(args=parse_args()), indent=2))
@@ -0,0 +1,182 @@
+"""
+End to end throughput benchmark of parse_site against local mock server
+replaying recorded fixture pages. Reports adverts/sec, p50/p95 per-advert
+latency, CPU time split across fetch, parse and validate stages and peak RSS,
+results are saved to JSON for tracking regressions between versions.
+
+Run from project root:
+    $ python -m benchmarks.bench_crawl --pages 3 --workers 8 --latency 0.05
+"""
+import argparse
+import json
+import platform
+import resource
+import statistics
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Callable, Dict, List
+
+from benchmarks.mock_server import MockOtodomServer
+from scraper.otodom_scraper import OtoDomScraper
+
+
+class InstrumentedScraper(OtoDomScraper):
+    """
+    OtoDomScraper with per-stage CPU timers (thread CPU time, so concurrent
+    workers are not counted twice) and per-advert wall latency.
+    """
+
+    def __init__(self, params: Dict[str, Any]) -> None:
+        super().__init__(params=params)
+        self.cpu_time: Dict[str, float] = defaultdict(float)
+        self.advert_latency: List[float] = []
+        self._lock: threading.Lock = threading.Lock()
+
+    def _timed(self, stage: str, function: Callable, **kwargs: Any) -> Any:
+        start: float = time.thread_time()
+        try:
+            return function(**kwargs)
+        finally:
+            with self._lock:
+                self.cpu_time[stage] += time.thread_time() - start
+
+    def get_listing_page_source(self, page_no: int) -> bytes:
+        return self._timed(
+            "fetch", super().get_listing_page_source, page_no=page_no
+        )
+
+    def get_estate_page_source(self, estate_url: str) -> bytes:
+        return self._timed(
+            "fetch", super().get_estate_page_source, estate_url=estate_url
+        )
+
+    def get_estate_links_from_listing(self, listing_soup: Any) -> List[str]:
+        return self._timed(
+            "parse",
+            super().get_estate_links_from_listing,
+            listing_soup=listing_soup,
+        )
+
+    def get_estate_details(self, estate_soup: Any) -> List[str]:
+        return self._timed(
+            "parse", super().get_estate_details, estate_soup=estate_soup
+        )
+
+    def build_estate_details(self, estate_details: List[str]) -> Any:
+        return self._timed(
+            "validate",
+            super().build_estate_details,
+            estate_details=estate_details,
+        )
+
+    def parse_estate(self, estate_url: str) -> Any:
+        start: float = time.perf_counter()
+        try:
+            return super().parse_estate(estate_url=estate_url)
+        finally:
+            with self._lock:
+                self.advert_latency.append(time.perf_counter() - start)
+
+
+def percentile(values: List[float], q: int) -> float:
+    if len(values) < 2:
+        return values[0] if values else 0.0
+
+    return statistics.quantiles(values, n=100, method="inclusive")[q - 1]
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    with MockOtodomServer(
+        pages=args.pages,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+    ) as server:
+        params: Dict[str, Any] = {
+            **OtoDomScraper.PARAMS,
+            "search_base_url": server.search_base_url,
+            "result_base_url": server.result_base_url,
+            "page_limit": args.pages,
+            "workers": args.workers,
+            "parse_processes": args.parse_processes,
+            "prefetch_pages": args.prefetch,
+            "requests_per_second": 0,
+            "verbose_logging": False,
+            "incremental": False,
+            "http_cache": {"enabled": False},
+            "checkpoint_file": None,
+            "dead_letter_file": None,
+            "throttle": {"enabled": args.throttle, "max_rate": 1000},
+            # Injected errors are not to pause the crawl
+            "circuit_breaker": {"enabled": False},
+            "listing_only": {
+                "enabled": args.listing_only,
+                "enrich": False,
+            },
+        }
+        scraper: InstrumentedScraper = InstrumentedScraper(params=params)
+
+        wall_start: float = time.perf_counter()
+        cpu_start: float = time.process_time()
+        adverts: int = sum(1 for _ in scraper.iter_site())
+        wall: float = time.perf_counter() - wall_start
+        cpu: float = time.process_time() - cpu_start
+
+        return {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "config": vars(args),
+            "adverts": adverts,
+            "requests": server.requests_served,
+            "errors_injected": server.errors_injected,
+            "connections_opened": server.connections_opened,
+            "wall_seconds": wall,
+            "adverts_per_second": adverts / wall if wall else 0.0,
+            "advert_latency_p50": percentile(scraper.advert_latency, 50),
+            "advert_latency_p95": percentile(scraper.advert_latency, 95),
+            "cpu_seconds": {"total": cpu, **scraper.cpu_time},
+            # ru_maxrss is in kilobytes on Linux
+            "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            / 1024,
+        }
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--pages", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--prefetch", type=int, default=2)
+    parser.add_argument(
+        "--parse-processes",
+        type=int,
+        default=0,
+        help="parse adverts on pool of processes (parse stage CPU time "
+        "is then spent outside of this process)",
+    )
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--jitter", type=float, default=0.02)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument(
+        "--throttle",
+        action="store_true",
+        help="crawl with adaptive throttle instead of unlimited rate",
+    )
+    parser.add_argument(
+        "--listing-only",
+        action="store_true",
+        help="build records from listing pages, without fetching adverts",
+    )
+    parser.add_argument("--output", default="bench_crawl.json")
+
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args: argparse.Namespace = parse_args()
+    results: Dict[str, Any] = run(args=args)
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+
+    print(json.dumps(results, indent=2))
@@ -0,0 +1,46 @@
+"""
+Compare description cleaning of EstateDetails (DescriptionCleaner) against
+former chained str.replace / re.sub / NFKD validator on a corpus of descriptions:
+recorded fixture adverts plus boilerplate and markup edge cases.
+
+Run from project root:
+    $ python -m benchmarks.bench_description
+"""
+import timeit
+from typing import Callable, Dict, List
+
+from data_types.description_cleaner import DescriptionCleaner
+from tests.fixtures import legacy_clean, load_corpus
+
+REPEAT: int = 200
+
+
+def run() -> Dict[str, float]:
+    corpus: List[str] = load_corpus()
+    cleaner: DescriptionCleaner = DescriptionCleaner()
+    cleaners: Dict[str, Callable[[str], str]] = {
+        "legacy": legacy_clean,
+        "cleaner": lambda description: cleaner.clean(description=description),
+    }
+
+    return {
+        label: min(
+            timeit.repeat(
+                lambda: [clean(description) for description in corpus],
+                number=REPEAT,
+                repeat=5,
+            )
+        )
+        / REPEAT
+        for label, clean in cleaners.items()
+    }
+
+
+if __name__ == "__main__":
+    timings: Dict[str, float] = run()
+    print(
+        f"corpus of {len(load_corpus())} descriptions: "
+        f"legacy {timings['legacy'] * 1e6:.1f} us, "
+        f"cleaner {timings['cleaner'] * 1e6:.1f} us, "
+        f"speedup x{timings['legacy'] / timings['cleaner']:.2f}"
+    )
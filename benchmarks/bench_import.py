@@ -0,0 +1,112 @@
+"""
+Measure start-up cost of the scraper with python -X importtime: cumulative
+import time of entry modules, the slowest imported modules and heavy
+dependencies loaded by the import alone (lazy ones should not be).
+
+Run from project root:
+    $ python -m benchmarks.bench_import --repeat 5
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from typing import Any, Dict, List
+
+ENTRY_MODULES: List[str] = ["main", "scraper.otodom_scraper"]
+# Imported only on the path which needs them
+LAZY_MODULES: List[str] = [
+    "aiohttp",
+    "asyncio",
+    "bs4",
+    "concurrent.futures.process",
+    "multiprocessing",
+    "pyarrow",
+]
+
+
+def import_times(module: str) -> Dict[str, int]:
+    """
+    Import module in fresh interpreter.
+
+    Returns:
+        Dict[str, int]: cumulative import time (us) of every module imported
+            by module (not by interpreter start-up)
+    """
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times: Dict[str, int] = {}
+
+    # Imports are reported after their own imports, top level one closes tree
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not cumulative.strip().isdigit():
+            continue
+        times[name.strip()] = int(cumulative)
+        if not name.startswith("  ") and name.strip() != module:
+            times = {}
+
+    return times
+
+
+def measure(module: str, args: argparse.Namespace) -> Dict[str, Any]:
+    runs: List[Dict[str, int]] = [
+        import_times(module=module) for _ in range(args.repeat)
+    ]
+    # Median of every module over runs, noise of a single run is high
+    modules: Dict[str, float] = {
+        name: statistics.median(run.get(name, 0) for run in runs)
+        for name in runs[0]
+    }
+    slowest: List[str] = sorted(
+        (name for name in modules if name != module),
+        key=modules.__getitem__,
+        reverse=True,
+    )[: args.top]
+
+    return {
+        "total_ms": modules[module] / 1000,
+        "slowest_ms": {name: modules[name] / 1000 for name in slowest},
+        "lazy_modules_loaded": [
+            name for name in LAZY_MODULES if name in runs[0]
+        ],
+    }
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    return {
+        "config": vars(args),
+        "python": sys.version.split()[0],
+        **{module: measure(module=module, args=args) for module in args.modules},
+    }
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--modules", nargs="+", default=ENTRY_MODULES)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument(
+        "--output",
+        default="benchmarks/results/importtime.json",
+        help="results file, tracked in the repo to compare start-up cost",
+    )
+
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args: argparse.Namespace = parse_args()
+    results: Dict[str, Any] = run(args=args)
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+        f.write("\n")
+
+    print(json.dumps(results, indent=2))
@@ -0,0 +1,55 @@
+"""
+Compare __NEXT_DATA__ extraction from raw bytes against full Bs4 parsing
+on saved fixture pages.
+
+Run from project root:
+    $ python -m benchmarks.bench_next_data
+"""
+import timeit
+from typing import Callable, Dict
+
+from bs4 import BeautifulSoup
+
+from scraper.next_data import extract_next_data, next_data_from_soup
+from tests.fixtures import read_fixture
+
+PAGES = ["listing_page.html", "estate_page.html"]
+REPEAT: int = 20
+
+
+def bs4_path(page: bytes) -> str:
+    return next_data_from_soup(soup=BeautifulSoup(page, "html.parser"))
+
+
+def fast_path(page: bytes) -> str:
+    return extract_next_data(page_source=page)
+
+
+def run() -> Dict[str, Dict[str, float]]:
+    results: Dict[str, Dict[str, float]] = {}
+    extractors: Dict[str, Callable[[bytes], str]] = {
+        "bs4": bs4_path,
+        "fast": fast_path,
+    }
+
+    for name in PAGES:
+        page: bytes = read_fixture(name)
+
+        results[name] = {
+            label: min(
+                timeit.repeat(lambda: extractor(page), number=REPEAT, repeat=3)
+            )
+            / REPEAT
+            for label, extractor in extractors.items()
+        }
+
+    return results
+
+
+if __name__ == "__main__":
+    for page, timings in run().items():
+        print(
+            f"{page}: bs4 {timings['bs4'] * 1000:.3f} ms, "
+            f"fast {timings['fast'] * 1000:.3f} ms, "
+            f"speedup x{timings['bs4'] / timings['fast']:.0f}"
+        )
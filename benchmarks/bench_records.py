@@ -0,0 +1,111 @@
+"""
+Compare Estate pydantic model against compact EstateRecord (fast_records) on
+details of recorded fixture adverts: records built per second and memory held
+per record.
+
+Run from project root:
+    $ python -m benchmarks.bench_records
+"""
+import json
+import timeit
+import tracemalloc
+from typing import Any, Callable, Dict, List, Tuple
+
+from data_types.estate import Estate
+from data_types.estate_record import EstateRecord
+from scraper.next_data import extract_next_data
+from scraper.otodom_scraper import OtoDomScraper
+from tests.fixtures import read_fixture
+
+REPEAT: int = 200
+RECORDS: int = 10000
+
+
+def load_details() -> List[Tuple[str, List[str]]]:
+    """
+    Returns url and details of fixture advert, as collected by
+    OtoDomScraper.get_estate_details.
+    """
+    script_json: Dict[str, Any] = json.loads(
+        extract_next_data(page_source=read_fixture("estate_page.html"))
+    )
+
+    return [
+        (
+            "https://www.otodom.pl/pl/oferta/fixture-advert",
+            OtoDomScraper.details_from_next_data(script_json=script_json),
+        )
+    ]
+
+
+def build_model(url: str, estate_details: List[str]) -> Estate:
+    return Estate(
+        url=url,
+        details=OtoDomScraper.build_estate_details(
+            estate_details=estate_details
+        ),
+    )
+
+
+def build_record(url: str, estate_details: List[str]) -> EstateRecord:
+    return EstateRecord.from_details(url=url, estate_details=estate_details)
+
+
+BUILDERS: Dict[str, Callable[[str, List[str]], Any]] = {
+    "model": build_model,
+    "record": build_record,
+}
+
+
+def bytes_per_record(build: Callable[[str, List[str]], Any]) -> float:
+    """
+    Returns memory allocated per record kept alive in a list of RECORDS.
+    """
+    url, estate_details = load_details()[0]
+
+    tracemalloc.start()
+    before: int = tracemalloc.get_traced_memory()[0]
+    records: List[Any] = [
+        build(f"{url}-{i}", estate_details) for i in range(RECORDS)
+    ]
+    held: int = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del records
+
+    return held / RECORDS
+
+
+def run() -> Dict[str, Dict[str, float]]:
+    details: List[Tuple[str, List[str]]] = load_details()
+
+    return {
+        label: {
+            "records_per_second": REPEAT
+            * len(details)
+            / min(
+                timeit.repeat(
+                    lambda: [
+                        build(url, estate_details)
+                        for url, estate_details in details
+                    ],
+                    number=REPEAT,
+                    repeat=5,
+                )
+            ),
+            "bytes_per_record": bytes_per_record(build=build),
+        }
+        for label, build in BUILDERS.items()
+    }
+
+
+if __name__ == "__main__":
+    results: Dict[str, Dict[str, float]] = run()
+    for label, result in results.items():
+        print(
+            f"{label}: {result['records_per_second']:.0f} records/sec, "
+            f"{result['bytes_per_record']:.0f} bytes per record"
+        )
+    print(
+        "speedup x"
+        f"{results['record']['records_per_second'] / results['model']['records_per_second']:.2f}"
+    )
@@ -0,0 +1,146 @@
+"""
+Local stand-in of Otodom serving recorded fixture pages (tests/fixtures),
+with configurable latency, jitter and error injection.
+"""
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List
+from urllib.parse import parse_qs, urlsplit
+
+from scraper.next_data import NEXT_DATA_MARKER, SCRIPT_CLOSE
+from tests.fixtures import read_fixture
+
+
+class MockOtodomServer:
+    """
+    Serves listing pages (/pl/oferty/...?page=N) built from listing fixture with
+    slugs unique per page, and advert fixture for every /pl/oferta/<slug>.
+    Pages after `pages` have empty searchAds.items. Errors (503) are injected
+    into advert responses with error_rate probability.
+    """
+
+    def __init__(
+        self,
+        pages: int = 3,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        seed: int = 0,
+    ) -> None:
+        self.pages: int = pages
+        self.latency: float = latency
+        self.jitter: float = jitter
+        self.error_rate: float = error_rate
+        self.random: random.Random = random.Random(seed)
+        self.requests_served: int = 0
+        self.errors_injected: int = 0
+        self.connections_opened: int = 0
+        # Most requests served at the same time
+        self.peak_in_flight: int = 0
+        self._in_flight: int = 0
+        self._lock: threading.Lock = threading.Lock()
+
+        listing: bytes = read_fixture("listing_page.html")
+        start: int = listing.index(b">", listing.index(NEXT_DATA_MARKER)) + 1
+        end: int = listing.index(SCRIPT_CLOSE, start)
+        self.listing_prefix: bytes = listing[:start]
+        self.listing_suffix: bytes = listing[end:]
+        self.listing_data: Dict[str, Any] = json.loads(listing[start:end])
+        self.estate_page: bytes = read_fixture("estate_page.html")
+
+        self.server: ThreadingHTTPServer = ThreadingHTTPServer(
+            ("127.0.0.1", 0), self._handler()
+        )
+        self.server.daemon_threads = True
+        self.url: str = f"http://127.0.0.1:{self.server.server_port}"
+
+    def __enter__(self) -> "MockOtodomServer":
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    @property
+    def search_base_url(self) -> str:
+        return f"{self.url}/pl/oferty/"
+
+    @property
+    def result_base_url(self) -> str:
+        return f"{self.url}/pl/oferta/"
+
+    def listing_page(self, page: int) -> bytes:
+        data: Dict[str, Any] = json.loads(json.dumps(self.listing_data))
+        items: List[Dict[str, Any]] = data["props"]["pageProps"]["data"][
+            "searchAds"
+        ]["items"]
+
+        if page > self.pages:
+            items.clear()
+        for item in items:
+            item["slug"] = f"{item['slug']}-p{page}"
+
+        return (
+            self.listing_prefix
+            + json.dumps(data, ensure_ascii=False).encode("utf-8")
+            + self.listing_suffix
+        )
+
+    def _handler(self) -> type:
+        mock: "MockOtodomServer" = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self) -> None:
+                super().setup()
+                with mock._lock:
+                    mock.connections_opened += 1
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+            def do_GET(self) -> None:
+                url = urlsplit(self.path)
+
+                with mock._lock:
+                    mock.requests_served += 1
+                    delay: float = mock.latency + mock.random.uniform(
+                        0, mock.jitter
+                    )
+                    failed: bool = url.path.startswith(
+                        "/pl/oferta/"
+                    ) and (mock.random.random() < mock.error_rate)
+                    if failed:
+                        mock.errors_injected += 1
+                    mock._in_flight += 1
+                    mock.peak_in_flight = max(
+                        mock.peak_in_flight, mock._in_flight
+                    )
+
+                time.sleep(delay)
+                with mock._lock:
+                    mock._in_flight -= 1
+
+                if failed:
+                    self.respond(status=503, body=b"Service Unavailable")
+                elif url.path.startswith("/pl/oferta/"):
+                    self.respond(status=200, body=mock.estate_page)
+                elif url.path.startswith("/pl/oferty/"):
+                    page: int = int(parse_qs(url.query).get("page", ["1"])[0])
+                    self.respond(status=200, body=mock.listing_page(page))
+                else:
+                    self.respond(status=404, body=b"Not Found")
+
+            def respond(self, status: int, body: bytes) -> None:
+                self.send_response(status)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        return Handler
@@ -1,5 +1,6 @@
+from functools import lru_cache
 from os import path
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 import yaml
 
@@ -25,3 +26,24 @@ class ParametersHandler:
         Return all handler params from "parameters.yaml" in a Dict.
         """
         return self.handler if self.handler else {}
+
+
+@lru_cache(maxsize=None)
+def load_params() -> Dict[str, Any]:
+    """
+    Return params from "parameters.yaml" - file is parsed once per process,
+    on first call (not at import time).
+    """
+    return ParametersHandler().get_params()
+
+
+class DefaultParams:
+    """
+    Class attribute resolving to "parameters.yaml" params on first access.
+    Params assigned to instance take precedence.
+    """
+
+    def __get__(
+        self, instance: Any, owner: Optional[type] = None
+    ) -> Dict[str, Any]:
+        return load_params()
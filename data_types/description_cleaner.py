@@ -0,0 +1,106 @@
+import re
+import threading
+import unicodedata
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Iterable, Iterator, Optional, Pattern, Tuple
+
+from config.config_handler import load_params
+
+# Footers added by agency software, removed from advert descriptions
+# (can be overridden with description_boilerplate in parameters.yaml)
+BOILERPLATE_PHRASES: Tuple[str, ...] = (
+    "Oferta wysłana z programu dla biur nieruchomości ASARI CRM ()",
+    "Oferta pochodzi z serwisu obido",
+)
+
+# Line breaks are gone before tags are stripped, so [^>]* matches exactly
+# what "<.*?>" did, without lazy quantifier backtracking
+HTML_TAG: Pattern[str] = re.compile(r"<[^>]*>")
+
+
+class DescriptionCleaner:
+    """
+    Advert description cleaning: boilerplate phrases removal, line breaks to spaces,
+    HTML tags stripping and NFKD normalisation (NBSP to space). Each step is
+    its own C-level pass (str.replace per phrase and line break, precompiled
+    tag pattern), about six passes in total - one alternation of all of them
+    would need Python replacement function called per match.
+    """
+
+    def __init__(self, phrases: Iterable[str] = BOILERPLATE_PHRASES) -> None:
+        """
+        Args:
+            phrases (Iterable[str]): boilerplate phrases removed in given order
+        """
+        self.phrases: Tuple[str, ...] = tuple(phrases)
+
+    def clean(self, description: str) -> str:
+        """
+        Returns cleaned description.
+
+        Args:
+            description (str): raw description (HTML) from advert
+
+        Returns:
+            str: plain text description
+        """
+        for phrase in self.phrases:
+            description = description.replace(phrase, "")
+
+        description = HTML_TAG.sub(
+            "", description.replace("\n", " ").replace("\r", "")
+        )
+
+        return unicodedata.normalize("NFKD", description)
+
+
+# Phrases of scraper params, set for models validated by current thread
+# (see description_phrases)
+_active: threading.local = threading.local()
+
+
+@lru_cache(maxsize=None)
+def _build_cleaner(phrases: Tuple[str, ...]) -> DescriptionCleaner:
+    return DescriptionCleaner(phrases=phrases)
+
+
+@lru_cache(maxsize=None)
+def default_phrases() -> Tuple[str, ...]:
+    """
+    Returns boilerplate phrases of parameters.yaml (description_boilerplate).
+    """
+    return tuple(
+        load_params().get("description_boilerplate", BOILERPLATE_PHRASES)
+    )
+
+
+def get_description_cleaner(
+    phrases: Optional[Iterable[str]] = None,
+) -> DescriptionCleaner:
+    """
+    Returns cleaner with given boilerplate phrases - phrases set for current
+    thread by description_phrases or parameters.yaml ones if not given. One
+    cleaner is built per set of phrases.
+    """
+    if phrases is None:
+        phrases = getattr(_active, "phrases", None)
+    if phrases is None:
+        phrases = default_phrases()
+
+    return _build_cleaner(tuple(phrases))
+
+
+@contextmanager
+def description_phrases(phrases: Optional[Iterable[str]]) -> Iterator[None]:
+    """
+    Descriptions of models validated by current thread within the block are
+    cleaned with given boilerplate phrases (description_boilerplate of scraper
+    params), parameters.yaml ones if None.
+    """
+    previous: Optional[Tuple[str, ...]] = getattr(_active, "phrases", None)
+    _active.phrases = tuple(phrases) if phrases is not None else None
+    try:
+        yield
+    finally:
+        _active.phrases = previous
@@ -1,3 +1,5 @@
+from typing import Any, Dict, List, Sequence, Tuple
+
 from pydantic import BaseModel
 
 from data_types.estate_details import EstateDetails
@@ -10,6 +12,24 @@ class Estate(BaseModel):
 
     url: str
     details: EstateDetails
+    # Names of search profiles which found the advert (multi-search crawl)
+    profiles: List[str] = []
+
+    def dict(self, **kwargs: Any) -> Dict[str, Any]:
+        # Single-search records keep their shape (no profiles column)
+        data: Dict[str, Any] = super().dict(**kwargs)
+        if not self.profiles:
+            data.pop("profiles", None)
+
+        return data
+
+    def __repr_args__(self) -> Sequence[Tuple[str, Any]]:
+        # Same for str(), so txt results of single search are unchanged
+        return [
+            (name, value)
+            for name, value in super().__repr_args__()
+            if name != "profiles" or value
+        ]
 
     class Config:
         allow_extra = False
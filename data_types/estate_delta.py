@@ -0,0 +1,52 @@
+from typing import Any, Dict, List, Union
+
+from data_types.estate import Estate
+from data_types.estate_record import EstateRecord
+
+
+class EstateDelta:
+    """
+    Record of advert changed since last crawl (change_detection in parameters.yaml)
+    - estate record with names of changed fields, all fields for new advert.
+    Written in record shape with extra changed field.
+    """
+
+    __slots__ = ("record", "changed", "fingerprints")
+
+    def __init__(
+        self,
+        record: Union[Estate, EstateRecord],
+        changed: List[str],
+        fingerprints: Dict[str, str],
+    ) -> None:
+        """
+        Args:
+            record (Union[Estate, EstateRecord]): validated estate record
+            changed (List[str]): names of changed details fields
+            fingerprints (Dict[str, str]): current field fingerprints, stored
+                once record is written
+        """
+        self.record: Union[Estate, EstateRecord] = record
+        self.changed: List[str] = changed
+        self.fingerprints: Dict[str, str] = fingerprints
+
+    @property
+    def url(self) -> str:
+        return self.record.url
+
+    @property
+    def profiles(self) -> List[str]:
+        return self.record.profiles
+
+    @profiles.setter
+    def profiles(self, profiles: List[str]) -> None:
+        self.record.profiles = profiles
+
+    def dict(self) -> Dict[str, Any]:
+        return {**self.record.dict(), "changed": list(self.changed)}
+
+    def __str__(self) -> str:
+        return f"{self.record} changed={self.changed!r}"
+
+    def __repr__(self) -> str:
+        return f"EstateDelta({self})"
@@ -1,9 +1,56 @@
-import re
-import unicodedata
-from typing import Pattern
-
 from pydantic import BaseModel, validator
 
+from data_types.description_cleaner import get_description_cleaner
+
+
+def clean_price(price: str) -> str:
+    """
+    Returns price without currency - shared by EstateDetails and EstateRecord.
+
+    Args:
+        price (str): price from advert, e.g. "100 zł"
+
+    Returns:
+        str: price value
+    """
+    try:
+        return price.replace(" zł", "")
+    except (AttributeError, TypeError):
+        raise AttributeError("price value not provided or not string")
+
+
+def clean_size(size: str) -> str:
+    """
+    Returns size without unit - shared by EstateDetails and EstateRecord.
+
+    Args:
+        size (str): size from advert, e.g. "10 m²"
+
+    Returns:
+        str: size value
+    """
+    try:
+        return size.replace(" m²", "")
+    except (AttributeError, TypeError):
+        raise AttributeError("size value not provided or not string")
+
+
+def clean_description(description: str) -> str:
+    """
+    Returns description cleaned by DescriptionCleaner - shared by
+    EstateDetails and EstateRecord.
+
+    Args:
+        description (str): raw description (HTML) from advert
+
+    Returns:
+        str: plain text description
+    """
+    try:
+        return get_description_cleaner().clean(description=description)
+    except (AttributeError, TypeError):
+        raise AttributeError("description not provided or not string")
+
 
 class EstateDetails(BaseModel):
     """
@@ -17,45 +64,15 @@ class EstateDetails(BaseModel):
 
     @validator("price", pre=True)
     def validate_price(cls, price: str) -> str:
-        try:
-            return price.replace(" zł", "")
-        except:
-            raise AttributeError(
-                "price value not provided or not string"
-            )
+        return clean_price(price=price)
 
     @validator("size", pre=True)
     def validate_size(cls, size: str) -> str:
-        try:
-            return size.replace(" m²", "")
-        except:
-            raise AttributeError(
-                "size value not provided or not string"
-            )
+        return clean_size(size=size)
 
     @validator("description", pre=True)
     def validate_description(cls, description: str) -> str:
-        try:
-            des: str = (
-                description.replace(
-                    "Oferta wysłana z programu dla biur nieruchomości ASARI CRM ()",
-                    "",
-                )
-                .replace("Oferta pochodzi z serwisu obido", "")
-                .replace("\n", " ")
-                .replace("\r", "")
-            )
-
-            # Remove HTML tags
-            clear_tags: Pattern[str] = re.compile("<.*?>")
-            d: str = re.sub(clear_tags, "", des)
-
-            # Remove \xa0
-            return unicodedata.normalize("NFKD", d)
-        except:
-            raise AttributeError(
-                "description not provided or not string"
-            )
+        return clean_description(description=description)
 
     class Config:
         allow_extra = False
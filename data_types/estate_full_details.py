@@ -0,0 +1,55 @@
+from typing import Any, List, Optional
+
+from pydantic import validator
+
+from data_types.estate_details import EstateDetails
+
+
+class EstateFullDetails(EstateDetails):
+    """
+    Estate details model extended with all structured advert data
+    (full_details in parameters.yaml). Fields missing in advert are None.
+    """
+
+    advert_id: Optional[int] = None
+    title: Optional[str] = None
+    created_at: Optional[str] = None
+    modified_at: Optional[str] = None
+    price_per_m: Optional[float] = None
+    rooms: Optional[int] = None
+    floor: Optional[str] = None
+    building_floors: Optional[int] = None
+    build_year: Optional[int] = None
+    market: Optional[str] = None
+    building_type: Optional[str] = None
+    heating: Optional[str] = None
+    province: Optional[str] = None
+    district: Optional[str] = None
+    street: Optional[str] = None
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    features: List[str] = []
+
+    @validator(
+        "price_per_m",
+        "rooms",
+        "building_floors",
+        "build_year",
+        "latitude",
+        "longitude",
+        pre=True,
+    )
+    def validate_number(cls, value: Any) -> Any:
+        # Non-numeric values (e.g. "more" rooms) stored as missing
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return None
+
+    @validator("floor", pre=True)
+    def validate_floor(cls, floor: Optional[str]) -> Optional[str]:
+        # "floor_2" -> "2", named floors (ground_floor, garret...) kept
+        if isinstance(floor, str) and floor.startswith("floor_"):
+            return floor[len("floor_") :]
+
+        return floor
@@ -0,0 +1,113 @@
+from typing import Any, Dict, List, Optional
+
+from data_types.estate import Estate
+from data_types.estate_details import (
+    EstateDetails,
+    clean_description,
+    clean_price,
+    clean_size,
+)
+
+
+class EstateRecord:
+    """
+    Compact estate record for crawl hot path (fast_records in parameters.yaml) -
+    validated the same way as Estate/EstateDetails models, without pydantic
+    overhead. Estate model is built on demand with to_model.
+    """
+
+    __slots__ = ("url", "price", "size", "location", "description", "profiles")
+
+    def __init__(
+        self,
+        url: str,
+        price: str,
+        size: str,
+        location: str,
+        description: str,
+        profiles: Optional[List[str]] = None,
+    ) -> None:
+        self.url: str = url
+        self.price: str = price
+        self.size: str = size
+        self.location: str = location
+        self.description: str = description
+        # Names of search profiles which found the advert (multi-search crawl)
+        self.profiles: List[str] = profiles if profiles is not None else []
+
+    @classmethod
+    def from_details(
+        cls, url: str, estate_details: List[str]
+    ) -> "EstateRecord":
+        """
+        Build record from details collected by OtoDomScraper.get_estate_details,
+        applying EstateDetails validators.
+
+        Args:
+            url (str): estate advert url
+            estate_details (List[str]): price, size, location and description
+
+        Returns:
+            EstateRecord: validated record
+        """
+        price, size, location, description = estate_details
+
+        if not isinstance(location, str):
+            # Same coercion as pydantic str field
+            if not isinstance(location, (int, float)):
+                raise ValueError("location not provided or not string")
+            location = str(location)
+
+        return cls(
+            url=url,
+            price=clean_price(price=price),
+            size=clean_size(size=size),
+            location=location,
+            description=clean_description(description=description),
+        )
+
+    def dict(self) -> Dict[str, Any]:
+        """
+        Returns record in Estate.dict() shape.
+        """
+        data: Dict[str, Any] = {
+            "url": self.url,
+            "details": {
+                "price": self.price,
+                "size": self.size,
+                "location": self.location,
+                "description": self.description,
+            },
+        }
+        if self.profiles:
+            data["profiles"] = list(self.profiles)
+
+        return data
+
+    def to_model(self) -> Estate:
+        """
+        Returns Estate model of the record.
+        """
+        return Estate(
+            url=self.url,
+            details=EstateDetails.construct(
+                price=self.price,
+                size=self.size,
+                location=self.location,
+                description=self.description,
+            ),
+            profiles=list(self.profiles),
+        )
+
+    def __str__(self) -> str:
+        # Same as str(Estate), so txt results do not depend on record type
+        text: str = (
+            f"url={self.url!r} details=EstateDetails(price={self.price!r}, "
+            f"size={self.size!r}, location={self.location!r}, "
+            f"description={self.description!r})"
+        )
+
+        return f"{text} profiles={self.profiles!r}" if self.profiles else text
+
+    def __repr__(self) -> str:
+        return f"EstateRecord({self})"
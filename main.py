@@ -1,15 +1,189 @@
-from typing import Any, Dict, List
+import argparse
+import logging
+from os import path
+from typing import Any, Dict
 
-from config.config_handler import ParametersHandler
-from data_types.estate import Estate
+from config.config_handler import load_params
+from scraper.multi_search import MultiSearchScraper
 from scraper.otodom_scraper import OtoDomScraper
 
+
+def save_work_queue(
+    params: Dict[str, Any], seed: bool, work: bool, serve: bool = False
+) -> None:
+    # Imported here so plain crawl does not open work queue
+    from scraper.distributed import (
+        CrawlCoordinator,
+        QueueWorker,
+        open_work_queue,
+    )
+    from storage.work_queue_api import WorkQueueServer
+
+    queue = open_work_queue(params=params, serving=serve)
+
+    if seed:
+        CrawlCoordinator(queue=queue, params=params).seed()
+
+    if serve:
+        settings: Dict[str, Any] = params.get("work_queue") or {}
+        server = WorkQueueServer(
+            queue=queue,
+            host=settings.get("host", "127.0.0.1"),
+            port=settings.get("port", 8765),
+        )
+        logging.info(msg=f"### Serving work queue at {server.url} ###")
+        # Until interrupted - nodes of other hosts work the queue meanwhile
+        server.serve_forever()
+
+    if work:
+        with QueueWorker(queue=queue, params=params) as worker:
+            # Results file per node
+            root, ext = path.splitext(params["results_file"])
+            worker.scraper.save_data(
+                temp_path=f"{root}_{worker.node_id}{ext}",
+                to_write=worker.iter_estates(),
+            )
+
+    queue.close()
+
+
+def save_replay(params: Dict[str, Any]) -> None:
+    # Checkpoint of interrupted crawl is kept for its --resume
+    with OtoDomScraper(params={**params, "checkpoint_file": None}) as scraper:
+        # Replayed adverts saved aside, results of the crawl are kept
+        root, ext = path.splitext(params["results_file"])
+        scraper.save_data(
+            temp_path=f"{root}_replay{ext}",
+            to_write=scraper.iter_dead_letters(),
+        )
+
+
+def save_reparse(params: Dict[str, Any]) -> None:
+    # Imported here so crawl does not start process pool machinery
+    from scraper.reparse import iter_reparsed
+
+    # Scraper only writes results - archive is read by iter_reparsed alone,
+    # checkpoint of interrupted crawl is kept for its --resume
+    with OtoDomScraper(
+        params={
+            **params,
+            "checkpoint_file": None,
+            "raw_archive": {**params.get("raw_archive", {}), "enabled": False},
+        }
+    ) as scraper:
+        root, ext = path.splitext(params["results_file"])
+        scraper.save_data(
+            temp_path=f"{root}_reparse{ext}",
+            to_write=iter_reparsed(params=params),
+        )
+
+
+async def save_site_async(temp_path: str) -> None:
+    # Imported here so sync backend does not require aiohttp (nor load asyncio)
+    from scraper.async_otodom_scraper import AsyncOtoDomScraper
+
+    async with AsyncOtoDomScraper() as scraper:
+        with scraper.open_results_writer(temp_path=temp_path) as writer:
+            async for estate in scraper.iter_site():
+                writer.write(estate)
+
+
 if __name__ == "__main__":
 
-    PARAMS: Dict[str, Any] = ParametersHandler().get_params()
-    scraper: OtoDomScraper = OtoDomScraper()
+    PARAMS: Dict[str, Any] = load_params()
 
-    estates: List[Estate] = scraper.parse_site()
-    scraper.save_data(
-        temp_path=PARAMS["results_file"], to_write=estates
+    parser = argparse.ArgumentParser(description="Otodom AJAX scraper")
+    parser.add_argument(
+        "--backend",
+        choices=["sync", "async"],
+        default=PARAMS.get("backend", "sync"),
+        help="scraper backend (default from parameters.yaml)",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="continue interrupted crawl from checkpoint",
+    )
+    parser.add_argument(
+        "--seed",
+        action="store_true",
+        help="queue listing pages in work queue (coordinator)",
+    )
+    parser.add_argument(
+        "--queue",
+        action="store_true",
+        help="work tasks of work queue shared with other nodes",
     )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="serve work queue to nodes of other hosts (coordinator)",
+    )
+    parser.add_argument(
+        "--replay",
+        action="store_true",
+        help="crawl again adverts of dead-letter file",
+    )
+    parser.add_argument(
+        "--reparse",
+        action="store_true",
+        help="rebuild records from raw archive, without fetching",
+    )
+    args = parser.parse_args()
+
+    if args.resume and (args.backend == "async" or PARAMS.get("searches")):
+        parser.error("--resume is supported for sync backend and single search")
+    if (args.seed or args.queue or args.serve) and (
+        args.backend == "async" or args.resume
+    ):
+        parser.error(
+            "--seed/--queue/--serve are supported for sync backend without --resume"
+        )
+    if args.serve and args.queue:
+        parser.error("--serve runs until interrupted, run --queue node aside")
+    if args.replay and (
+        args.backend == "async"
+        or args.resume
+        or args.seed
+        or args.queue
+        or args.serve
+    ):
+        parser.error("--replay is supported for sync backend alone")
+    if (PARAMS.get("listing_only") or {}).get("enabled") and (
+        args.backend == "async"
+        or PARAMS.get("searches")
+        or args.seed
+        or args.queue
+        or args.serve
+    ):
+        parser.error("listing_only is supported for sync backend and single search")
+    if args.reparse and (
+        args.resume or args.seed or args.queue or args.serve or args.replay
+    ):
+        parser.error("--reparse is not combined with other modes")
+
+    if args.reparse:
+        save_reparse(params=PARAMS)
+    elif args.replay:
+        save_replay(params=PARAMS)
+    elif args.seed or args.queue or args.serve:
+        save_work_queue(
+            params=PARAMS, seed=args.seed, work=args.queue, serve=args.serve
+        )
+    elif args.backend == "async":
+        # Imported here so sync backend does not load asyncio
+        import asyncio
+
+        asyncio.run(save_site_async(temp_path=PARAMS["results_file"]))
+    else:
+        scraper: OtoDomScraper = (
+            MultiSearchScraper()
+            if PARAMS.get("searches")
+            else OtoDomScraper(resume=args.resume)
+        )
+        # One connection pool kept alive for the whole crawl
+        with scraper:
+            # Records are streamed to results file as soon as parsed
+            scraper.save_data(
+                temp_path=PARAMS["results_file"], to_write=scraper.iter_site()
+            )
@@ -0,0 +1,266 @@
+import logging
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Optional
+
+from scraper.metrics import Metrics
+from scraper.rate_limiter import RateLimiter
+
+# Responses telling that server wants us to slow down
+THROTTLE_STATUSES = (403, 429)
+# Responses worth retrying (after backoff)
+RETRY_STATUSES = (429,)
+
+
+class ResponseStatusError(Exception):
+    """
+    Raised for 4xx/5xx responses - retried or not by retry policy of the status
+    class (see scraper.retry_policy).
+    """
+
+    def __init__(
+        self, url: str, status: int, retry_after: Optional[float] = None
+    ) -> None:
+        super().__init__(f"{url} responded with {status}")
+        self.url: str = url
+        self.status: int = status
+        self.retry_after: Optional[float] = retry_after
+
+
+class ThrottledResponseError(ResponseStatusError):
+    """
+    Raised for 429/5xx responses, so fetch is retried after backoff.
+    """
+
+
+def is_throttling(status: Optional[int]) -> bool:
+    """
+    Check if response status is a signal to back off (403, 429, 5xx).
+    """
+    return status is not None and (
+        status in THROTTLE_STATUSES or status >= 500
+    )
+
+
+def should_retry(status: Optional[int]) -> bool:
+    """
+    Check if response status is transient, so request should be retried.
+    """
+    return status is not None and (status in RETRY_STATUSES or status >= 500)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Returns Retry-After header value (delay in seconds or HTTP date)
+    as seconds to wait, None if header is missing or malformed.
+    """
+    if not value:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class AdaptiveThrottle(RateLimiter):
+    """
+    Rate limiter adjusting request rate and concurrency to server responses (AIMD):
+    every fast 2xx/3xx response raises rate additively (and concurrency once per
+    `concurrency` of them), while 403/429/5xx, connection errors or latency rising
+    above best seen one cut both multiplicatively, at most once per round trip.
+    Retry-After pauses all requests for the time requested by server.
+    """
+
+    def __init__(
+        self,
+        requests_per_second: float,
+        min_rate: float = 0.2,
+        max_rate: float = 10.0,
+        increase: float = 0.1,
+        backoff: float = 0.5,
+        latency_tolerance: float = 2.0,
+        min_concurrency: int = 1,
+        max_concurrency: int = 1,
+        metrics: Optional[Metrics] = None,
+    ) -> None:
+        """
+        Args:
+            requests_per_second (float): starting rate, max_rate if not set
+            min_rate (float): requests per second never gone below
+            max_rate (float): requests per second never exceeded
+            increase (float): requests per second added per fast successful response
+            backoff (float): rate and concurrency multiplier on throttling signal
+            latency_tolerance (float): latency (moving average) over best seen
+                one treated as congestion
+            min_concurrency (int): requests in flight never gone below
+            max_concurrency (int): requests in flight never exceeded
+            metrics (Optional[Metrics]): registry controller state is exposed in
+        """
+        self.min_rate: float = min_rate
+        self.max_rate: float = max_rate
+        self.increase: float = increase
+        self.backoff: float = backoff
+        self.latency_tolerance: float = latency_tolerance
+        self.min_concurrency: int = min_concurrency
+        self.max_concurrency: int = max(min_concurrency, max_concurrency)
+        self.metrics: Optional[Metrics] = metrics
+
+        self.rate: float = min(
+            max(requests_per_second or max_rate, min_rate), max_rate
+        )
+        super().__init__(requests_per_second=self.rate)
+        self.concurrency: float = float(self.max_concurrency)
+        self.in_flight: int = 0
+        self.latency_ewma: Optional[float] = None
+        self.best_latency: Optional[float] = None
+        self._last_backoff: float = 0.0
+        self._slot_free: threading.Condition = threading.Condition(self._lock)
+
+        self._publish()
+
+    def _publish(self) -> None:
+        if self.metrics:
+            self.metrics.set("throttle_rate", self.rate)
+            self.metrics.set("throttle_concurrency", int(self.concurrency))
+            if self.latency_ewma is not None:
+                self.metrics.set("throttle_latency_ewma", self.latency_ewma)
+
+    def _try_enter(self) -> bool:
+        # Must be called with lock held
+        if self.in_flight >= int(self.concurrency):
+            return False
+
+        self.in_flight += 1
+        return True
+
+    def acquire(self) -> None:
+        """
+        Block until request can be sent - within concurrency and rate limits.
+        """
+        with self._slot_free:
+            while not self._try_enter():
+                self._slot_free.wait()
+
+        super().acquire()
+
+    async def acquire_async(self) -> None:
+        """
+        Asyncio counterpart of acquire - waits without blocking event loop.
+        """
+        # Imported here so sync backend does not load asyncio
+        import asyncio
+
+        while True:
+            with self._lock:
+                if self._try_enter():
+                    break
+            await asyncio.sleep(self.interval)
+
+        await super().acquire_async()
+
+    def release(
+        self,
+        status: Optional[int] = None,
+        latency: float = 0.0,
+        retry_after: Optional[float] = None,
+    ) -> None:
+        """
+        Free request slot and adjust rate and concurrency to the response.
+
+        Args:
+            status (Optional[int]): response status, None if request failed
+            latency (float): seconds from sending request to response
+            retry_after (Optional[float]): seconds requested by server to wait
+        """
+        with self._slot_free:
+            self.in_flight -= 1
+            now: float = time.monotonic()
+
+            if retry_after:
+                # Nothing goes out before server allows it
+                self._next_slot = max(self._next_slot, now + retry_after)
+
+            if status is None or is_throttling(status):
+                self._back_off(now=now, reason=f"status {status}")
+            elif self._latency_rising(latency=latency):
+                self._back_off(
+                    now=now,
+                    reason=f"latency {self.latency_ewma:.3f}s "
+                    f"(best {self.best_latency:.3f}s)",
+                )
+            elif status < 400:
+                self._speed_up()
+
+            self.interval = 1.0 / self.rate
+            self._slot_free.notify_all()
+
+        self._publish()
+
+    def _latency_rising(self, latency: float) -> bool:
+        # Must be called with lock held
+        if self.latency_ewma is None:
+            self.latency_ewma = latency
+        else:
+            self.latency_ewma = 0.8 * self.latency_ewma + 0.2 * latency
+
+        if self.best_latency is None or self.latency_ewma < self.best_latency:
+            self.best_latency = self.latency_ewma
+
+        return self.latency_ewma > self.best_latency * self.latency_tolerance
+
+    def _speed_up(self) -> None:
+        # Must be called with lock held
+        self.rate = min(self.rate + self.increase, self.max_rate)
+        # One more request in flight per full window of successes
+        self.concurrency = min(
+            self.concurrency + 1.0 / int(self.concurrency),
+            float(self.max_concurrency),
+        )
+
+    def _back_off(self, now: float, reason: str) -> None:
+        # Must be called with lock held. Responses of requests sent before
+        # previous backoff (one round trip) do not cut the rate again.
+        if now - self._last_backoff < (self.latency_ewma or 0.0):
+            return
+
+        self._last_backoff = now
+        rate: float = self.rate
+        concurrency: int = int(self.concurrency)
+
+        self.rate = max(self.rate * self.backoff, self.min_rate)
+        self.concurrency = float(
+            max(int(self.concurrency * self.backoff), self.min_concurrency)
+        )
+        # Latency baseline is measured anew at lower load
+        self.best_latency = self.latency_ewma
+
+        if self.metrics:
+            self.metrics.inc("throttle_backoffs")
+        logging.info(
+            msg=f"Throttle backoff on {reason}: rate {rate:.2f} -> "
+            f"{self.rate:.2f} req/s, concurrency {concurrency} -> "
+            f"{int(self.concurrency)}"
+        )
+
+    def retry_delay(self, attempt: int) -> float:
+        """
+        Returns seconds to wait before retrying failed request - pacing (with
+        Retry-After pauses) is already done by acquire, so retry goes at once.
+        """
+        return 0.0
+
+
+def wait_throttled(retry_state: Any) -> float:
+    """
+    Tenacity wait strategy delegating retry delay to the scraper rate limiter.
+    """
+    return retry_state.args[0].rate_limiter.retry_delay(
+        attempt=retry_state.attempt_number
+    )
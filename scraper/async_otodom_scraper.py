@@ -0,0 +1,676 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Deque,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from aiohttp import ClientError, ClientSession, ClientTimeout, TCPConnector
+from tenacity import retry
+
+from data_types.estate import Estate
+from data_types.estate_delta import EstateDelta
+from data_types.estate_details import EstateDetails
+from data_types.estate_record import EstateRecord
+from scraper.adaptive_throttle import (
+    ResponseStatusError,
+    ThrottledResponseError,
+    parse_retry_after,
+    should_retry,
+    wait_throttled,
+)
+from scraper.circuit_breaker import CircuitBreaker
+from scraper.metrics import Metrics, count_retry
+from scraper.otodom_scraper import OtoDomScraper
+from scraper.rate_limiter import RateLimiter
+from scraper.retry_policy import FETCH_ERRORS, PARSE, RetryPolicy, retry_on
+from storage.dead_letter import DeadLetterFile
+from storage.raw_archive import RawArchive
+
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup
+
+
+class AsyncOtoDomScraper(OtoDomScraper):
+    """
+    Asyncio backend of OtoDomScraper - pages are fetched with aiohttp,
+    parsing of listing and advert pages is inherited from OtoDomScraper.
+    Listing pages of all search profiles (searches in parameters.yaml) are
+    walked concurrently, feeding adverts to stage of up to max_in_flight
+    coroutines. Number of requests in flight is bounded by semaphore.
+    """
+
+    def __init__(
+        self,
+        params: Optional[Dict[str, Any]] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        metrics: Optional[Metrics] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        raw_archive: Optional[RawArchive] = None,
+        dead_letters: Optional[DeadLetterFile] = None,
+    ) -> None:
+        """
+        Args:
+            params (Optional[Dict[str, Any]]): params overriding parameters.yaml ones
+            rate_limiter (Optional[RateLimiter]): rate limiter shared with other scrapers
+            metrics (Optional[Metrics]): metrics registry shared with other scrapers
+            circuit_breaker (Optional[CircuitBreaker]): circuit breaker shared
+                with other scrapers
+            raw_archive (Optional[RawArchive]): raw page archive shared
+                with other scrapers
+            dead_letters (Optional[DeadLetterFile]): dead-letter file shared
+                with other scrapers
+        """
+        params = params if params is not None else self.PARAMS
+        if (params.get("listing_only") or {}).get("enabled"):
+            raise ValueError("listing_only is supported by sync backend only")
+        # Checkpoint and resume are supported by sync backend only
+        params = {**params, "checkpoint_file": None}
+        searches: List[Dict[str, Any]] = params.get("searches") or []
+        super().__init__(
+            # Seen index is kept per profile, not for the combined crawl
+            params={**params, "incremental": False} if searches else params,
+            rate_limiter=rate_limiter,
+            metrics=metrics,
+            circuit_breaker=circuit_breaker,
+            raw_archive=raw_archive,
+            dead_letters=dead_letters,
+        )
+        # Started inside running event loop, see _open_session
+        self.semaphore: Optional[asyncio.Semaphore] = None
+        self.retry_policy = RetryPolicy.from_params(
+            settings=self.PARAMS.get("retry_policy"),
+            # aiohttp raises bare asyncio.TimeoutError on request_timeout
+            network_errors=(ClientError, asyncio.TimeoutError),
+        )
+
+        self.scrapers: Dict[str, AsyncOtoDomScraper] = {}
+        for i, profile in enumerate(searches):
+            name: str = profile.get("name", f"search_{i + 1}")
+            # Profiles share aiohttp session, rate limiter, metrics, circuit
+            # breaker, raw archive and dead-letter file
+            self.scrapers[name] = AsyncOtoDomScraper(
+                params={**params, **profile, "searches": []},
+                rate_limiter=self.rate_limiter,
+                metrics=self.metrics,
+                circuit_breaker=self.circuit_breaker,
+                raw_archive=self.raw_archive,
+                dead_letters=self.dead_letters,
+            )
+            self.scrapers[name]._owns_session = False
+
+    async def __aenter__(self) -> "AsyncOtoDomScraper":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    def _init_session(self) -> None:
+        """
+        aiohttp session can be started only inside running event loop,
+        see _open_session.
+        """
+        return None
+
+    def _max_concurrency(self) -> int:
+        """
+        Returns upper bound of requests in flight for adaptive throttle.
+        """
+        return self.PARAMS.get("max_in_flight", 100)
+
+    def _init_async_session(self) -> ClientSession:
+        """
+        Start aiohttp session - must be called inside running event loop.
+
+        Returns: aiohttp.ClientSession object
+        """
+        max_in_flight: int = self.PARAMS.get("max_in_flight", 100)
+        self.semaphore = asyncio.Semaphore(max_in_flight)
+        pool: Dict[str, Any] = self.PARAMS.get("connection_pool") or {}
+        headers: Dict[str, str] = {"User-agent": self.PARAMS["agent"]}
+        if not pool.get("compression", True):
+            headers["Accept-Encoding"] = "identity"
+
+        return ClientSession(
+            connector=TCPConnector(
+                limit=pool.get("size") or max_in_flight,
+                force_close=not pool.get("keep_alive", True),
+            ),
+            # Cutsom header from parameters.yaml in order to avoid blocking
+            headers=headers,
+            timeout=ClientTimeout(
+                total=self.PARAMS.get("request_timeout", 60)
+            ),
+        )
+
+    def _open_session(self) -> ClientSession:
+        """
+        Returns aiohttp session, started on first use and shared with scrapers
+        of search profiles along with its semaphore.
+        """
+        if not self.session:
+            self.session = self._init_async_session()
+            for scraper in self.scrapers.values():
+                scraper.session = self.session
+                scraper.semaphore = self.semaphore
+
+        return self.session
+
+    async def close(self) -> None:
+        """
+        Close scrapers of search profiles, aiohttp session (if opened and not
+        shared), on-disk indexes and raw archive (if not shared).
+        """
+        for scraper in self.scrapers.values():
+            await scraper.close()
+
+        if self.session and self._owns_session:
+            await self.session.close()
+        self.session = None
+        self.close_stores()
+
+    @retry(
+        retry=retry_on(*FETCH_ERRORS),
+        wait=wait_throttled,
+        before_sleep=count_retry,
+    )
+    async def fetch(self, url: str) -> bytes:
+        """
+        Returns raw page content, bounded by semaphore, circuit breaker and global
+        rate limiter (which get response status and latency back). 429 and 5xx
+        responses raise ThrottledResponseError, other 4xx ones ResponseStatusError
+        - retried within budget of retry policy.
+
+        Args:
+            url (str): url of page to fetch
+
+        Returns:
+            bytes: raw page content
+        """
+        self._open_session()
+
+        async with self.semaphore:
+            probe: bool = False
+            if self.circuit_breaker:
+                probe = await self.circuit_breaker.acquire_async()
+            await self.rate_limiter.acquire_async()
+            status: Optional[int] = None
+            retry_after: Optional[float] = None
+            start: float = time.perf_counter()
+
+            try:
+                async with self.session.get(url) as page_source:
+                    content: bytes = await page_source.read()
+                status = page_source.status
+                retry_after = parse_retry_after(
+                    page_source.headers.get("Retry-After")
+                )
+            finally:
+                self.rate_limiter.release(
+                    status=status,
+                    latency=time.perf_counter() - start,
+                    retry_after=retry_after,
+                )
+                if self.circuit_breaker:
+                    self.circuit_breaker.release(
+                        failed=status is None or should_retry(status),
+                        probe=probe,
+                    )
+
+        if should_retry(status):
+            raise ThrottledResponseError(
+                url=url, status=status, retry_after=retry_after
+            )
+        if status >= 400:
+            raise ResponseStatusError(url=url, status=status)
+
+        self.metrics.inc("bytes_downloaded", len(content))
+
+        return content
+
+    async def get_listing_page_source(self, page_no: int) -> bytes:
+        """
+        Returns raw content of listing page at desired page number.
+
+        Args:
+            page_no (int): number of listing page to fetch
+
+        Returns:
+            bytes: raw listing page content
+        """
+        constructed_url: str = self.construct_url_for_listing(
+            page=page_no
+        )
+        logging.info(msg="Search url " + constructed_url)
+
+        try:
+            with self.metrics.timer("listing_fetch"):
+                page_source: bytes = await self.fetch(url=constructed_url)
+        except Exception as e:
+            self.record_failure(url=constructed_url, error=e, kind="listing")
+            raise
+
+        self.metrics.inc("listing_pages")
+
+        return page_source
+
+    async def get_estate_page_source(self, estate_url: str) -> bytes:
+        """
+        Returns raw content of estate advert.
+
+        Args:
+            estate_url (str): estate url to fetch
+
+        Returns:
+            bytes: raw estate advert content
+        """
+        with self.metrics.timer("advert_fetch"):
+            page_source: bytes = await self.fetch(url=estate_url)
+
+        self.metrics.inc("adverts_fetched")
+        if self.raw_archive:
+            self.archive_page(estate_url=estate_url, page_source=page_source)
+
+        return page_source
+
+    async def get_listing_page_soup(self, page_no: int) -> "BeautifulSoup":
+        """
+        Returns Bs4 soup of listing page at desired page number.
+
+        Args:
+            page_no (int): number of listing page to scrap soup from
+
+        Returns:
+            BeautifulSoup: soup of listing page
+        """
+        from bs4 import BeautifulSoup
+
+        return BeautifulSoup(
+            await self.get_listing_page_source(page_no=page_no),
+            "html.parser",
+        )
+
+    async def get_estate_page_soup(self, estate_url: str) -> "BeautifulSoup":
+        """
+        Returns Bs4 soup of estate advert.
+
+        Args:
+            estate_url (str): estate url to take soup from
+
+        Returns:
+            BeautifulSoup: soup of estate advert
+        """
+        from bs4 import BeautifulSoup
+
+        return BeautifulSoup(
+            await self.get_estate_page_source(estate_url=estate_url),
+            "html.parser",
+        )
+
+    async def parse_estate(self, estate_url: str) -> EstateDetails:
+        """
+        Parse estate advert page and returns validated EstateDetails model.
+
+        Args:
+            estate_url (str): url to specific estate advert
+
+        Returns:
+            EstateDetails: validated model of estate details
+        """
+        page_source: bytes = await self.get_estate_page_source(
+            estate_url=estate_url
+        )
+        estate_details: Union[
+            List[str], Dict[str, Any]
+        ] = self.get_estate_details(estate_soup=page_source)
+
+        with self.validation():
+            return self.build_estate_details(estate_details=estate_details)
+
+    @retry(retry=retry_on(PARSE), wait=wait_throttled, before_sleep=count_retry)
+    async def parse_estate_record(
+        self, estate_url: str
+    ) -> Optional[Union[Estate, EstateRecord, EstateDelta]]:
+        """
+        Parse estate advert into crawl record - compact EstateRecord if fast_records
+        set in parameters.yaml, Estate model otherwise (see build_estate_record
+        for change detection).
+
+        Args:
+            estate_url (str): url to specific estate advert
+
+        Returns:
+            Optional[Union[Estate, EstateRecord, EstateDelta]]: validated estate
+                record, None if advert is unchanged
+        """
+        if not (self.fast_records or self.change_detection):
+            return Estate(
+                url=estate_url,
+                details=await self.parse_estate(estate_url=estate_url),
+            )
+
+        page_source: bytes = await self.get_estate_page_source(
+            estate_url=estate_url
+        )
+        estate_details: Union[
+            List[str], Dict[str, Any]
+        ] = self.get_estate_details(estate_soup=page_source)
+
+        return self.build_estate_record(
+            estate_url=estate_url, estate_details=estate_details
+        )
+
+    async def parse_estate_safely(
+        self, estate_url: str
+    ) -> Optional[Union[Estate, EstateRecord, EstateDelta]]:
+        """
+        Parse estate advert, failed advert is logged and skipped.
+
+        Args:
+            estate_url (str): url to specific estate advert
+
+        Returns:
+            Optional[Union[Estate, EstateRecord, EstateDelta]]: validated estate
+                record or None if parsing failed or advert is unchanged
+        """
+        try:
+            estate: Optional[
+                Union[Estate, EstateRecord, EstateDelta]
+            ] = await self.parse_estate_record(estate_url=estate_url)
+        except Exception as e:
+            self.record_failure(url=estate_url, error=e)
+            return None
+
+        if estate and self.PARAMS["verbose_logging"]:
+            logging.info(f"New entry parsed:\n{estate.url}")
+
+        return estate
+
+    async def parse_page(
+        self, listing_soup: Union["BeautifulSoup", bytes]
+    ) -> List[Estate]:
+        """
+        Fetch and parse all adverts from listing page at once.
+
+        Args:
+            listing_soup (Union[BeautifulSoup, bytes]): raw content or soup
+                of specified listing page
+
+        Returns:
+            List[Estate]: validated Estate models in listing order
+        """
+        estate_results: List[str] = self.get_estate_links_from_listing(
+            listing_soup=listing_soup
+        )
+        results: List[Optional[Estate]] = await asyncio.gather(
+            *(
+                self.parse_estate_safely(link)
+                for link in self.select_new_links(estate_links=estate_results)
+            )
+        )
+        estates: List[Estate] = [estate for estate in results if estate]
+
+        if self.seen_index:
+            self.seen_index.mark_seen(
+                slugs=[self.get_slug(estate.url) for estate in estates]
+            )
+
+        return estates
+
+    def _profiles(self) -> Dict[str, "AsyncOtoDomScraper"]:
+        """
+        Returns scrapers of search profiles by name, the scraper itself (unnamed)
+        if no searches set.
+        """
+        return self.scrapers or {"": self}
+
+    async def _walk_listing(
+        self,
+        scraper: "AsyncOtoDomScraper",
+        name: str,
+        estate_links: asyncio.Queue,
+        matches: Dict[str, List[str]],
+    ) -> None:
+        """
+        Walk listing pages of single search profile, up to prefetch_pages ahead
+        of the page being parsed (parameters.yaml), and queue its adverts for
+        advert stage - advert found by other profile before is only tagged with
+        the profile. Stops at page_limit or first page without (new) adverts.
+        """
+        window: int = self.PARAMS.get("prefetch_pages", 0) + 1
+        pages: Deque[Tuple[int, asyncio.Future]] = deque()
+        page_num: int = 1
+
+        try:
+            while True:
+                while len(pages) < window and not scraper._page_limit_reached(
+                    page_num
+                ):
+                    pages.append(
+                        (
+                            page_num,
+                            asyncio.ensure_future(
+                                scraper.get_listing_page_source(page_no=page_num)
+                            ),
+                        )
+                    )
+                    page_num += 1
+
+                if not pages:
+                    break
+
+                number, page = pages.popleft()
+                page_links: List[str] = scraper.select_new_links(
+                    estate_links=scraper.get_estate_links_from_listing(
+                        listing_soup=await page
+                    )
+                )
+                # Listing is sorted by latest, so when whole page is already
+                # known (incremental crawl) older pages are known too
+                if not page_links:
+                    break
+
+                logging.info(
+                    msg=f"### Listing page {number} {name} parsed "
+                    + f"({len(page_links)} adverts) ###"
+                )
+                for link in page_links:
+                    if link in matches:
+                        if name not in matches[link]:
+                            matches[link].append(name)
+                        continue
+
+                    matches[link] = [name]
+                    # Waits while advert stage is full
+                    await estate_links.put(link)
+        except BaseException:
+            for _, page in pages:
+                page.cancel()
+            raise
+
+        # Pages prefetched past the last one are let finish, cancelled request
+        # would count as failed one for throttle and circuit breaker
+        await asyncio.gather(*(page for _, page in pages), return_exceptions=True)
+
+    async def _walk_listings(
+        self, estate_links: asyncio.Queue, matches: Dict[str, List[str]]
+    ) -> None:
+        """
+        Walk listing pages of all search profiles concurrently.
+        """
+        walks: List[asyncio.Future] = [
+            asyncio.ensure_future(
+                self._walk_listing(
+                    scraper=scraper,
+                    name=name,
+                    estate_links=estate_links,
+                    matches=matches,
+                )
+            )
+            for name, scraper in self._profiles().items()
+        ]
+
+        try:
+            await asyncio.gather(*walks)
+        except BaseException:
+            for walk in walks:
+                walk.cancel()
+            raise
+
+    async def _work_adverts(
+        self, estate_links: asyncio.Queue, results: asyncio.Queue
+    ) -> None:
+        """
+        Advert stage coroutine - parse queued adverts and pass their records on.
+        """
+        while True:
+            link: str = await estate_links.get()
+            try:
+                estate: Optional[
+                    Union[Estate, EstateRecord, EstateDelta]
+                ] = await self.parse_estate_safely(estate_url=link)
+                if estate:
+                    await results.put(estate)
+            finally:
+                estate_links.task_done()
+
+    async def _finish_adverts(
+        self,
+        listing: asyncio.Future,
+        estate_links: asyncio.Queue,
+        results: asyncio.Queue,
+    ) -> None:
+        """
+        Put None into results once listing walk is over and all its adverts
+        are passed on - or error of listing walk.
+        """
+        try:
+            await listing
+            await estate_links.join()
+        except Exception as e:
+            await results.put(e)
+        else:
+            await results.put(None)
+
+    def _mark_done(
+        self,
+        estate: Union[Estate, EstateRecord, EstateDelta],
+        profiles: List[str],
+    ) -> None:
+        """
+        Mark advert seen by profiles which found it (incremental crawl)
+        and store its fingerprints (change detection).
+        """
+        slug: str = self.get_slug(estate.url)
+
+        for name in profiles:
+            seen_index = self._profiles()[name].seen_index
+            if seen_index:
+                seen_index.mark_seen(slugs=[slug])
+
+        if isinstance(estate, EstateDelta):
+            self.fingerprints.update_fields(
+                slug=slug, fields=estate.fingerprints
+            )
+
+    async def iter_site(self) -> AsyncIterator[Estate]:
+        """
+        Main scraper async generator - walks estate listing of all search
+        profiles (number of subpages in parameters.yaml) concurrently, while
+        their adverts are fetched and parsed by up to max_in_flight coroutines.
+        Validated Estate models are yielded as they are parsed, each advert
+        once - tagged with profiles which found it until its record is yielded
+        (multi-search crawl).
+
+        Returns:
+            AsyncIterator[Estate]: validated Estate models
+        """
+        if self.PARAMS["verbose_logging"]:
+            logging.info(
+                f"## Async scraper started ({len(self._profiles())} searches) ##"
+            )
+
+        self._open_session()
+        max_in_flight: int = self.PARAMS.get("max_in_flight", 100)
+        # Bounded, so listing walk waits for advert stage and advert stage
+        # for consumer
+        estate_links: asyncio.Queue = asyncio.Queue(maxsize=max_in_flight)
+        results: asyncio.Queue = asyncio.Queue(maxsize=max_in_flight)
+        matches: Dict[str, List[str]] = {}
+
+        listing: asyncio.Future = asyncio.ensure_future(
+            self._walk_listings(estate_links=estate_links, matches=matches)
+        )
+        tasks: List[asyncio.Future] = [
+            listing,
+            *(
+                asyncio.ensure_future(
+                    self._work_adverts(
+                        estate_links=estate_links, results=results
+                    )
+                )
+                for _ in range(max_in_flight)
+            ),
+        ]
+        tasks.append(
+            asyncio.ensure_future(
+                self._finish_adverts(
+                    listing=listing, estate_links=estate_links, results=results
+                )
+            )
+        )
+
+        try:
+            while True:
+                estate = await results.get()
+                if estate is None:
+                    break
+                if isinstance(estate, Exception):
+                    raise estate
+
+                profiles: List[str] = list(matches[estate.url])
+                if self.scrapers:
+                    estate.profiles = profiles
+                yield estate
+
+                # Marked only once consumer is done with the record
+                self._mark_done(estate=estate, profiles=profiles)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        # For script execution time probing
+        self.time_stop = time.time()
+
+        if self.PARAMS["verbose_logging"]:
+            logging.info(
+                msg=f"## Async scraper finished ##\n# Execution time "
+                + str(self.time_stop - self.time_start)
+                + " seconds #"
+            )
+
+        self.metrics.export()
+
+    async def parse_site(self) -> List[Estate]:
+        """
+        Goes thru estate listing and returns list of validated Estate models,
+        see iter_site for streaming variant (which yields compact EstateRecords
+        with fast_records set in parameters.yaml).
+
+        Returns:
+            List[Estate]: list of validated Estate models.
+        """
+        return [
+            estate.to_model() if isinstance(estate, EstateRecord) else estate
+            async for estate in self.iter_site()
+        ]
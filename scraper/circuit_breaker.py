@@ -0,0 +1,155 @@
+import logging
+import threading
+import time
+from collections import deque
+from typing import Deque, Optional, Tuple
+
+from scraper.metrics import Metrics
+
+
+class CircuitBreaker:
+    """
+    Thread safe circuit breaker shared by all workers of the scraper - when
+    share of failed requests (network errors, 429, 5xx) among the last `window`
+    ones reaches error_rate, crawl is paused for cooldown seconds. Then single
+    probe request is let through: its success resumes the crawl, failure pauses
+    it again for twice as long (up to max_cooldown). Outcomes of requests
+    sent before the circuit opened do not decide the probe.
+    """
+
+    CLOSED: str = "closed"
+    OPEN: str = "open"
+    HALF_OPEN: str = "half_open"
+
+    def __init__(
+        self,
+        error_rate: float = 0.5,
+        window: int = 20,
+        min_requests: int = 10,
+        cooldown: float = 30.0,
+        max_cooldown: float = 300.0,
+        metrics: Optional[Metrics] = None,
+    ) -> None:
+        """
+        Args:
+            error_rate (float): share of failed requests opening the circuit
+            window (int): number of the last requests error rate is measured on
+            min_requests (int): requests in window needed to measure error rate
+            cooldown (float): seconds crawl is paused for
+            max_cooldown (float): pause never exceeded after failed probes
+            metrics (Optional[Metrics]): registry breaker state is exposed in
+        """
+        self.error_rate: float = error_rate
+        self.min_requests: int = min_requests
+        self.cooldown: float = cooldown
+        self.max_cooldown: float = max_cooldown
+        self.metrics: Optional[Metrics] = metrics
+
+        self.state: str = self.CLOSED
+        self.outcomes: Deque[bool] = deque(maxlen=window)
+        self._pause: float = cooldown
+        self._reopen_at: float = 0.0
+        self._lock: threading.Lock = threading.Lock()
+
+    def reserve(self) -> Tuple[float, bool]:
+        """
+        Check if request can be sent now.
+
+        Returns:
+            Tuple[float, bool]: seconds the caller has to wait before asking
+                again (0 if request can be sent) and whether the request
+                is the probe one
+        """
+        with self._lock:
+            if self.state == self.CLOSED:
+                return 0.0, False
+
+            now: float = time.monotonic()
+
+            if self.state == self.OPEN and now >= self._reopen_at:
+                # The caller sends probe request, others wait for its outcome
+                self.state = self.HALF_OPEN
+                return 0.0, True
+
+            return max(self._reopen_at - now, min(self.cooldown, 1.0)), False
+
+    def acquire(self) -> bool:
+        """
+        Block while the circuit is open.
+
+        Returns:
+            bool: the request is the probe one, to be passed to release
+        """
+        while True:
+            delay, probe = self.reserve()
+            if not delay:
+                return probe
+            time.sleep(delay)
+
+    async def acquire_async(self) -> bool:
+        """
+        Asyncio counterpart of acquire - waits without blocking event loop.
+        """
+        # Imported here so sync backend does not load asyncio
+        import asyncio
+
+        while True:
+            delay, probe = self.reserve()
+            if not delay:
+                return probe
+            await asyncio.sleep(delay)
+
+    def release(self, failed: bool, probe: bool = False) -> None:
+        """
+        Record outcome of request sent after acquire.
+
+        Args:
+            failed (bool): request failed with network error, 429 or 5xx
+            probe (bool): request is the probe one (returned by acquire)
+        """
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                # Requests sent before the circuit opened do not decide
+                if not probe:
+                    return
+                if failed:
+                    self._pause = min(self._pause * 2, self.max_cooldown)
+                    self._open(reason="probe request failed")
+                else:
+                    self.state = self.CLOSED
+                    self._pause = self.cooldown
+                    self.outcomes.clear()
+                    logging.info(msg="Circuit breaker closed, crawl resumed")
+                    self._publish()
+                return
+
+            self.outcomes.append(failed)
+            if self.state == self.OPEN or len(self.outcomes) < self.min_requests:
+                return
+
+            failures: int = sum(self.outcomes)
+            if failures >= self.error_rate * len(self.outcomes):
+                self._open(
+                    reason=f"{failures} of last {len(self.outcomes)} "
+                    "requests failed"
+                )
+
+    def _open(self, reason: str) -> None:
+        # Must be called with lock held
+        self.state = self.OPEN
+        self._reopen_at = time.monotonic() + self._pause
+        self.outcomes.clear()
+
+        if self.metrics:
+            self.metrics.inc("circuit_breaker_opened")
+        logging.warning(
+            msg=f"Circuit breaker open ({reason}), crawl paused "
+            f"for {self._pause:.0f}s"
+        )
+        self._publish()
+
+    def _publish(self) -> None:
+        if self.metrics:
+            self.metrics.set(
+                "circuit_breaker_open", int(self.state != self.CLOSED)
+            )
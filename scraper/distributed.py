@@ -0,0 +1,345 @@
+import logging
+import os
+import socket
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from threading import Event, Thread
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+from data_types.estate import Estate
+from data_types.estate_delta import EstateDelta
+from data_types.estate_record import EstateRecord
+from scraper.otodom_scraper import OtoDomScraper
+from storage.work_queue import Task, WorkQueue
+from storage.work_queue_api import RemoteWorkQueue
+
+LISTING: str = "listing"
+ADVERT: str = "advert"
+
+
+def open_work_queue(
+    params: Dict[str, Any], serving: bool = False
+) -> Union[WorkQueue, RemoteWorkQueue]:
+    """
+    Open work queue set up in parameters.yaml (work_queue) - queue served by
+    coordinator if coordinator_url is set, otherwise the queue file.
+
+    Args:
+        params (Dict[str, Any]): scraper params
+        serving (bool): open the queue file to serve it (--serve), whatever
+            coordinator_url is
+
+    Returns:
+        Union[WorkQueue, RemoteWorkQueue]: opened work queue
+    """
+    settings: Dict[str, Any] = params.get("work_queue") or {}
+
+    if settings.get("coordinator_url") and not serving:
+        return RemoteWorkQueue(
+            url=settings["coordinator_url"],
+            timeout=params.get("request_timeout", 60),
+        )
+
+    return WorkQueue(
+        queue_path=settings.get("file", "work_queue.sqlite"),
+        lease_seconds=settings.get("lease_seconds", 60),
+        max_attempts=settings.get("max_attempts", 3),
+    )
+
+
+def profile_params(params: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """
+    Returns params of every search profile (searches in parameters.yaml) by name,
+    single unnamed profile if no searches set. Checkpoints are not used,
+    work queue keeps crawl state.
+    """
+    params = {**params, "checkpoint_file": None}
+
+    if not params.get("searches"):
+        return {"": params}
+
+    return {
+        profile.get("name", f"search_{i + 1}"): {**params, **profile}
+        for i, profile in enumerate(params["searches"])
+    }
+
+
+class CrawlCoordinator:
+    """
+    Splits crawl into work queue tasks - first listing pages of every search
+    profile. Nodes working the queue add advert tasks of listing pages and tasks
+    of next pages, so the coordinator does not need to stay up - unless it
+    serves the queue to nodes of other hosts (WorkQueueServer).
+    """
+
+    def __init__(
+        self,
+        queue: Union[WorkQueue, RemoteWorkQueue],
+        params: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        self.queue: Union[WorkQueue, RemoteWorkQueue] = queue
+        self.params: Dict[str, Any] = (
+            params if params is not None else OtoDomScraper.PARAMS
+        )
+
+    def seed(self) -> int:
+        """
+        Start new crawl - tasks finished by previous one are cleared (so its
+        listing pages and adverts are crawled again), then listing pages of all
+        profiles are queued, up to page_limit or the first one if all pages
+        are to be crawled.
+
+        Returns:
+            int: number of tasks queued
+        """
+        cleared: int = self.queue.clear_finished()
+        if cleared:
+            logging.info(msg=f"### {cleared} tasks of previous crawl cleared ###")
+
+        queued: int = 0
+
+        for name, params in profile_params(params=self.params).items():
+            pages: int = params["page_limit"] or 1
+            for page in range(1, pages + 1):
+                queued += self.queue.put(
+                    key=f"{LISTING}:{name}:{page}",
+                    kind=LISTING,
+                    payload={"profile": name, "page": page},
+                )
+
+        logging.info(msg=f"### {queued} listing tasks queued ###")
+
+        return queued
+
+
+class QueueWorker:
+    """
+    Crawl node working tasks of shared work queue: listing page tasks are turned
+    into advert tasks (advert already queued by any node is skipped), advert
+    tasks into records. Node works up to workers tasks at once (parameters.yaml),
+    lease of every task in progress is kept by heartbeats, task is acknowledged
+    only once its record is handed over to consumer.
+    """
+
+    def __init__(
+        self,
+        queue: Union[WorkQueue, RemoteWorkQueue],
+        params: Optional[Dict[str, Any]] = None,
+        node_id: Optional[str] = None,
+    ) -> None:
+        """
+        Args:
+            queue (Union[WorkQueue, RemoteWorkQueue]): work queue shared
+                by crawl nodes - queue file or queue served by coordinator
+            params (Optional[Dict[str, Any]]): params overriding parameters.yaml ones
+            node_id (Optional[str]): id of the node, host name and pid by default
+        """
+        params = params if params is not None else OtoDomScraper.PARAMS
+        settings: Dict[str, Any] = params.get("work_queue") or {}
+
+        self.queue: Union[WorkQueue, RemoteWorkQueue] = queue
+        self.node_id: str = node_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.heartbeat_seconds: float = settings.get("heartbeat_seconds", 15)
+        self.poll_seconds: float = settings.get("poll_seconds", 1)
+
+        profiles: Dict[str, Dict[str, Any]] = profile_params(params=params)
+        first: str = next(iter(profiles))
+        self.scraper: OtoDomScraper = OtoDomScraper(params=profiles[first])
+        self.scrapers: Dict[str, OtoDomScraper] = {first: self.scraper}
+        for name, profile in profiles.items():
+            if name == first:
+                continue
+            # Profiles share session, rate limiter, metrics, circuit breaker,
+            # raw archive and dead-letter file of the node
+            self.scrapers[name] = OtoDomScraper(
+                params=profile,
+                session=self.scraper.session,
+                rate_limiter=self.scraper.rate_limiter,
+                metrics=self.scraper.metrics,
+                circuit_breaker=self.scraper.circuit_breaker,
+                raw_archive=self.scraper.raw_archive,
+                dead_letters=self.scraper.dead_letters,
+            )
+
+    def __enter__(self) -> "QueueWorker":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        for scraper in self.scrapers.values():
+            scraper.close()
+
+    def _keep_lease(self, task: Task, done: Event) -> None:
+        """
+        Heartbeat thread - prolong lease until task is done.
+        """
+        while not done.wait(self.heartbeat_seconds):
+            try:
+                kept: bool = self.queue.heartbeat(task=task, owner=self.node_id)
+            except Exception as e:
+                # Coordinator unreachable for a while - tried again next beat
+                logging.warning(f"Heartbeat of {task} failed: {e!r}")
+                continue
+            if not kept:
+                logging.warning(f"Lease of {task} lost")
+                return
+
+    def work_listing(self, task: Task) -> None:
+        """
+        Queue adverts of listing page and the next page (if all pages are crawled).
+        """
+        profile: str = task.payload["profile"]
+        page: int = task.payload["page"]
+        scraper: OtoDomScraper = self.scrapers[profile]
+
+        estate_links: List[str] = scraper.select_new_links(
+            estate_links=scraper.get_estate_links_from_listing(
+                listing_soup=scraper.get_listing_page_source(page_no=page)
+            )
+        )
+        queued: int = sum(
+            self.queue.put(
+                key=f"{ADVERT}:{scraper.get_slug(link)}",
+                kind=ADVERT,
+                payload={"url": link, "profile": profile},
+            )
+            for link in estate_links
+        )
+        logging.info(
+            msg=f"### Listing page {page} {profile}: {queued} of "
+            + f"{len(estate_links)} adverts queued ###"
+        )
+
+        # Page without (new) adverts ends the walk
+        if estate_links and not scraper.PARAMS["page_limit"]:
+            self.queue.put(
+                key=f"{LISTING}:{profile}:{page + 1}",
+                kind=LISTING,
+                payload={"profile": profile, "page": page + 1},
+            )
+
+    def work_task(
+        self, task: Task
+    ) -> Optional[Union[Estate, EstateRecord, EstateDelta]]:
+        """
+        Work single leased task - run on worker thread.
+
+        Returns:
+            Optional[Union[Estate, EstateRecord, EstateDelta]]: record of advert
+                task, None for listing task or unchanged advert
+        """
+        if task.kind == LISTING:
+            self.work_listing(task=task)
+            return None
+
+        return self.scrapers[task.payload["profile"]].parse_estate_record(
+            estate_url=task.payload["url"]
+        )
+
+    def iter_estates(self) -> Iterator[Union[Estate, EstateRecord]]:
+        """
+        Work the queue until no task is queued nor leased by any node. Up to
+        workers tasks (parameters.yaml) are leased at once and worked on pool
+        of threads, records are yielded as their tasks finish.
+
+        Returns:
+            Iterator[Union[Estate, EstateRecord]]: validated estate records
+        """
+        workers: int = self.scraper.PARAMS.get("workers", 1)
+        in_flight: Dict[Future, Tuple[Task, Event]] = {}
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            try:
+                yield from self._work_queue(
+                    executor=executor, workers=workers, in_flight=in_flight
+                )
+            finally:
+                # Leases of tasks not handed over (consumer stopped) expire
+                for _, done in in_flight.values():
+                    done.set()
+
+        logging.info(msg=f"## Work queue finished: {self.queue.stats()} ##")
+        self.scraper.metrics.export()
+
+    def _work_queue(
+        self,
+        executor: ThreadPoolExecutor,
+        workers: int,
+        in_flight: Dict[Future, Tuple[Task, Event]],
+    ) -> Iterator[Union[Estate, EstateRecord]]:
+        """
+        Lease tasks into executor while fewer than workers are in flight,
+        yield records of finished ones.
+        """
+        while True:
+            while len(in_flight) < workers:
+                task: Optional[Task] = self.queue.lease(owner=self.node_id)
+                if not task:
+                    break
+
+                done: Event = Event()
+                Thread(
+                    target=self._keep_lease, args=(task, done), daemon=True
+                ).start()
+                in_flight[executor.submit(self.work_task, task)] = (
+                    task,
+                    done,
+                )
+
+            if not in_flight:
+                if not self.queue.stats()[WorkQueue.LEASED]:
+                    break
+                # Other nodes may still queue adverts of their pages
+                time.sleep(self.poll_seconds)
+                continue
+
+            # Woken up for tasks queued meanwhile by listing pages
+            finished, _ = wait(
+                in_flight,
+                timeout=self.poll_seconds,
+                return_when=FIRST_COMPLETED,
+            )
+            for future in finished:
+                task, done = in_flight.pop(future)
+                yield from self._finish_task(
+                    task=task, done=done, future=future
+                )
+
+    def _finish_task(
+        self, task: Task, done: Event, future: Future
+    ) -> Iterator[Union[Estate, EstateRecord]]:
+        """
+        Hand record of finished task over to consumer and acknowledge the task
+        afterwards, failed task is released back to the queue.
+        """
+        try:
+            estate: Optional[
+                Union[Estate, EstateRecord, EstateDelta]
+            ] = future.result()
+        except Exception as e:
+            done.set()
+            logging.warning(f"Failed {task} (attempt {task.attempts}): {e!r}")
+            self.queue.fail(task=task, owner=self.node_id, error=repr(e))
+            return
+
+        try:
+            if estate:
+                yield estate
+        finally:
+            done.set()
+
+        # Acknowledged only once consumer is done with the record
+        self.queue.ack(task=task, owner=self.node_id)
+        if not estate:
+            return
+
+        scraper: OtoDomScraper = self.scrapers[task.payload["profile"]]
+        if scraper.seen_index:
+            scraper.seen_index.mark_seen(slugs=[scraper.get_slug(estate.url)])
+        if isinstance(estate, EstateDelta):
+            scraper.fingerprints.update_fields(
+                slug=scraper.get_slug(estate.url),
+                fields=estate.fingerprints,
+            )
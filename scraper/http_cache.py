@@ -0,0 +1,227 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from requests import PreparedRequest, Response
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+
+class CachingHTTPAdapter(HTTPAdapter):
+    """
+    HTTPAdapter with on-disk response cache. Fresh entries (within TTL of their
+    url class) are served without network, stale ones are revalidated with
+    If-None-Match / If-Modified-Since. Least recently used entries are evicted
+    when cache grows over max_size_bytes.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str,
+        ttl_by_prefix: Dict[str, float],
+        max_size_bytes: int,
+        default_ttl: float = 0,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(**kwargs)
+        self.cache_dir: str = cache_dir
+        # Longest prefix first, so most specific url class wins
+        self.ttl_by_prefix: Dict[str, float] = dict(
+            sorted(ttl_by_prefix.items(), key=lambda rule: -len(rule[0]))
+        )
+        self.default_ttl: float = default_ttl
+        self.max_size_bytes: int = max_size_bytes
+        self.hits: int = 0
+        self.misses: int = 0
+        self.revalidated: int = 0
+        self._lock: threading.Lock = threading.Lock()
+        # cache key -> (size in bytes, last access time)
+        self._entries: Dict[str, Tuple[int, float]] = {}
+
+        os.makedirs(cache_dir, exist_ok=True)
+        for file_name in os.listdir(cache_dir):
+            if file_name.endswith(".body"):
+                stat: os.stat_result = os.stat(
+                    os.path.join(cache_dir, file_name)
+                )
+                self._entries[file_name[:-5]] = (stat.st_size, stat.st_mtime)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns cache hit/miss counters.
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidated": self.revalidated,
+            "entries": len(self._entries),
+        }
+
+    def ttl_for(self, url: str) -> float:
+        """
+        Returns TTL in seconds of url class matching url.
+        """
+        for prefix, ttl in self.ttl_by_prefix.items():
+            if url.startswith(prefix):
+                return ttl
+
+        return self.default_ttl
+
+    def fresh_content(self, url: str) -> Optional[bytes]:
+        """
+        Returns body of fresh entry of url (counted as hit), None if there is
+        none - so that caller can serve it without rate limiting.
+        """
+        request: PreparedRequest = PreparedRequest()
+        request.prepare_url(url=url, params=None)
+        key: str = self._key(url=request.url)
+        meta: Optional[Dict[str, Any]] = self._load_meta(key=key)
+
+        if not self._is_fresh(url=request.url, meta=meta):
+            return None
+
+        with self._lock:
+            self.hits += 1
+        return self._read_body(key=key)
+
+    def send(self, request: PreparedRequest, **kwargs: Any) -> Response:
+        if request.method != "GET":
+            return super().send(request, **kwargs)
+
+        key: str = self._key(url=request.url)
+        meta: Optional[Dict[str, Any]] = self._load_meta(key=key)
+
+        if self._is_fresh(url=request.url, meta=meta):
+            with self._lock:
+                self.hits += 1
+            return self._cached_response(request=request, key=key, meta=meta)
+
+        if meta and meta["headers"].get("ETag"):
+            request.headers["If-None-Match"] = meta["headers"]["ETag"]
+        if meta and meta["headers"].get("Last-Modified"):
+            request.headers["If-Modified-Since"] = meta["headers"][
+                "Last-Modified"
+            ]
+
+        response: Response = super().send(request, **kwargs)
+
+        if response.status_code == 304 and meta:
+            with self._lock:
+                self.revalidated += 1
+            meta["stored_at"] = time.time()
+            self._write_meta(key=key, meta=meta)
+            return self._cached_response(request=request, key=key, meta=meta)
+
+        with self._lock:
+            self.misses += 1
+
+        if response.status_code == 200:
+            self._store(key=key, response=response)
+
+        return response
+
+    @staticmethod
+    def _key(url: str) -> str:
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def _is_fresh(self, url: str, meta: Optional[Dict[str, Any]]) -> bool:
+        return bool(meta) and time.time() - meta["stored_at"] < self.ttl_for(
+            url
+        )
+
+    def _path(self, key: str, suffix: str) -> str:
+        return os.path.join(self.cache_dir, key + suffix)
+
+    def _load_meta(self, key: str) -> Optional[Dict[str, Any]]:
+        if key not in self._entries:
+            return None
+
+        try:
+            with open(self._path(key, ".json"), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_meta(self, key: str, meta: Dict[str, Any]) -> None:
+        self._write_atomic(
+            path=self._path(key, ".json"),
+            content=json.dumps(meta).encode("utf-8"),
+        )
+
+    def _write_atomic(self, path: str, content: bytes) -> None:
+        temp_path: str = f"{path}.{threading.get_ident()}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(content)
+        os.replace(temp_path, path)
+
+    def _store(self, key: str, response: Response) -> None:
+        content: bytes = response.content
+        self._write_atomic(path=self._path(key, ".body"), content=content)
+        self._write_meta(
+            key=key,
+            meta={
+                "url": response.url,
+                "stored_at": time.time(),
+                "headers": {
+                    name: response.headers[name]
+                    for name in ("Content-Type", "ETag", "Last-Modified")
+                    if name in response.headers
+                },
+            },
+        )
+
+        with self._lock:
+            self._entries[key] = (len(content), time.time())
+            self._evict()
+
+    def _evict(self) -> None:
+        """
+        Drop least recently used entries until cache fits max_size_bytes.
+        Has to be called with lock acquired.
+        """
+        total_size: int = sum(size for size, _ in self._entries.values())
+
+        for key, (size, _) in sorted(
+            self._entries.items(), key=lambda entry: entry[1][1]
+        ):
+            if total_size <= self.max_size_bytes:
+                break
+
+            for suffix in (".body", ".json"):
+                try:
+                    os.remove(self._path(key, suffix))
+                except OSError:
+                    pass
+            del self._entries[key]
+            total_size -= size
+
+    def _read_body(self, key: str) -> bytes:
+        with open(self._path(key, ".body"), "rb") as f:
+            content: bytes = f.read()
+
+        with self._lock:
+            self._entries[key] = (len(content), time.time())
+
+        return content
+
+    def _cached_response(
+        self, request: PreparedRequest, key: str, meta: Dict[str, Any]
+    ) -> Response:
+        content: bytes = self._read_body(key=key)
+
+        response: Response = Response()
+        response.status_code = 200
+        response.reason = "OK"
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        response.headers = CaseInsensitiveDict(meta["headers"])
+        response.encoding = get_encoding_from_headers(response.headers)
+        response._content = content
+        response.from_cache = True
+
+        return response
@@ -0,0 +1,209 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from urllib3.util import Retry
+
+# Latency histogram buckets in seconds
+BUCKETS: Tuple[float, ...] = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+class Histogram:
+    """
+    Latency histogram with fixed buckets.
+    """
+
+    def __init__(self) -> None:
+        self.bucket_counts: List[int] = [0] * len(BUCKETS)
+        self.count: int = 0
+        self.sum: float = 0.0
+        self.max: float = 0.0
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+        for i, bound in enumerate(BUCKETS):
+            if value <= bound:
+                self.bucket_counts[i] += 1
+                break
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "mean": self.sum / self.count if self.count else 0.0,
+            "max": self.max,
+        }
+
+
+class MetricsExporter:
+    """
+    Base of metrics exporters (hooks called with Metrics at export time).
+    """
+
+    def export(self, metrics: "Metrics") -> None:
+        raise NotImplementedError
+
+
+class Metrics:
+    """
+    Thread safe registry of crawl counters, gauges and per-stage latency histograms.
+    """
+
+    def __init__(self, exporters: Optional[List[MetricsExporter]] = None) -> None:
+        self.exporters: List[MetricsExporter] = exporters or []
+        self.counters: Dict[str, float] = {}
+        self.gauges: Dict[str, float] = {}
+        self.histograms: Dict[str, Histogram] = {}
+        self._lock: threading.Lock = threading.Lock()
+
+    def inc(self, name: str, value: float = 1) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def set(self, name: str, value: float) -> None:
+        with self._lock:
+            self.gauges[name] = value
+
+    def observe(self, name: str, seconds: float) -> None:
+        with self._lock:
+            self.histograms.setdefault(name, Histogram()).observe(seconds)
+
+    @contextmanager
+    def timer(self, stage: str) -> Iterator[None]:
+        """
+        Observe wall time of the block in `stage` histogram.
+        """
+        start: float = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start)
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "counters": dict(self.counters),
+                "gauges": dict(self.gauges),
+                "stages": {
+                    name: histogram.summary()
+                    for name, histogram in self.histograms.items()
+                },
+            }
+
+    def export(self) -> None:
+        """
+        Run all exporters.
+        """
+        for exporter in self.exporters:
+            exporter.export(metrics=self)
+
+
+def write_atomic(file_path: str, content: str) -> None:
+    temp_path: str = file_path + ".tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        f.write(content)
+    os.replace(temp_path, file_path)
+
+
+class PrometheusFileExporter(MetricsExporter):
+    """
+    Writes metrics in Prometheus text format, e.g. for node_exporter
+    textfile collector.
+    """
+
+    def __init__(self, file_path: str, prefix: str = "otodom_") -> None:
+        self.file_path: str = file_path
+        self.prefix: str = prefix
+
+    def render(self, metrics: Metrics) -> str:
+        lines: List[str] = []
+
+        with metrics._lock:
+            for name, value in sorted(metrics.counters.items()):
+                lines.append(f"# TYPE {self.prefix}{name}_total counter")
+                lines.append(f"{self.prefix}{name}_total {value}")
+
+            for name, value in sorted(metrics.gauges.items()):
+                lines.append(f"# TYPE {self.prefix}{name} gauge")
+                lines.append(f"{self.prefix}{name} {value}")
+
+            for name, histogram in sorted(metrics.histograms.items()):
+                metric: str = f"{self.prefix}{name}_seconds"
+                lines.append(f"# TYPE {metric} histogram")
+                cumulative: int = 0
+                for bound, count in zip(BUCKETS, histogram.bucket_counts):
+                    cumulative += count
+                    lines.append(f'{metric}_bucket{{le="{bound}"}} {cumulative}')
+                lines.append(f'{metric}_bucket{{le="+Inf"}} {histogram.count}')
+                lines.append(f"{metric}_sum {histogram.sum}")
+                lines.append(f"{metric}_count {histogram.count}")
+
+        return "\n".join(lines) + "\n"
+
+    def export(self, metrics: Metrics) -> None:
+        write_atomic(file_path=self.file_path, content=self.render(metrics))
+
+
+class JsonSummaryExporter(MetricsExporter):
+    """
+    Writes counters and per-stage latency summary to JSON file.
+    """
+
+    def __init__(self, file_path: str) -> None:
+        self.file_path: str = file_path
+
+    def export(self, metrics: Metrics) -> None:
+        write_atomic(
+            file_path=self.file_path,
+            content=json.dumps(metrics.summary(), indent=2),
+        )
+
+
+class CountingRetry(Retry):
+    """
+    urllib3 Retry counting retries of the session in Metrics.
+    """
+
+    metrics: Optional[Metrics] = None
+
+    def new(self, **kw: Any) -> "CountingRetry":
+        retry: "CountingRetry" = super().new(**kw)
+        retry.metrics = self.metrics
+
+        return retry
+
+    def increment(self, *args: Any, **kwargs: Any) -> Retry:
+        if self.metrics:
+            self.metrics.inc("urllib3_retries")
+
+        return super().increment(*args, **kwargs)
+
+
+def count_retry(retry_state: Any) -> None:
+    """
+    Tenacity before_sleep hook - counts retries of scraper method in its Metrics.
+    """
+    metrics: Optional[Metrics] = getattr(
+        retry_state.args[0] if retry_state.args else None, "metrics", None
+    )
+
+    if metrics:
+        metrics.inc(f"{retry_state.fn.__name__}_retries")
@@ -0,0 +1,132 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional
+
+from data_types.estate import Estate
+from scraper.otodom_scraper import OtoDomScraper
+
+
+class MultiSearchScraper(OtoDomScraper):
+    """
+    Runs all search profiles (searches in parameters.yaml) in one crawl.
+    Listing pages of all profiles are walked concurrently, sharing one session,
+    rate limiter, metrics and dead-letter file, then every advert is fetched
+    once and tagged with names of profiles which found it.
+    """
+
+    def __init__(self, params: Optional[Dict[str, Any]] = None) -> None:
+        params = params if params is not None else self.PARAMS
+        if (params.get("listing_only") or {}).get("enabled"):
+            raise ValueError("listing_only is supported for single search only")
+        # Seen index is kept per profile, not for the combined crawl,
+        # checkpoint is not supported (links of all profiles are collected first)
+        params = {**params, "checkpoint_file": None}
+        super().__init__(params={**params, "incremental": False})
+
+        self.scrapers: Dict[str, OtoDomScraper] = {}
+        for i, profile in enumerate(params["searches"]):
+            name: str = profile.get("name", f"search_{i + 1}")
+            self.scrapers[name] = OtoDomScraper(
+                params={**params, **profile},
+                session=self.session,
+                rate_limiter=self.rate_limiter,
+                metrics=self.metrics,
+                circuit_breaker=self.circuit_breaker,
+                raw_archive=self.raw_archive,
+                # One lock for all appends to the file
+                dead_letters=self.dead_letters,
+            )
+
+    @staticmethod
+    def collect_profile_links(scraper: OtoDomScraper) -> List[str]:
+        """
+        Walk listing pages of single search profile.
+
+        Args:
+            scraper (OtoDomScraper): scraper set up for the profile
+
+        Returns:
+            List[str]: urls of estate adverts found by the profile
+        """
+        estate_links: List[str] = []
+
+        for page_num, page_links in scraper.iter_listing_pages():
+            logging.info(
+                msg=f"### Listing page {page_num} collected "
+                + f"({len(page_links)} adverts) ###"
+            )
+            estate_links.extend(page_links)
+
+        return estate_links
+
+    def collect_estate_links(self) -> Dict[str, List[str]]:
+        """
+        Walk listing pages of all profiles concurrently.
+
+        Returns:
+            Dict[str, List[str]]: unique estate urls and names of profiles
+                which found them, in profiles order
+        """
+        matches: Dict[str, List[str]] = {}
+
+        with ThreadPoolExecutor(max_workers=len(self.scrapers)) as executor:
+            profile_links = executor.map(
+                self.collect_profile_links, self.scrapers.values()
+            )
+
+            for name, estate_links in zip(self.scrapers, profile_links):
+                for link in estate_links:
+                    matches.setdefault(link, [])
+                    if name not in matches[link]:
+                        matches[link].append(name)
+
+        return matches
+
+    def iter_site(self) -> Iterator[Estate]:
+        """
+        Yields validated Estate models of all profiles, each advert once,
+        tagged with matching profiles.
+
+        Returns:
+            Iterator[Estate]: validated Estate models
+        """
+        if self.PARAMS["verbose_logging"]:
+            logging.info(
+                f"## Scraper started ({len(self.scrapers)} searches) ##"
+            )
+
+        matches: Dict[str, List[str]] = self.collect_estate_links()
+        logging.info(msg=f"### {len(matches)} unique adverts found ###")
+
+        for estate in self.iter_estates(estate_links=list(matches)):
+            estate.profiles = matches[estate.url]
+            yield estate
+
+            for name in estate.profiles:
+                seen_index = self.scrapers[name].seen_index
+                if seen_index:
+                    seen_index.mark_seen(slugs=[self.get_slug(estate.url)])
+
+        self.close_parse_pool()
+
+        # For script execution time probing
+        self.time_stop = time.time()
+
+        if self.PARAMS["verbose_logging"]:
+            logging.info(
+                msg=f"## Scraper finished ##\n# Execution time "
+                + str(self.time_stop - self.time_start)
+                + " seconds #"
+            )
+
+        self.metrics.export()
+
+    def close(self) -> None:
+        """
+        Close scrapers of all profiles and the shared connection pool.
+        """
+        for scraper in self.scrapers.values():
+            scraper.close()
+
+        super().close()
@@ -0,0 +1,64 @@
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup
+
+NEXT_DATA_MARKER: bytes = b'id="__NEXT_DATA__"'
+SCRIPT_OPEN: bytes = b"<script"
+SCRIPT_CLOSE: bytes = b"</script>"
+
+
+class MissingNextDataError(AttributeError):
+    """
+    Raised when page has no __NEXT_DATA__ script - page cut short or served
+    by anti-bot wall instead of advert.
+    """
+
+
+def next_data_from_soup(soup: "BeautifulSoup") -> str:
+    """
+    Returns __NEXT_DATA__ script body from already built Bs4 soup.
+
+    Raises:
+        MissingNextDataError: when page has no __NEXT_DATA__ script
+    """
+    script = soup.find(id="__NEXT_DATA__")
+
+    if script is None:
+        raise MissingNextDataError("page has no __NEXT_DATA__ script")
+
+    return script.text
+
+
+def extract_next_data(page_source: bytes) -> str:
+    """
+    Slice __NEXT_DATA__ script body straight from raw page bytes, without building
+    a DOM tree. Falls back to Bs4 if markup is not as expected.
+
+    Args:
+        page_source (bytes): raw page content
+
+    Returns:
+        str: __NEXT_DATA__ JSON string
+
+    Raises:
+        MissingNextDataError: when page has no __NEXT_DATA__ script
+    """
+    marker: int = page_source.find(NEXT_DATA_MARKER)
+
+    if marker != -1:
+        tag_start: int = page_source.rfind(b"<", 0, marker)
+        body_start: int = page_source.find(b">", marker) + 1
+        body_end: int = page_source.find(SCRIPT_CLOSE, body_start)
+
+        if (
+            page_source.startswith(SCRIPT_OPEN, tag_start)
+            and body_start
+            and body_end != -1
+        ):
+            return page_source[body_start:body_end].decode("utf-8")
+
+    # Imported here so pages with expected markup never load bs4
+    from bs4 import BeautifulSoup
+
+    return next_data_from_soup(BeautifulSoup(page_source, "html.parser"))
@@ -1,20 +1,77 @@
+import atexit
 import json
 import logging
 import time
-from time import sleep
-from typing import Any, Dict, List
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from queue import Queue
+from threading import Thread
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 
-from bs4 import BeautifulSoup
 from requests import Response
 from requests.adapters import HTTPAdapter
 from requests.sessions import Session
 from tenacity import retry
-from tenacity.wait import wait_exponential
 from urllib3.util import Retry
 
-from config.config_handler import ParametersHandler
+from config.config_handler import DefaultParams
+from data_types.description_cleaner import (
+    BOILERPLATE_PHRASES,
+    description_phrases,
+)
 from data_types.estate import Estate
+from data_types.estate_delta import EstateDelta
 from data_types.estate_details import EstateDetails
+from data_types.estate_full_details import EstateFullDetails
+from data_types.estate_record import EstateRecord
+from scraper.adaptive_throttle import (
+    AdaptiveThrottle,
+    ResponseStatusError,
+    ThrottledResponseError,
+    parse_retry_after,
+    should_retry,
+    wait_throttled,
+)
+from scraper.circuit_breaker import CircuitBreaker
+from scraper.http_cache import CachingHTTPAdapter
+from scraper.metrics import (
+    CountingRetry,
+    JsonSummaryExporter,
+    Metrics,
+    MetricsExporter,
+    PrometheusFileExporter,
+    count_retry,
+)
+from scraper.next_data import (
+    MissingNextDataError,
+    extract_next_data,
+    next_data_from_soup,
+)
+from scraper.parse_pool import bounded_map, parse_estate_page
+from scraper.rate_limiter import RateLimiter
+from scraper.retry_policy import FETCH_ERRORS, PARSE, RetryPolicy, retry_on
+from storage.checkpoint import CrawlCheckpoint
+from storage.dead_letter import DeadLetterFile
+from storage.fingerprints import FingerprintStore, fingerprint
+from storage.raw_archive import BODY, NEXT_DATA, RawArchive
+from storage.seen_index import SeenIndex
+from storage.writers import TextWriter, get_writer
+
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+
+    from bs4 import BeautifulSoup
 
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s:%(message)s"
@@ -22,35 +79,366 @@ logging.basicConfig(
 
 
 class OtoDomScraper:
-    # From parameters.yaml
-    PARAMS: Dict[str, Any] = ParametersHandler().get_params()
-
-    def __init__(self) -> None:
-        self.session: Session = self._init_session()
+    # From parameters.yaml, read on first access
+    PARAMS: Dict[str, Any] = DefaultParams()
+
+    def __init__(
+        self,
+        params: Optional[Dict[str, Any]] = None,
+        session: Optional[Session] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        metrics: Optional[Metrics] = None,
+        resume: bool = False,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        raw_archive: Optional[RawArchive] = None,
+        dead_letters: Optional[DeadLetterFile] = None,
+    ) -> None:
+        """
+        Args:
+            params (Optional[Dict[str, Any]]): params overriding parameters.yaml ones
+            session (Optional[Session]): session shared with other scrapers
+            rate_limiter (Optional[RateLimiter]): rate limiter shared with other scrapers
+            metrics (Optional[Metrics]): metrics registry shared with other scrapers
+            resume (bool): continue interrupted crawl from its checkpoint
+            circuit_breaker (Optional[CircuitBreaker]): circuit breaker shared
+                with other scrapers
+            raw_archive (Optional[RawArchive]): raw page archive shared
+                with other scrapers
+            dead_letters (Optional[DeadLetterFile]): dead-letter file shared
+                with other scrapers
+        """
+        if params is not None:
+            self.PARAMS = params
+
+        self.metrics: Metrics = metrics or self._init_metrics()
+        # Shared session is closed by its owner
+        self._owns_session: bool = session is None
+        self.session: Session = session or self._init_session()
+        # Politeness budget shared by all concurrent workers
+        self.rate_limiter: RateLimiter = (
+            rate_limiter or self._init_rate_limiter()
+        )
+        self.retry_policy: RetryPolicy = RetryPolicy.from_params(
+            settings=self.PARAMS.get("retry_policy")
+        )
+        # Passed to validation, also in parse worker processes
+        self.description_phrases: Tuple[str, ...] = tuple(
+            self.PARAMS.get("description_boilerplate", BOILERPLATE_PHRASES)
+        )
+        self.circuit_breaker: Optional[CircuitBreaker] = (
+            circuit_breaker or self._init_circuit_breaker()
+        )
+        self.dead_letters: Optional[DeadLetterFile] = (
+            dead_letters or self._init_dead_letters()
+        )
+        self.seen_index: Optional[SeenIndex] = self._init_seen_index()
+        self.fingerprints: Optional[
+            FingerprintStore
+        ] = self._init_fingerprints()
+        self.checkpoint: Optional[CrawlCheckpoint] = self._init_checkpoint(
+            resume=resume
+        )
+        # Shared archive is closed by its owner
+        self._owns_raw_archive: bool = raw_archive is None
+        self.raw_archive: Optional[RawArchive] = (
+            raw_archive or self._init_raw_archive()
+        )
+        # Started on first use, see parse_pool property
+        self._parse_pool: Optional["ProcessPoolExecutor"] = None
         # For script execution time probing
         self.time_start: float = time.time()
         self.time_stop: float
 
+    def __enter__(self) -> "OtoDomScraper":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Close connection pool (if session is not shared), parse worker processes,
+        on-disk indexes and raw archive (if not shared).
+        """
+        self.close_parse_pool()
+
+        if self._owns_session:
+            self.session.close()
+        self.close_stores()
+
+    def close_stores(self) -> None:
+        """
+        Close on-disk indexes and raw archive (if not shared).
+        """
+        if self.seen_index:
+            self.seen_index.close()
+        if self.fingerprints:
+            self.fingerprints.close()
+        if self.raw_archive and self._owns_raw_archive:
+            self.raw_archive.close()
+
+    def _init_metrics(self) -> Metrics:
+        """
+        Start metrics registry with exporters set up in parameters.yaml,
+        exported at the end of crawl and at process exit.
+
+        Returns: Metrics object
+        """
+        exporters: List[MetricsExporter] = []
+        config: Dict[str, Any] = self.PARAMS.get("metrics") or {}
+
+        if config.get("prometheus_file"):
+            exporters.append(
+                PrometheusFileExporter(file_path=config["prometheus_file"])
+            )
+        if config.get("json_summary"):
+            exporters.append(
+                JsonSummaryExporter(file_path=config["json_summary"])
+            )
+
+        metrics: Metrics = Metrics(exporters=exporters)
+        if exporters:
+            atexit.register(metrics.export)
+
+        return metrics
+
+    def _init_rate_limiter(self) -> RateLimiter:
+        """
+        Start rate limiter - adaptive throttle if enabled in parameters.yaml,
+        fixed requests_per_second otherwise.
+
+        Returns: RateLimiter object
+        """
+        throttle: Dict[str, Any] = self.PARAMS.get("throttle") or {}
+
+        if not throttle.get("enabled"):
+            return RateLimiter(
+                requests_per_second=self.PARAMS.get("requests_per_second", 0)
+            )
+
+        return AdaptiveThrottle(
+            requests_per_second=self.PARAMS.get("requests_per_second", 0),
+            min_rate=throttle.get("min_rate", 0.2),
+            max_rate=throttle.get("max_rate", 10.0),
+            increase=throttle.get("increase", 0.1),
+            backoff=throttle.get("backoff", 0.5),
+            latency_tolerance=throttle.get("latency_tolerance", 2.0),
+            min_concurrency=1,
+            max_concurrency=self._max_concurrency(),
+            metrics=self.metrics,
+        )
+
+    def _init_circuit_breaker(self) -> Optional[CircuitBreaker]:
+        """
+        Start circuit breaker if enabled in parameters.yaml.
+
+        Returns: CircuitBreaker object or None
+        """
+        breaker: Dict[str, Any] = self.PARAMS.get("circuit_breaker") or {}
+
+        if not breaker.get("enabled"):
+            return None
+
+        return CircuitBreaker(
+            error_rate=breaker.get("error_rate", 0.5),
+            window=breaker.get("window", 20),
+            min_requests=breaker.get("min_requests", 10),
+            cooldown=breaker.get("cooldown", 30.0),
+            max_cooldown=breaker.get("max_cooldown", 300.0),
+            metrics=self.metrics,
+        )
+
+    def _init_dead_letters(self) -> Optional[DeadLetterFile]:
+        """
+        Open dead-letter file if dead_letter_file is set up in parameters.yaml.
+
+        Returns: DeadLetterFile object or None
+        """
+        if not self.PARAMS.get("dead_letter_file"):
+            return None
+
+        return DeadLetterFile(file_path=self.PARAMS["dead_letter_file"])
+
+    def _max_concurrency(self) -> int:
+        """
+        Returns upper bound of requests in flight for adaptive throttle.
+        """
+        # Listing producer thread fetches alongside advert workers
+        return self.PARAMS.get("workers", 1) + 1
+
+    def _init_seen_index(self) -> Optional[SeenIndex]:
+        """
+        Open index of already scraped slugs if incremental crawl is set up
+        in parameters.yaml. Index is keyed by search url without page number.
+
+        Returns: SeenIndex object or None
+        """
+        if not self.PARAMS.get("incremental"):
+            return None
+
+        return SeenIndex(
+            index_path=self.PARAMS["seen_index_file"],
+            search_key=self.construct_url_for_listing(page="*"),
+        )
+
+    def _init_fingerprints(self) -> Optional[FingerprintStore]:
+        """
+        Open store of advert fingerprints if change detection or listing-only
+        crawl with enrichment is set up in parameters.yaml.
+
+        Returns: FingerprintStore object or None
+        """
+        listing_only: Dict[str, Any] = self.PARAMS.get("listing_only") or {}
+        if not (
+            self.PARAMS.get("change_detection")
+            or (listing_only.get("enabled") and listing_only.get("enrich"))
+        ):
+            return None
+
+        return FingerprintStore(
+            store_path=self.PARAMS["fingerprint_file"],
+            search_key=self.construct_url_for_listing(page="*"),
+        )
+
+    def _init_raw_archive(self) -> Optional[RawArchive]:
+        """
+        Open raw page archive if enabled in parameters.yaml.
+
+        Returns: RawArchive object or None
+        """
+        archive: Dict[str, Any] = self.PARAMS.get("raw_archive") or {}
+
+        if not archive.get("enabled"):
+            return None
+
+        return RawArchive(
+            directory=archive.get("directory", "raw_archive"),
+            segment_size=archive.get("segment_size_mb", 64) * 1024 * 1024,
+            compression_level=archive.get("compression_level", 6),
+        )
+
+    def _init_checkpoint(self, resume: bool) -> Optional[CrawlCheckpoint]:
+        """
+        Start crawl checkpoint if checkpoint_file is set up in parameters.yaml,
+        loaded from the file if crawl is resumed.
+
+        Returns: CrawlCheckpoint object or None
+        """
+        if not self.PARAMS.get("checkpoint_file"):
+            return None
+
+        checkpoint: CrawlCheckpoint = CrawlCheckpoint(
+            checkpoint_path=self.PARAMS["checkpoint_file"],
+            search_key=self.construct_url_for_listing(page="*"),
+            every=self.PARAMS.get("checkpoint_every", 25),
+        )
+        if resume and not checkpoint.load():
+            logging.info(msg="No checkpoint found, starting crawl from page 1")
+
+        return checkpoint
+
     def _init_session(self) -> Session:
         """
-        Start session per single requests instance.
+        Start session per single requests instance - its connection pool is kept
+        alive for the whole crawl (connection_pool in parameters.yaml).
 
         Returns: requests.session object
         """
         session: Session = Session()
-        retries: Retry = Retry(
+        retries: CountingRetry = CountingRetry(
             connect=self.PARAMS["retry"]["connect"],
             read=self.PARAMS["retry"]["read"],
             redirect=self.PARAMS["retry"]["read"],
         )
+        retries.metrics = self.metrics
         # Custom retries from parameters.yaml
-        session.mount("http://", HTTPAdapter(max_retries=retries))
-        session.mount("https://", HTTPAdapter(max_retries=retries))
+        adapter: HTTPAdapter = self._init_adapter(max_retries=retries)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
         # Cutsom header from parameters.yaml in order to avoid blocking
         session.headers.update({"User-agent": self.PARAMS["agent"]})
 
+        pool: Dict[str, Any] = self.PARAMS.get("connection_pool") or {}
+        if not pool.get("keep_alive", True):
+            session.headers["Connection"] = "close"
+        if not pool.get("compression", True):
+            # Default gzip, deflate otherwise
+            session.headers["Accept-Encoding"] = "identity"
+
         return session
 
+    def _init_adapter(self, max_retries: Retry) -> HTTPAdapter:
+        """
+        Returns transport adapter for session - caching one if http_cache
+        is enabled in parameters.yaml.
+        """
+        cache: Dict[str, Any] = self.PARAMS.get("http_cache") or {}
+        pool_size: int = (self.PARAMS.get("connection_pool") or {}).get(
+            "size"
+        ) or self._max_concurrency()
+
+        if not cache.get("enabled"):
+            return HTTPAdapter(max_retries=max_retries, pool_maxsize=pool_size)
+
+        return CachingHTTPAdapter(
+            cache_dir=cache["directory"],
+            # Url classes: listing pages and estate adverts
+            ttl_by_prefix={
+                self.PARAMS["search_base_url"]: cache["ttl"]["listing"],
+                self.PARAMS["result_base_url"]: cache["ttl"]["advert"],
+            },
+            max_size_bytes=cache["max_size_mb"] * 1024 * 1024,
+            max_retries=max_retries,
+            pool_maxsize=pool_size,
+        )
+
+    @property
+    def parse_pool(self) -> "ProcessPoolExecutor":
+        """
+        Pool of parse worker processes (parse_processes in parameters.yaml).
+        """
+        if not self._parse_pool:
+            # Imported here so crawl without parse processes does not load
+            # multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+            from multiprocessing import get_context
+
+            self._parse_pool = ProcessPoolExecutor(
+                max_workers=self.PARAMS["parse_processes"],
+                # Forking while fetching threads hold locks is not safe
+                mp_context=get_context("spawn"),
+            )
+
+        return self._parse_pool
+
+    @property
+    def fast_records(self) -> bool:
+        """
+        Crawl builds compact EstateRecords (fast_records in parameters.yaml) -
+        not with full_details, which EstateRecord does not hold.
+        """
+        return bool(
+            self.PARAMS.get("fast_records")
+            and not self.PARAMS.get("full_details")
+        )
+
+    def close_parse_pool(self) -> None:
+        """
+        Shut down parse worker processes if started.
+        """
+        if self._parse_pool:
+            self._parse_pool.shutdown()
+            self._parse_pool = None
+
+    @property
+    def http_cache(self) -> Optional[CachingHTTPAdapter]:
+        """
+        Caching adapter of the session (with hit/miss counters) if enabled.
+        """
+        adapter: HTTPAdapter = self.session.get_adapter("https://")
+
+        return adapter if isinstance(adapter, CachingHTTPAdapter) else None
+
     def construct_url_for_listing(self, page: str):
         """
         Construct and return url for estate listing page accordingly
@@ -96,30 +484,169 @@ class OtoDomScraper:
 
         return constructed_url
 
-    @retry(wait=wait_exponential(multiplier=1, min=2, max=5))
-    def get_listing_page_soup(self, page_no: int) -> BeautifulSoup:
+    @retry(
+        retry=retry_on(*FETCH_ERRORS),
+        wait=wait_throttled,
+        before_sleep=count_retry,
+    )
+    def fetch(self, url: str) -> bytes:
         """
-        Returns Bs4 soup of listing page at desired page number.
+        Returns raw page content - fresh HTTP cache entry at once, otherwise
+        request waits for circuit breaker and rate limiter, which get response
+        status and latency back (adaptive throttle feedback). 429 and 5xx
+        responses raise ThrottledResponseError, other 4xx ones
+        ResponseStatusError - retried within budget of retry policy.
 
         Args:
-            page_no (int): number of listing page to scrap soup from
+            url (str): url of page to fetch
 
         Returns:
-            BeautifulSoup: soup of listing page
+            bytes: raw page content
+        """
+        # Fresh cache hits take no network, so they are neither paced nor fed
+        # back to throttle and circuit breaker
+        if self.http_cache:
+            cached: Optional[bytes] = self.http_cache.fresh_content(url=url)
+            if cached is not None:
+                return cached
+
+        probe: bool = False
+        if self.circuit_breaker:
+            probe = self.circuit_breaker.acquire()
+        self.rate_limiter.acquire()
+        status: Optional[int] = None
+        retry_after: Optional[float] = None
+        start: float = time.perf_counter()
+
+        try:
+            # Stalled read fails after request_timeout, so that it is retried
+            # within network budget instead of blocking the worker
+            page_source: Response = self.session.get(
+                url, timeout=self.PARAMS.get("request_timeout", 60)
+            )
+            status = page_source.status_code
+            retry_after = parse_retry_after(
+                page_source.headers.get("Retry-After")
+            )
+        finally:
+            self.rate_limiter.release(
+                status=status,
+                latency=time.perf_counter() - start,
+                retry_after=retry_after,
+            )
+            if self.circuit_breaker:
+                self.circuit_breaker.release(
+                    failed=status is None or should_retry(status),
+                    probe=probe,
+                )
+
+        if should_retry(status):
+            raise ThrottledResponseError(
+                url=url, status=status, retry_after=retry_after
+            )
+        if status >= 400:
+            raise ResponseStatusError(url=url, status=status)
+
+        self.metrics.inc("bytes_downloaded", len(page_source.content))
+
+        return page_source.content
+
+    def get_listing_page_source(self, page_no: int) -> bytes:
+        """
+        Returns raw content of listing page at desired page number.
+
+        Args:
+            page_no (int): number of listing page to fetch
+
+        Returns:
+            bytes: raw listing page content
         """
         constructed_url: str = self.construct_url_for_listing(
             page=page_no
         )
         logging.info(msg="Search url " + constructed_url)
 
-        with self.session as s:
-            page_source: Response = s.get(url=constructed_url)
-            soup = BeautifulSoup(page_source.text, "html.parser")
+        try:
+            with self.metrics.timer("listing_fetch"):
+                page_source: bytes = self.fetch(url=constructed_url)
+        except Exception as e:
+            self.record_failure(url=constructed_url, error=e, kind="listing")
+            raise
+
+        self.metrics.inc("listing_pages")
+
+        return page_source
+
+    def get_estate_page_source(self, estate_url: str) -> bytes:
+        """
+        Returns raw content of estate advert.
+
+        Args:
+            estate_url (str): estate url to fetch
+
+        Returns:
+            bytes: raw estate advert content
+        """
+        with self.metrics.timer("advert_fetch"):
+            page_source: bytes = self.fetch(url=estate_url)
+
+        self.metrics.inc("adverts_fetched")
+        if self.raw_archive:
+            self.archive_page(estate_url=estate_url, page_source=page_source)
+
+        return page_source
+
+    def archive_page(self, estate_url: str, page_source: bytes) -> None:
+        """
+        Keep fetched advert in raw archive - its __NEXT_DATA__ payload or full
+        body (raw_archive content in parameters.yaml), to be re-parsed later
+        without fetching (see scraper.reparse).
 
-        return soup
+        Args:
+            estate_url (str): estate advert url
+            page_source (bytes): raw estate advert content
+        """
+        content: str = self.PARAMS["raw_archive"].get("content", NEXT_DATA)
+        payload: bytes = page_source
+
+        if content != BODY:
+            try:
+                payload = extract_next_data(page_source=page_source).encode(
+                    "utf-8"
+                )
+            except MissingNextDataError:
+                # Nothing to re-parse, advert is fetched again (parse retry)
+                return
+
+        with self.metrics.timer("archive"):
+            archived: bool = self.raw_archive.put(
+                slug=self.get_slug(estate_url),
+                url=estate_url,
+                payload=payload,
+                content=content,
+            )
 
-    @retry(wait=wait_exponential(multiplier=1, min=2, max=5))
-    def get_estate_page_soup(self, estate_url: str) -> BeautifulSoup:
+        if archived:
+            self.metrics.inc("pages_archived")
+
+    def get_listing_page_soup(self, page_no: int) -> "BeautifulSoup":
+        """
+        Returns Bs4 soup of listing page at desired page number.
+
+        Args:
+            page_no (int): number of listing page to scrap soup from
+
+        Returns:
+            BeautifulSoup: soup of listing page
+        """
+        # Imported here, soups are not built on __NEXT_DATA__ hot path
+        from bs4 import BeautifulSoup
+
+        return BeautifulSoup(
+            self.get_listing_page_source(page_no=page_no), "html.parser"
+        )
+
+    def get_estate_page_soup(self, estate_url: str) -> "BeautifulSoup":
         """
         Returns Bs4 soup of estate advert.
 
@@ -129,71 +656,282 @@ class OtoDomScraper:
         Returns:
             BeautifulSoup: soup of estate advert
         """
+        from bs4 import BeautifulSoup
 
-        with self.session as s:
-            page_source: Response = s.get(estate_url)
-            soup: BeautifulSoup = BeautifulSoup(
-                page_source.text, "html.parser"
-            )
+        return BeautifulSoup(
+            self.get_estate_page_source(estate_url=estate_url),
+            "html.parser",
+        )
 
-            return soup
+    @staticmethod
+    def get_next_data(page: Union["BeautifulSoup", bytes]) -> str:
+        """
+        Returns __NEXT_DATA__ script body of a page - sliced straight from raw
+        bytes when possible, read from soup otherwise.
+
+        Args:
+            page (Union[BeautifulSoup, bytes]): raw page content or its soup
+
+        Returns:
+            str: __NEXT_DATA__ JSON string
+        """
+        if not isinstance(page, bytes):
+            return next_data_from_soup(soup=page)
+
+        return extract_next_data(page_source=page)
+
+    def decode_next_data(
+        self, page: Union["BeautifulSoup", bytes]
+    ) -> Dict[str, Any]:
+        """
+        Returns decoded __NEXT_DATA__ JSON of a page.
+
+        Args:
+            page (Union[BeautifulSoup, bytes]): raw page content or its soup
+
+        Returns:
+            Dict[str, Any]: __NEXT_DATA__ content
+        """
+        with self.metrics.timer("next_data_decode"):
+            return json.loads(self.get_next_data(page=page))
 
     def get_estate_links_from_listing(
-        self, listing_soup: BeautifulSoup
+        self, listing_soup: Union["BeautifulSoup", bytes]
     ) -> List[str]:
         """
         Collect all links to estate adverts from listing page.
 
         Args:
-            listing_soup (BeautifulSoup): soup of specified listing page
+            listing_soup (Union[BeautifulSoup, bytes]): raw content or soup
+                of specified listing page
 
         Returns:
             List[str]: list of urls
         """
-        script: str = listing_soup.find(id="__NEXT_DATA__").text
-        script_json: str = json.loads(script)
-        script_json_estates: str = script_json["props"]["pageProps"][
-            "data"
-        ]["searchAds"]["items"]
-
         estate_urls: List[str] = []
 
-        for elem in script_json_estates:
+        for elem in self.get_listing_items(listing_soup=listing_soup):
             estate_urls.append(
                 self.PARAMS["result_base_url"] + elem["slug"]
             )
 
         return estate_urls
 
+    def get_listing_items(
+        self, listing_soup: Union["BeautifulSoup", bytes]
+    ) -> List[Dict[str, Any]]:
+        """
+        Collect advert items (slug, price, area, location, title...) of listing page.
+
+        Args:
+            listing_soup (Union[BeautifulSoup, bytes]): raw content or soup
+                of specified listing page
+
+        Returns:
+            List[Dict[str, Any]]: searchAds items of listing __NEXT_DATA__
+        """
+        script_json: Dict[str, Any] = self.decode_next_data(page=listing_soup)
+
+        return script_json["props"]["pageProps"]["data"]["searchAds"]["items"]
+
+    @staticmethod
+    def details_from_listing_item(item: Dict[str, Any]) -> List[str]:
+        """
+        Collect details from listing item - location is city name (advert pages
+        carry its code) and description is short one.
+
+        Args:
+            item (Dict[str, Any]): searchAds item of listing __NEXT_DATA__
+
+        Returns:
+            List[str]: list of estate details
+        """
+        price: Any = (item.get("totalPrice") or {}).get("value")
+        size: Any = item.get("areaInSquareMeters")
+        address: Dict[str, Any] = (item.get("location") or {}).get(
+            "address"
+        ) or {}
+
+        return [
+            # Price hidden by advertiser
+            "" if price is None else str(price),
+            "" if size is None else str(size),
+            (address.get("city") or {}).get("name"),
+            item.get("shortDescription") or "",
+        ]
+
+    @staticmethod
+    def listing_fingerprint(item: Dict[str, Any]) -> str:
+        """
+        Returns fingerprint of listing item fields which change when advert is
+        edited or its price changes.
+        """
+        return fingerprint(
+            [
+                item.get(field)
+                for field in (
+                    "title",
+                    "totalPrice",
+                    "areaInSquareMeters",
+                    "pricePerSquareMeter",
+                    "roomsNumber",
+                    "floorNumber",
+                    "dateCreated",
+                    "shortDescription",
+                )
+            ]
+        )
+
+    @staticmethod
+    def get_slug(estate_url: str) -> str:
+        """
+        Returns slug (last url segment) of estate advert url.
+        """
+        return estate_url.rstrip("/").rsplit("/", 1)[-1]
+
+    def select_new_links(self, estate_links: List[str]) -> List[str]:
+        """
+        Drop links to adverts already scraped in previous runs (incremental crawl)
+        or before interruption of resumed crawl (checkpoint).
+
+        Args:
+            estate_links (List[str]): urls of estate adverts from listing page
+
+        Returns:
+            List[str]: urls of adverts not present in seen index nor finished
+        """
+        if self.checkpoint and self.checkpoint.finished:
+            estate_links = [
+                link
+                for link in estate_links
+                if self.get_slug(link) not in self.checkpoint.finished
+            ]
+
+        if not self.seen_index:
+            return estate_links
+
+        known: Set[str] = self.seen_index.seen(
+            slugs=[self.get_slug(link) for link in estate_links]
+        )
+
+        return [
+            link for link in estate_links if self.get_slug(link) not in known
+        ]
+
     def get_estate_details(
-        self, estate_soup: BeautifulSoup
-    ) -> List[str]:
+        self, estate_soup: Union["BeautifulSoup", bytes]
+    ) -> Union[List[str], Dict[str, Any]]:
         """
         Collect details from estate advert page.
 
         Args:
-            estate_soup (BeautifulSoup): soup of estate advert
+            estate_soup (Union[BeautifulSoup, bytes]): raw content or soup
+                of estate advert
+
+        Returns:
+            Union[List[str], Dict[str, Any]]: list of estate details or all
+                advert fields if full_details set in parameters.yaml
+        """
+        script_json: Dict[str, Any] = self.decode_next_data(page=estate_soup)
+
+        with self.metrics.timer("details_extraction"):
+            if self.PARAMS.get("full_details"):
+                return self.full_details_from_next_data(
+                    script_json=script_json
+                )
+
+            return self.details_from_next_data(script_json=script_json)
+
+    @staticmethod
+    def characteristics_by_key(ad: Dict[str, Any]) -> Dict[str, str]:
+        """
+        Map advert characteristics (price, area, rooms...) by key, so details do
+        not depend on order in which Otodom lists them.
+
+        Args:
+            ad (Dict[str, Any]): advert object of __NEXT_DATA__
+
+        Returns:
+            Dict[str, str]: characteristic values by key
+        """
+        return {
+            characteristic["key"]: characteristic["value"]
+            for characteristic in ad.get("characteristics") or []
+        }
+
+    @staticmethod
+    def details_from_next_data(script_json: Dict[str, Any]) -> List[str]:
+        """
+        Collect details from decoded __NEXT_DATA__ of estate advert.
+
+        Args:
+            script_json (Dict[str, Any]): __NEXT_DATA__ content
 
         Returns:
             List[str]: list of estate details
         """
-        script: str = estate_soup.find(id="__NEXT_DATA__").text
-        script_json: Dict[str, str] = json.loads(script)
-        script_json_details: str = script_json["props"]["pageProps"][
-            "ad"
-        ]
+        script_json_details: Dict[str, Any] = script_json["props"][
+            "pageProps"
+        ]["ad"]
+        characteristics: Dict[str, str] = OtoDomScraper.characteristics_by_key(
+            ad=script_json_details
+        )
 
-        price: str = script_json_details["characteristics"][0]["value"]
-        size: str = script_json_details["characteristics"][1]["value"]
+        price: str = characteristics.get("price")
+        size: str = characteristics.get("m")
         location: str = script_json_details["target"]["City"]
         description: str = script_json_details["description"]
 
-        estate_details: List[str] = []
+        return [price, size, location, description]
+
+    @staticmethod
+    def full_details_from_next_data(
+        script_json: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Collect all structured advert data from decoded __NEXT_DATA__ of estate
+        advert - characteristics, target and location fields.
 
-        for i in [price, size, location, description]:
-            estate_details.append(i)
+        Args:
+            script_json (Dict[str, Any]): __NEXT_DATA__ content
 
-        return estate_details
+        Returns:
+            Dict[str, Any]: EstateFullDetails fields
+        """
+        ad: Dict[str, Any] = script_json["props"]["pageProps"]["ad"]
+        characteristics: Dict[str, str] = OtoDomScraper.characteristics_by_key(
+            ad=ad
+        )
+        target: Dict[str, Any] = ad.get("target") or {}
+        location: Dict[str, Any] = ad.get("location") or {}
+        coordinates: Dict[str, Any] = location.get("coordinates") or {}
+        address: Dict[str, Any] = location.get("address") or {}
+
+        return {
+            "price": characteristics.get("price"),
+            "size": characteristics.get("m"),
+            "location": target.get("City"),
+            "description": ad.get("description"),
+            "advert_id": ad.get("id"),
+            "title": ad.get("title"),
+            "created_at": ad.get("createdAt"),
+            "modified_at": ad.get("modifiedAt"),
+            "price_per_m": characteristics.get("price_per_m"),
+            "rooms": characteristics.get("rooms_num"),
+            "floor": characteristics.get("floor_no"),
+            "building_floors": characteristics.get("building_floors_num"),
+            "build_year": characteristics.get("build_year"),
+            "market": characteristics.get("market"),
+            "building_type": characteristics.get("building_type"),
+            "heating": characteristics.get("heating"),
+            "province": target.get("Province"),
+            "district": target.get("District"),
+            "street": (address.get("street") or {}).get("name") or None,
+            "latitude": coordinates.get("latitude"),
+            "longitude": coordinates.get("longitude"),
+            # Listed features repeat in some adverts
+            "features": list(dict.fromkeys(ad.get("features") or [])),
+        }
 
     def parse_estate(self, estate_url: str) -> EstateDetails:
         """
@@ -205,12 +943,44 @@ class OtoDomScraper:
         Returns:
             EstateDetails: validated model of estate details
         """
-        soup: BeautifulSoup = self.get_estate_page_soup(
+        page_source: bytes = self.get_estate_page_source(
             estate_url=estate_url
         )
-        estate_details: List[str] = self.get_estate_details(
-            estate_soup=soup
-        )
+        estate_details: Union[
+            List[str], Dict[str, Any]
+        ] = self.get_estate_details(estate_soup=page_source)
+
+        with self.validation():
+            return self.build_estate_details(estate_details=estate_details)
+
+    @contextmanager
+    def validation(self) -> Iterator[None]:
+        """
+        Validation stage - timed, descriptions cleaned with boilerplate phrases
+        of scraper params (description_boilerplate).
+        """
+        with self.metrics.timer("validation"), description_phrases(
+            self.description_phrases
+        ):
+            yield
+
+    @staticmethod
+    def build_estate_details(
+        estate_details: Union[List[str], Dict[str, Any]]
+    ) -> EstateDetails:
+        """
+        Build validated EstateDetails model from details collected by get_estate_details.
+
+        Args:
+            estate_details (Union[List[str], Dict[str, Any]]): price, size,
+                location and description, or all advert fields
+
+        Returns:
+            EstateDetails: validated model of estate details (EstateFullDetails
+                for all advert fields)
+        """
+        if isinstance(estate_details, dict):
+            return EstateFullDetails(**estate_details)
 
         return EstateDetails(
             price=estate_details[0],
@@ -219,81 +989,704 @@ class OtoDomScraper:
             description=estate_details[3],
         )
 
-    def parse_page(self, listing_soup: BeautifulSoup) -> List[Estate]:
+    @staticmethod
+    def field_fingerprints(
+        estate_details: Union[List[str], Dict[str, Any]]
+    ) -> Dict[str, str]:
+        """
+        Returns fingerprints of details collected by get_estate_details by field name.
+        """
+        if not isinstance(estate_details, dict):
+            estate_details = dict(
+                zip(("price", "size", "location", "description"), estate_details)
+            )
+
+        return {
+            field: fingerprint(value) for field, value in estate_details.items()
+        }
+
+    @property
+    def change_detection(self) -> bool:
+        """
+        Unchanged adverts are skipped (change_detection in parameters.yaml).
+        """
+        return bool(self.PARAMS.get("change_detection") and self.fingerprints)
+
+    def build_estate_record(
+        self,
+        estate_url: str,
+        estate_details: Union[List[str], Dict[str, Any]],
+    ) -> Optional[Union[Estate, EstateRecord, EstateDelta]]:
+        """
+        Validate details collected by get_estate_details into crawl record. With
+        change detection advert unchanged since last crawl is skipped before
+        validation and changed one is wrapped into EstateDelta.
+
+        Args:
+            estate_url (str): url to specific estate advert
+            estate_details (Union[List[str], Dict[str, Any]]): advert details
+
+        Returns:
+            Optional[Union[Estate, EstateRecord, EstateDelta]]: validated estate
+                record, None if advert is unchanged
+        """
+        if self.change_detection:
+            fingerprints: Dict[str, str] = self.field_fingerprints(
+                estate_details=estate_details
+            )
+            changed: List[str] = self.fingerprints.changed_fields(
+                slug=self.get_slug(estate_url), fields=fingerprints
+            )
+            if not changed:
+                self.metrics.inc("adverts_unchanged")
+                return None
+
+        with self.validation():
+            if self.fast_records:
+                estate: EstateRecord = EstateRecord.from_details(
+                    url=estate_url, estate_details=estate_details
+                )
+            else:
+                estate: Estate = Estate(
+                    url=estate_url,
+                    details=self.build_estate_details(
+                        estate_details=estate_details
+                    ),
+                )
+
+        if not self.change_detection:
+            return estate
+
+        return EstateDelta(
+            record=estate, changed=changed, fingerprints=fingerprints
+        )
+
+    @retry(retry=retry_on(PARSE), wait=wait_throttled, before_sleep=count_retry)
+    def parse_estate_record(
+        self, estate_url: str
+    ) -> Optional[Union[Estate, EstateRecord, EstateDelta]]:
+        """
+        Parse estate advert into crawl record - compact EstateRecord if fast_records
+        set in parameters.yaml, Estate model otherwise (see build_estate_record
+        for change detection). Advert without __NEXT_DATA__ is fetched again
+        within parse budget of retry policy.
+
+        Args:
+            estate_url (str): url to specific estate advert
+
+        Returns:
+            Optional[Union[Estate, EstateRecord, EstateDelta]]: validated estate
+                record, None if advert is unchanged
+        """
+        if not (self.fast_records or self.change_detection):
+            return Estate(
+                url=estate_url,
+                details=self.parse_estate(estate_url=estate_url),
+            )
+
+        page_source: bytes = self.get_estate_page_source(
+            estate_url=estate_url
+        )
+        estate_details: Union[
+            List[str], Dict[str, Any]
+        ] = self.get_estate_details(estate_soup=page_source)
+
+        return self.build_estate_record(
+            estate_url=estate_url, estate_details=estate_details
+        )
+
+    def record_failure(
+        self, url: str, error: Exception, kind: str = "advert"
+    ) -> None:
+        """
+        Count, log and add to dead-letter file (dead_letter_file in
+        parameters.yaml) page which failed once its retry budget ran out.
+
+        Args:
+            url (str): url of failed page
+            error (Exception): error of the last attempt
+            kind (str): advert or listing
+        """
+        self.metrics.inc("adverts_failed" if kind == "advert" else "listing_failed")
+        logging.warning(f"Failed {kind} {url}: {error!r}")
+
+        if self.dead_letters:
+            self.dead_letters.add(
+                url=url,
+                kind=kind,
+                error=error,
+                error_class=self.retry_policy.classify(error=error),
+            )
+
+    def parse_estate_safely(
+        self, estate_url: str
+    ) -> Optional[Union[Estate, EstateRecord]]:
+        """
+        Parse estate advert. Failed advert is logged and skipped instead
+        of breaking whole page.
+
+        Args:
+            estate_url (str): url to specific estate advert
+
+        Returns:
+            Optional[Union[Estate, EstateRecord]]: validated estate record
+                or None if parsing failed
+        """
+        try:
+            estate: Optional[
+                Union[Estate, EstateRecord, EstateDelta]
+            ] = self.parse_estate_record(estate_url=estate_url)
+        except Exception as e:
+            self.record_failure(url=estate_url, error=e)
+            return None
+
+        if estate and self.PARAMS["verbose_logging"]:
+            logging.info(f"New entry parsed:\n{estate.url}")
+
+        return estate
+
+    def iter_estates_concurrently(
+        self, estate_links: List[str]
+    ) -> Iterator[Estate]:
+        """
+        Fetch and parse estate adverts on a pool of workers (size in parameters.yaml).
+
+        Args:
+            estate_links (List[str]): urls of estate adverts
+
+        Returns:
+            Iterator[Estate]: validated Estate models in listing order
+        """
+        with ThreadPoolExecutor(
+            max_workers=self.PARAMS["workers"]
+        ) as executor:
+            for estate in executor.map(
+                self.parse_estate_safely, estate_links
+            ):
+                if estate:
+                    yield estate
+
+    def fetch_estate_safely(self, estate_url: str) -> Optional[bytes]:
+        """
+        Fetch raw estate advert, failed one is logged and skipped.
+
+        Args:
+            estate_url (str): url to specific estate advert
+
+        Returns:
+            Optional[bytes]: raw estate advert content or None if fetching failed
+        """
+        try:
+            return self.get_estate_page_source(estate_url=estate_url)
+        except Exception as e:
+            self.record_failure(url=estate_url, error=e)
+            return None
+
+    def iter_estates_in_processes(
+        self, estate_links: List[str]
+    ) -> Iterator[Estate]:
+        """
+        Fetch estate adverts on I/O worker threads and parse them on pool
+        of processes (parse_processes in parameters.yaml), so parsing uses all
+        CPU cores. Each stage holds at most parse_queue_size adverts, so fetching
+        waits for slow parsing instead of piling up raw pages in memory.
+
+        Args:
+            estate_links (List[str]): urls of estate adverts
+
+        Returns:
+            Iterator[Estate]: validated Estate models in listing order
+        """
+        queue_size: int = self.PARAMS.get(
+            "parse_queue_size", 2 * self.PARAMS["parse_processes"]
+        )
+
+        with ThreadPoolExecutor(
+            max_workers=self.PARAMS.get("workers", 1)
+        ) as executor:
+            fetched = bounded_map(
+                executor=executor,
+                function=self.fetch_estate_safely,
+                items=((link,) for link in estate_links),
+                window=queue_size,
+            )
+            parsed = bounded_map(
+                executor=self.parse_pool,
+                function=parse_estate_page,
+                # Pulled lazily, so fetching stops while parse stage is full
+                items=(
+                    (
+                        link,
+                        page_source,
+                        self.fast_records,
+                        self.PARAMS.get("full_details", False),
+                        # Change detection is done before validation here
+                        not self.change_detection,
+                        False,
+                        self.description_phrases,
+                    )
+                    for (link,), page_source in (
+                        (args, future.result()) for args, future in fetched
+                    )
+                    if page_source is not None
+                ),
+                window=queue_size,
+            )
+
+            for (link, *_), future in parsed:
+                try:
+                    estate, timings = future.result()
+                except Exception as e:
+                    self.record_failure(url=link, error=e)
+                    continue
+
+                for stage, seconds in timings.items():
+                    self.metrics.observe(stage, seconds)
+
+                if self.change_detection:
+                    try:
+                        estate = self.build_estate_record(
+                            estate_url=link, estate_details=estate
+                        )
+                    except Exception as e:
+                        self.record_failure(url=link, error=e)
+                        continue
+                    if not estate:
+                        continue
+
+                if self.PARAMS["verbose_logging"]:
+                    logging.info(f"New entry parsed:\n{estate.url}")
+
+                yield estate
+
+    def parse_page(
+        self,
+        listing_soup: Union["BeautifulSoup", bytes],
+        page_num: Optional[int] = None,
+    ) -> List[Estate]:
 
         estate_results = self.get_estate_links_from_listing(
             listing_soup=listing_soup
         )
+        estate_links: List[str] = self.select_new_links(
+            estate_links=estate_results
+        )
 
-        estates: List[Estate] = []
+        if page_num:
+            self.start_checkpoint_page(
+                page_num=page_num, estate_links=estate_links
+            )
 
-        for link in estate_results:
+        return self.parse_estates(estate_links=estate_links)
 
-            estate_details: EstateDetails = self.parse_estate(
-                estate_url=link
+    def start_checkpoint_page(
+        self, page_num: int, estate_links: List[str]
+    ) -> None:
+        """
+        Save listing page about to be scraped with its adverts in crawl checkpoint.
+        """
+        if self.checkpoint:
+            self.checkpoint.start_page(
+                page=page_num,
+                slugs=[self.get_slug(link) for link in estate_links],
             )
 
-            if not estate_details:
-                continue
+    def iter_pending_estates(self) -> Iterator[Estate]:
+        """
+        Fetch and parse adverts of checkpointed listing page which were not
+        finished before interruption of resumed crawl.
+
+        Returns:
+            Iterator[Estate]: validated Estate models
+        """
+        if not self.checkpoint or not self.checkpoint.pending:
+            return
+
+        logging.info(
+            msg=f"### Finishing page (no: {self.checkpoint.page}) "
+            + "from checkpoint ###"
+        )
+        yield from self.iter_estates(
+            estate_links=[
+                self.PARAMS["result_base_url"] + slug
+                for slug in self.checkpoint.pending
+            ]
+        )
+
+    def _first_page(self) -> int:
+        """
+        Returns listing page to start crawl at - the one after checkpointed.
+        """
+        return self.checkpoint.page + 1 if self.checkpoint else 1
+
+    def parse_estates(self, estate_links: List[str]) -> List[Estate]:
+        """
+        Fetch and parse estate adverts.
+
+        Args:
+            estate_links (List[str]): urls of estate adverts
+
+        Returns:
+            List[Estate]: validated Estate models in listing order
+        """
+        return list(self.iter_estates(estate_links=estate_links))
+
+    def iter_estates(self, estate_links: List[str]) -> Iterator[Estate]:
+        """
+        Fetch and parse estate adverts, yielding each as soon as it is parsed -
+        on pool of processes if parse_processes set in parameters.yaml,
+        concurrently if workers set, one by one otherwise.
 
-            # To prevent server overload
-            sleep(self.PARAMS["sleep_time"])
+        Args:
+            estate_links (List[str]): urls of estate adverts
 
-            estate: Estate = Estate(
-                url=link,
-                details=estate_details,
+        Returns:
+            Iterator[Estate]: validated Estate models in listing order
+        """
+        if self.PARAMS.get("parse_processes"):
+            estates: Iterator[Estate] = self.iter_estates_in_processes(
+                estate_links=estate_links
+            )
+        elif self.PARAMS.get("workers", 1) > 1:
+            estates: Iterator[Estate] = self.iter_estates_concurrently(
+                estate_links=estate_links
+            )
+        else:
+            estates: Iterator[Estate] = self.iter_estates_serially(
+                estate_links=estate_links
             )
 
-            if self.PARAMS["verbose_logging"]:
-                logging.info(f"New entry parsed:\n{estate.url}")
+        for estate in estates:
+            yield estate
+
+            # Marked only once consumer is done with the record
+            if self.seen_index:
+                self.seen_index.mark_seen(slugs=[self.get_slug(estate.url)])
+            if isinstance(estate, EstateDelta):
+                self.fingerprints.update_fields(
+                    slug=self.get_slug(estate.url),
+                    fields=estate.fingerprints,
+                )
+
+    def iter_estates_serially(
+        self, estate_links: List[str]
+    ) -> Iterator[Estate]:
+        """
+        Fetch and parse estate adverts one by one (paced by rate limiter).
 
-            estates.append(estate)
+        Args:
+            estate_links (List[str]): urls of estate adverts
 
-        return estates
+        Returns:
+            Iterator[Estate]: validated Estate models in listing order
+        """
+        for link in estate_links:
 
-    def parse_site(self) -> List[Estate]:
+            estate: Optional[
+                Union[Estate, EstateRecord, EstateDelta]
+            ] = self.parse_estate_safely(estate_url=link)
+
+            if estate:
+                yield estate
+
+    def estate_from_listing_item(
+        self, item: Dict[str, Any]
+    ) -> Optional[Union[Estate, EstateRecord]]:
         """
-        Main scraper function - goes thru estate listing (number of subpages in parameters.yaml),
-        collect links to specific estate adverts, parse them and return list of validated
-        Estate models.
+        Build estate record from listing item, without fetching advert page.
+        Failed item is logged and skipped.
+
+        Args:
+            item (Dict[str, Any]): searchAds item of listing __NEXT_DATA__
 
         Returns:
-            List[Estate]: list of validated Estate models.
+            Optional[Union[Estate, EstateRecord]]: validated estate record
+                or None if item is not valid
         """
+        estate_url: str = self.PARAMS["result_base_url"] + item["slug"]
 
-        if self.PARAMS["verbose_logging"]:
-            logging.info("## Scraper started ##")
+        try:
+            estate_details: List[str] = self.details_from_listing_item(
+                item=item
+            )
+            with self.validation():
+                if self.fast_records:
+                    estate: EstateRecord = EstateRecord.from_details(
+                        url=estate_url, estate_details=estate_details
+                    )
+                else:
+                    estate: Estate = Estate(
+                        url=estate_url,
+                        details=self.build_estate_details(
+                            estate_details=estate_details
+                        ),
+                    )
+        except Exception as e:
+            self.record_failure(url=estate_url, error=e)
+            return None
+
+        self.metrics.inc("listing_records")
+
+        return estate
+
+    def iter_listing_estates(
+        self, items: List[Dict[str, Any]]
+    ) -> Iterator[Union[Estate, EstateRecord]]:
+        """
+        Yield records of listing items in listing order. With enrichment set up
+        (listing_only in parameters.yaml) adverts new or changed since last crawl
+        are fetched and parsed from advert pages instead (listing record is
+        kept if advert page fails).
+
+        Args:
+            items (List[Dict[str, Any]]): searchAds items of listing page
 
-        first_page_soup: BeautifulSoup = self.get_listing_page_soup(
-            page_no=1
+        Returns:
+            Iterator[Union[Estate, EstateRecord]]: validated estate records
+        """
+        links: List[str] = [
+            self.PARAMS["result_base_url"] + item["slug"] for item in items
+        ]
+        fingerprints: Dict[str, str] = {}
+        enriched: Dict[str, Union[Estate, EstateRecord]] = {}
+
+        # Fingerprint store is open for change detection alone too
+        if (self.PARAMS.get("listing_only") or {}).get("enrich"):
+            fingerprints = {
+                item["slug"]: self.listing_fingerprint(item=item)
+                for item in items
+            }
+            changed: Set[str] = self.fingerprints.changed(
+                fingerprints=fingerprints
+            )
+            changed_links: List[str] = [
+                link for link in links if self.get_slug(link) in changed
+            ]
+            if changed_links:
+                enriched = {
+                    estate.url: estate
+                    for estate in self.iter_estates(estate_links=changed_links)
+                }
+
+        for link, item in zip(links, items):
+            estate: Optional[Union[Estate, EstateRecord]] = enriched.get(
+                link
+            ) or self.estate_from_listing_item(item=item)
+
+            if not estate:
+                continue
+
+            yield estate
+
+            # Marked only once consumer is done with the record
+            if self.seen_index:
+                self.seen_index.mark_seen(slugs=[item["slug"]])
+            if link in enriched:
+                self.fingerprints.update(
+                    fingerprints={item["slug"]: fingerprints[item["slug"]]}
+                )
+
+    def iter_site_from_listing(self) -> Iterator[Union[Estate, EstateRecord]]:
+        """
+        Listing-only variant of iter_site - records are built straight from
+        listing pages (all adverts of a page from one request), advert pages are
+        fetched only for enrichment.
+
+        Returns:
+            Iterator[Union[Estate, EstateRecord]]: validated estate records
+        """
+        yield from self.iter_pending_estates()
+
+        page_num: int = self._first_page()
+        while not self._page_limit_reached(page_num):
+            if page_num > 1:
+                logging.info(
+                    msg=f"### Start parsing next page (no: {page_num}) ###"
+                )
+
+            items: List[Dict[str, Any]] = self.get_listing_items(
+                listing_soup=self.get_listing_page_source(page_no=page_num)
+            )
+            estate_links: List[str] = self.select_new_links(
+                estate_links=[
+                    self.PARAMS["result_base_url"] + item["slug"]
+                    for item in items
+                ]
+            )
+            new_slugs: Set[str] = {
+                self.get_slug(link) for link in estate_links
+            }
+            items = [item for item in items if item["slug"] in new_slugs]
+
+            # Page without (new) adverts ends the walk
+            if not items:
+                break
+
+            self.start_checkpoint_page(
+                page_num=page_num, estate_links=estate_links
+            )
+            yield from self.iter_listing_estates(items=items)
+            page_num += 1
+
+    def _page_limit_reached(self, page_num: int) -> bool:
+        """
+        Check if listing page at page_num is beyond page_limit from parameters.yaml.
+        """
+        return bool(self.PARAMS["page_limit"]) and (
+            page_num > self.PARAMS["page_limit"]
         )
-        page_results: List[Estate] = self.parse_page(
-            listing_soup=first_page_soup
+
+    def _prefetch_listing_pages(
+        self, listing_queue: Queue, start_page: int = 1
+    ) -> None:
+        """
+        Producer of pipelined crawl - fetches listing pages ahead of advert parsing
+        and puts (page number, estate links) into bounded queue. Stops at page_limit
+        or at first page without adverts, None is put at the end (preceded
+        by exception if any raised). In incremental crawl already scraped adverts
+        are dropped and page without new ones ends the walk.
+        """
+        try:
+            page_num: int = start_page
+            while not self._page_limit_reached(page_num):
+                estate_links: List[str] = self.get_estate_links_from_listing(
+                    listing_soup=self.get_listing_page_source(
+                        page_no=page_num
+                    )
+                )
+                # Listing is sorted by latest, so when whole page is already
+                # known (incremental crawl) older pages are known too
+                estate_links = self.select_new_links(
+                    estate_links=estate_links
+                )
+
+                if not estate_links:
+                    break
+
+                listing_queue.put((page_num, estate_links))
+                page_num += 1
+        except Exception as e:
+            listing_queue.put(e)
+        finally:
+            listing_queue.put(None)
+
+    def iter_listing_pages(
+        self, start_page: int = 1
+    ) -> Iterator[Tuple[int, List[str]]]:
+        """
+        Iterate over estate links of consecutive listing pages, while next pages
+        are prefetched in background (prefetch_pages in parameters.yaml).
+
+        Args:
+            start_page (int): number of the first listing page
+
+        Returns:
+            Iterator[Tuple[int, List[str]]]: listing page number and its estate links
+        """
+        listing_queue: Queue = Queue(
+            maxsize=self.PARAMS.get("prefetch_pages", 0)
         )
-        results: List[Estate] = page_results
+        Thread(
+            target=self._prefetch_listing_pages,
+            args=(listing_queue, start_page),
+            daemon=True,
+        ).start()
 
-        page_num: int = 2
-        while len(page_results) > 0:
-            if (
-                self.PARAMS["page_limit"]
-                and page_num >= self.PARAMS["page_limit"]
-            ):
-                break
+        while True:
+            item = listing_queue.get()
+
+            if item is None:
+                return
+            if isinstance(item, Exception):
+                raise item
+
+            yield item
+
+    def iter_site_pipelined(self) -> Iterator[Estate]:
+        """
+        Pipelined variant of iter_site - listing page N+1 is fetched while
+        adverts of page N are still downloading.
+
+        Returns:
+            Iterator[Estate]: validated Estate models
+        """
+        yield from self.iter_pending_estates()
 
+        for page_num, estate_links in self.iter_listing_pages(
+            start_page=self._first_page()
+        ):
             logging.info(
                 msg=f"### Start parsing next page (no: {page_num}) ###"
             )
+            self.start_checkpoint_page(
+                page_num=page_num, estate_links=estate_links
+            )
+            yield from self.iter_estates(estate_links=estate_links)
+
+    def iter_site_serially(self) -> Iterator[Estate]:
+        """
+        Serial variant of iter_site - next listing page is requested only after
+        all adverts of current one are parsed. Walk ends at first page without
+        (new) advert links, the same as in pipelined crawl - page of adverts
+        all unchanged since last crawl (change detection) yields no records,
+        but does not end it.
 
-            page_soup: BeautifulSoup = self.get_listing_page_soup(
-                page_no=page_num
+        Returns:
+            Iterator[Estate]: validated Estate models
+        """
+        yield from self.iter_pending_estates()
+
+        page_num: int = self._first_page()
+        while not self._page_limit_reached(page_num):
+            if page_num > 1:
+                logging.info(
+                    msg=f"### Start parsing next page (no: {page_num}) ###"
+                )
+
+            estate_links: List[str] = self.select_new_links(
+                estate_links=self.get_estate_links_from_listing(
+                    listing_soup=self.get_listing_page_source(
+                        page_no=page_num
+                    )
+                )
             )
-            page_results: List[Estate] = self.parse_page(
-                listing_soup=page_soup
+
+            if not estate_links:
+                break
+
+            self.start_checkpoint_page(
+                page_num=page_num, estate_links=estate_links
             )
+            yield from self.iter_estates(estate_links=estate_links)
             page_num += 1
 
-            if page_results:
-                results.extend(page_results)
+    def iter_site(self) -> Iterator[Estate]:
+        """
+        Main scraper generator - goes thru estate listing (number of subpages in
+        parameters.yaml), collect links to specific estate adverts, parse them and
+        yield validated Estate models as they come, so nothing is kept in memory.
+
+        Returns:
+            Iterator[Estate]: validated Estate models
+        """
+        if self.PARAMS["verbose_logging"]:
+            logging.info("## Scraper started ##")
+
+        if (self.PARAMS.get("listing_only") or {}).get("enabled"):
+            estates: Iterator[Estate] = self.iter_site_from_listing()
+        elif self.PARAMS.get("prefetch_pages"):
+            estates: Iterator[Estate] = self.iter_site_pipelined()
+        else:
+            estates: Iterator[Estate] = self.iter_site_serially()
+
+        for estate in estates:
+            yield estate
+
+            # Finished only once consumer is done with the record
+            if self.checkpoint:
+                self.checkpoint.finish(slug=self.get_slug(estate.url))
+
+        self.close_parse_pool()
 
         # For script execution time probing
         self.time_stop = time.time()
@@ -305,14 +1698,91 @@ class OtoDomScraper:
                 + " seconds #"
             )
 
-        return results
+        if self.http_cache:
+            logging.info(msg=f"HTTP cache stats: {self.http_cache.stats()}")
 
-    def save_data(self, temp_path: str, to_write: Any) -> None:
+        self.metrics.export()
+
+    def iter_dead_letters(self) -> Iterator[Union[Estate, EstateRecord]]:
+        """
+        Replay failed adverts of dead-letter file - adverts failing again are
+        added to the file anew, failed listing pages are kept in it (listing
+        is walked by next crawl). Entries of replayed adverts are removed once
+        replay ends or is stopped, so adverts not reached yet are kept.
+
+        Returns:
+            Iterator[Union[Estate, EstateRecord]]: validated estate records
+        """
+        if not self.dead_letters:
+            raise ValueError("dead_letter_file is not set in parameters.yaml")
+
+        entries: List[Dict[str, Any]] = self.dead_letters.read()
+        adverts: List[Dict[str, Any]] = [
+            entry for entry in entries if entry["kind"] == "advert"
+        ]
+        estate_links: List[str] = list(
+            dict.fromkeys(entry["url"] for entry in adverts)
+        )
+        logging.info(msg=f"### Replaying {len(estate_links)} failed adverts ###")
+        replayed: Set[str] = set()
+
+        try:
+            for estate in self.iter_estates(estate_links=estate_links):
+                yield estate
+                replayed.add(estate.url)
+        finally:
+            # Adverts failing again are in entries added during replay
+            replayed.update(
+                entry["url"]
+                for entry in self.dead_letters.read()[len(entries) :]
+            )
+            self.dead_letters.remove(
+                entries=[entry for entry in adverts if entry["url"] in replayed]
+            )
+
+        self.metrics.export()
+
+    def parse_site(self) -> List[Estate]:
+        """
+        Goes thru estate listing and return list of validated Estate models,
+        see iter_site for streaming variant (which yields compact EstateRecords
+        with fast_records set in parameters.yaml).
+
+        Returns:
+            List[Estate]: list of validated Estate models.
+        """
+        return [
+            estate.to_model() if isinstance(estate, EstateRecord) else estate
+            for estate in self.iter_site()
+        ]
+
+    def open_results_writer(self, temp_path: str) -> TextWriter:
+        """
+        Returns writer for results file - format set in parameters.yaml
+        (results_format) or taken from results file extension.
+        """
+        return get_writer(
+            temp_path=temp_path,
+            results_format=self.PARAMS.get("results_format"),
+            batch_size=self.PARAMS.get("results_batch_size", 100),
+            # Records written after last checkpoint are dropped
+            resume_offset=(
+                self.checkpoint.output_offset if self.checkpoint else None
+            ),
+        )
+
+    def save_data(self, temp_path: str, to_write: Iterable[Any]) -> None:
         """
         Save results to specified file at temp_path - if just filename without path provided,
-        result file will be saved in a project root.
+        result file will be saved in a project root. Records are written as they come
+        (in batches for structured formats), so to_write can be a generator (e.g. iter_site).
+        Checkpoint (if set up) saves results file offset along with crawl state,
+        and is removed once all records are written.
         """
-        with open(temp_path, "w+", encoding="utf-8") as f:
-            for line in to_write:
-                f.write(str(line))
-                f.write("\n")
+        with self.open_results_writer(temp_path=temp_path) as writer:
+            if self.checkpoint:
+                self.checkpoint.writer = writer
+            writer.write_all(records=to_write)
+
+        if self.checkpoint:
+            self.checkpoint.clear()
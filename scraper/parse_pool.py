@@ -0,0 +1,125 @@
+import json
+import time
+from collections import deque
+from concurrent.futures import Executor, Future
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from data_types.description_cleaner import description_phrases
+from data_types.estate import Estate
+from data_types.estate_record import EstateRecord
+from scraper.next_data import extract_next_data
+
+
+def bounded_map(
+    executor: Executor,
+    function: Callable,
+    items: Iterable[Tuple[Any, ...]],
+    window: int,
+) -> Iterator[Tuple[Tuple[Any, ...], Future]]:
+    """
+    Lazily submit function calls to executor, keeping no more than window of them
+    in flight - next item is taken only when consumer pulls oldest result, so slow
+    consumer holds back the producer (backpressure).
+
+    Args:
+        executor (Executor): thread or process pool
+        function (Callable): function to call
+        items (Iterable[Tuple[Any, ...]]): positional arguments of every call
+        window (int): max number of submitted calls not yet pulled by consumer
+
+    Returns:
+        Iterator[Tuple[Tuple[Any, ...], Future]]: call arguments and its future,
+            in submission order
+    """
+    in_flight: Deque[Tuple[Tuple[Any, ...], Future]] = deque()
+
+    for args in items:
+        in_flight.append((args, executor.submit(function, *args)))
+        if len(in_flight) >= window:
+            yield in_flight.popleft()
+
+    while in_flight:
+        yield in_flight.popleft()
+
+
+def parse_estate_page(
+    estate_url: str,
+    page_source: bytes,
+    fast_records: bool = False,
+    full_details: bool = False,
+    validate: bool = True,
+    next_data: bool = False,
+    phrases: Optional[Tuple[str, ...]] = None,
+) -> Tuple[Union[Estate, EstateRecord], Dict[str, float]]:
+    """
+    Parse raw estate advert into validated Estate model - run in parse worker
+    process, so CPU-bound JSON decoding and validation are not limited by GIL.
+
+    Args:
+        estate_url (str): url of estate advert
+        page_source (bytes): raw estate advert content
+        fast_records (bool): build compact EstateRecord instead of Estate model
+        full_details (bool): collect all advert fields (EstateFullDetails)
+        validate (bool): False - return details as collected, to be validated
+            by parent process (change detection)
+        next_data (bool): page_source is __NEXT_DATA__ payload already
+            (raw archive)
+        phrases (Optional[Tuple[str, ...]]): description boilerplate phrases
+            of scraper params, parameters.yaml ones if None
+
+    Returns:
+        Tuple[Union[Estate, EstateRecord], Dict[str, float]]: validated estate
+            record and seconds spent in parsing stages (to be recorded in Metrics
+            of parent process)
+    """
+    # Imported here as scraper module dispatches adverts to this function
+    from scraper.otodom_scraper import OtoDomScraper
+
+    start: float = time.perf_counter()
+    script_json: Dict[str, Any] = json.loads(
+        page_source if next_data else extract_next_data(page_source=page_source)
+    )
+    decoded: float = time.perf_counter()
+    if full_details:
+        estate_details = OtoDomScraper.full_details_from_next_data(
+            script_json=script_json
+        )
+    else:
+        estate_details = OtoDomScraper.details_from_next_data(
+            script_json=script_json
+        )
+    extracted: float = time.perf_counter()
+    if not validate:
+        return estate_details, {
+            "next_data_decode": decoded - start,
+            "details_extraction": extracted - decoded,
+        }
+
+    with description_phrases(phrases):
+        if fast_records:
+            estate: EstateRecord = EstateRecord.from_details(
+                url=estate_url, estate_details=estate_details
+            )
+        else:
+            estate: Estate = Estate(
+                url=estate_url,
+                details=OtoDomScraper.build_estate_details(
+                    estate_details=estate_details
+                ),
+            )
+
+    return estate, {
+        "next_data_decode": decoded - start,
+        "details_extraction": extracted - decoded,
+        "validation": time.perf_counter() - extracted,
+    }
@@ -0,0 +1,72 @@
+import threading
+import time
+from typing import Optional
+
+
+class RateLimiter:
+    """
+    Thread safe rate limiter shared by all workers of the scraper.
+    Spreads requests evenly so that no more than requests_per_second
+    are started, whatever the number of concurrent workers.
+    """
+
+    def __init__(self, requests_per_second: float) -> None:
+        self.interval: float = (
+            1.0 / requests_per_second if requests_per_second else 0.0
+        )
+        self._lock: threading.Lock = threading.Lock()
+        self._next_slot: float = time.monotonic()
+
+    def reserve(self) -> float:
+        """
+        Reserve next free request slot.
+
+        Returns:
+            float: seconds the caller has to wait before sending request
+        """
+        if not self.interval:
+            return 0.0
+
+        with self._lock:
+            now: float = time.monotonic()
+            slot: float = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+
+        return slot - now
+
+    def acquire(self) -> None:
+        """
+        Block until the caller is allowed to send next request.
+        """
+        delay: float = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self) -> None:
+        """
+        Asyncio counterpart of acquire - waits without blocking event loop.
+        """
+        # Imported here so sync backend does not load asyncio
+        import asyncio
+
+        delay: float = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def release(
+        self,
+        status: Optional[int] = None,
+        latency: float = 0.0,
+        retry_after: Optional[float] = None,
+    ) -> None:
+        """
+        Called once response (or error) for acquired request arrives - fixed rate
+        limiter does not adjust to responses, see AdaptiveThrottle.
+        """
+
+    def retry_delay(self, attempt: int) -> float:
+        """
+        Returns seconds to wait before retrying failed request - exponential,
+        between 2 and 5 seconds.
+        """
+        return min(max(2.0 ** (attempt - 1), 2.0), 5.0)
@@ -0,0 +1,158 @@
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+from data_types.estate import Estate
+from data_types.estate_record import EstateRecord
+from scraper.parse_pool import bounded_map, parse_estate_page
+from storage.raw_archive import NEXT_DATA, ArchiveEntry, RawArchive, read_segment
+
+
+def reparse_segment(
+    segment_path: str,
+    entries: List[ArchiveEntry],
+    fast_records: bool = False,
+    full_details: bool = False,
+    phrases: Optional[Tuple[str, ...]] = None,
+) -> Tuple[List[Union[Estate, EstateRecord]], int]:
+    """
+    Rebuild estate records of chunk of archive segment - run in worker process,
+    failed advert is logged and skipped.
+
+    Args:
+        segment_path (str): segment file path
+        entries (List[ArchiveEntry]): index entries of the chunk
+        fast_records (bool): build compact EstateRecord instead of Estate model
+        full_details (bool): collect all advert fields (EstateFullDetails)
+        phrases (Optional[Tuple[str, ...]]): description boilerplate phrases
+            of scraper params, parameters.yaml ones if None
+
+    Returns:
+        Tuple[List[Union[Estate, EstateRecord]], int]: validated estate records
+            in segment order and number of failed adverts
+    """
+    estates: List[Union[Estate, EstateRecord]] = []
+    failed: int = 0
+
+    for _, url, content, payload in read_segment(
+        segment_path=segment_path, entries=entries
+    ):
+        try:
+            estate, _ = parse_estate_page(
+                estate_url=url,
+                page_source=payload,
+                fast_records=fast_records,
+                full_details=full_details,
+                next_data=content == NEXT_DATA,
+                phrases=phrases,
+            )
+        except Exception as e:
+            failed += 1
+            logging.warning(f"Failed to re-parse entry {url}: {e!r}")
+            continue
+
+        estates.append(estate)
+
+    return estates, failed
+
+
+def reparse_tasks(
+    archive: RawArchive, chunk_size: int
+) -> List[Tuple[str, List[ArchiveEntry]]]:
+    """
+    Split index entries of all segments into chunks of up to chunk_size
+    entries - a single segment holds thousands of compressed adverts,
+    so it would be parsed by one process only.
+
+    Args:
+        archive (RawArchive): opened raw archive
+        chunk_size (int): max number of entries per task
+
+    Returns:
+        List[Tuple[str, List[ArchiveEntry]]]: segment path and its entries
+            of every task, in segment order
+    """
+    tasks: List[Tuple[str, List[ArchiveEntry]]] = []
+
+    for segment in archive.segments():
+        segment_path: str = os.path.join(archive.directory, segment)
+        entries: List[ArchiveEntry] = archive.entries(segment)
+        tasks.extend(
+            (segment_path, entries[i : i + chunk_size])
+            for i in range(0, len(entries), chunk_size)
+        )
+
+    return tasks
+
+
+def iter_reparsed(
+    params: Dict[str, Any], processes: Optional[int] = None
+) -> Iterator[Union[Estate, EstateRecord]]:
+    """
+    Rebuild estate records from raw archive (raw_archive in parameters.yaml)
+    with current parsing code - no network, chunks of segment index entries
+    (reparse_chunk_size) are parsed in parallel on pool of processes.
+
+    Args:
+        params (Dict[str, Any]): scraper params
+        processes (Optional[int]): number of parse processes, reparse_processes
+            of raw_archive in parameters.yaml or CPU count if not set
+
+    Returns:
+        Iterator[Union[Estate, EstateRecord]]: validated estate records,
+            chunk by chunk
+    """
+    settings: Dict[str, Any] = params.get("raw_archive") or {}
+    archive: RawArchive = RawArchive(
+        directory=settings.get("directory", "raw_archive")
+    )
+    try:
+        tasks: List[Tuple[str, List[ArchiveEntry]]] = reparse_tasks(
+            archive=archive,
+            chunk_size=settings.get("reparse_chunk_size", 200),
+        )
+    finally:
+        archive.close()
+
+    full_details: bool = bool(params.get("full_details"))
+    fast_records: bool = bool(params.get("fast_records")) and not full_details
+    phrases: Optional[Tuple[str, ...]] = (
+        tuple(params["description_boilerplate"])
+        if "description_boilerplate" in params
+        else None
+    )
+    processes = processes or settings.get("reparse_processes") or os.cpu_count()
+    start: float = time.perf_counter()
+    reparsed: int = 0
+    failed: int = 0
+
+    logging.info(
+        msg=f"### Re-parsing {sum(len(e) for _, e in tasks)} adverts in "
+        f"{len(tasks)} chunks on {processes} processes ###"
+    )
+
+    with ProcessPoolExecutor(
+        max_workers=processes, mp_context=get_context("spawn")
+    ) as executor:
+        # At most one parsed chunk per process waits for the consumer
+        for _, future in bounded_map(
+            executor=executor,
+            function=reparse_segment,
+            items=(
+                (path, entries, fast_records, full_details, phrases)
+                for path, entries in tasks
+            ),
+            window=processes,
+        ):
+            estates, chunk_failed = future.result()
+            reparsed += len(estates)
+            failed += chunk_failed
+            yield from estates
+
+    logging.info(
+        msg=f"## Re-parsed {reparsed} adverts ({failed} failed) in "
+        f"{time.perf_counter() - start:.2f}s ##"
+    )
@@ -0,0 +1,158 @@
+import json
+from typing import Any, Callable, Dict, Optional, Tuple, Type
+
+from requests.exceptions import RequestException
+
+from scraper.adaptive_throttle import ResponseStatusError
+from scraper.next_data import MissingNextDataError
+
+# Error classes with separate retry budgets
+NETWORK: str = "network"
+CLIENT_ERROR: str = "client_error"
+SERVER_ERROR: str = "server_error"
+THROTTLED: str = "throttled"
+PARSE: str = "parse"
+
+# Fetch errors, retried by fetch
+FETCH_ERRORS: Tuple[str, ...] = (NETWORK, CLIENT_ERROR, SERVER_ERROR, THROTTLED)
+
+
+class RetryBudget:
+    """
+    Retry budget of single error class - attempts (the first one included)
+    and seconds since the first attempt after which failed call is not retried.
+    """
+
+    def __init__(self, attempts: int, max_seconds: float) -> None:
+        self.attempts: int = attempts
+        self.max_seconds: float = max_seconds
+
+    def __repr__(self) -> str:
+        return (
+            f"RetryBudget(attempts={self.attempts}, "
+            f"max_seconds={self.max_seconds})"
+        )
+
+
+# Defaults of retry_policy in parameters.yaml
+DEFAULT_BUDGETS: Dict[str, RetryBudget] = {
+    NETWORK: RetryBudget(attempts=5, max_seconds=60),
+    # 404/410 - advert is gone, retrying will not bring it back
+    CLIENT_ERROR: RetryBudget(attempts=1, max_seconds=0),
+    SERVER_ERROR: RetryBudget(attempts=5, max_seconds=120),
+    # 429 - pacing is done by rate limiter (Retry-After honoured)
+    THROTTLED: RetryBudget(attempts=10, max_seconds=300),
+    # Missing __NEXT_DATA__ - page cut short or served by anti-bot wall
+    PARSE: RetryBudget(attempts=2, max_seconds=60),
+}
+
+
+class RetryPolicy:
+    """
+    Bounded retries per error class: network errors, 4xx and 5xx responses
+    (429 on its own) and parse failures, each with attempt and total time budget.
+    Errors of no class (e.g. failed validation) are not retried.
+    """
+
+    def __init__(
+        self,
+        budgets: Optional[Dict[str, RetryBudget]] = None,
+        network_errors: Tuple[Type[BaseException], ...] = (),
+    ) -> None:
+        """
+        Args:
+            budgets (Optional[Dict[str, RetryBudget]]): budgets overriding
+                default ones by error class
+            network_errors (Tuple[Type[BaseException], ...]): exceptions of HTTP
+                client treated as network errors, besides requests and OS ones
+        """
+        self.budgets: Dict[str, RetryBudget] = {
+            **DEFAULT_BUDGETS,
+            **(budgets or {}),
+        }
+        self.network_errors: Tuple[Type[BaseException], ...] = (
+            RequestException,
+            OSError,
+            *network_errors,
+        )
+
+    @classmethod
+    def from_params(
+        cls,
+        settings: Optional[Dict[str, Any]],
+        network_errors: Tuple[Type[BaseException], ...] = (),
+    ) -> "RetryPolicy":
+        """
+        Build policy from retry_policy in parameters.yaml - budget per error
+        class, missing ones are defaults.
+        """
+        budgets: Dict[str, RetryBudget] = {}
+
+        for error_class, budget in (settings or {}).items():
+            default: RetryBudget = DEFAULT_BUDGETS[error_class]
+            budgets[error_class] = RetryBudget(
+                attempts=budget.get("attempts", default.attempts),
+                max_seconds=budget.get("max_seconds", default.max_seconds),
+            )
+
+        return cls(budgets=budgets, network_errors=network_errors)
+
+    def classify(self, error: BaseException) -> Optional[str]:
+        """
+        Returns error class of exception, None if it is not retried at all.
+        """
+        if isinstance(error, ResponseStatusError):
+            if error.status == 429:
+                return THROTTLED
+            return SERVER_ERROR if error.status >= 500 else CLIENT_ERROR
+        if isinstance(error, self.network_errors):
+            return NETWORK
+        # No __NEXT_DATA__ script or script cut short
+        if isinstance(error, (MissingNextDataError, json.JSONDecodeError)):
+            return PARSE
+
+        return None
+
+    def should_retry(
+        self, error: BaseException, attempt: int, elapsed: float
+    ) -> bool:
+        """
+        Check if call failed with error is to be retried.
+
+        Args:
+            error (BaseException): error of the last attempt
+            attempt (int): number of attempts made so far
+            elapsed (float): seconds since the first attempt
+        """
+        error_class: Optional[str] = self.classify(error=error)
+        if error_class is None:
+            return False
+
+        budget: RetryBudget = self.budgets[error_class]
+
+        return attempt < budget.attempts and elapsed < budget.max_seconds
+
+
+def retry_on(*error_classes: str) -> Callable[[Any], bool]:
+    """
+    Tenacity retry condition delegating to the scraper retry policy - failed
+    call is retried only for given error classes and within their budget.
+    Exhausted budget re-raises the last error (no tenacity RetryError).
+    """
+
+    def should_retry(retry_state: Any) -> bool:
+        if not retry_state.outcome.failed:
+            return False
+
+        policy: RetryPolicy = retry_state.args[0].retry_policy
+        error: BaseException = retry_state.outcome.exception()
+
+        return policy.classify(error=error) in error_classes and (
+            policy.should_retry(
+                error=error,
+                attempt=retry_state.attempt_number,
+                elapsed=retry_state.seconds_since_start,
+            )
+        )
+
+    return should_retry
@@ -0,0 +1,123 @@
+import json
+import logging
+import os
+import time
+from typing import Any, Dict, List, Optional, Set
+
+from storage.writers import TextWriter
+
+
+class CrawlCheckpoint:
+    """
+    Crawl state periodically saved to JSON file, so interrupted crawl can be resumed:
+    listing page in progress, its pending advert slugs, finished slugs and results
+    file offset of the moment finished ones were all written. Results writer is
+    flushed on every save, so file content never lags behind finished slugs.
+    """
+
+    def __init__(
+        self, checkpoint_path: str, search_key: str, every: int = 25
+    ) -> None:
+        """
+        Args:
+            checkpoint_path (str): checkpoint file path
+            search_key (str): search the crawl is run for (listing url without page)
+            every (int): number of finished adverts between saves
+        """
+        self.checkpoint_path: str = checkpoint_path
+        self.search_key: str = search_key
+        self.every: int = every
+        self.page: int = 0
+        self.pending: List[str] = []
+        self.finished: Set[str] = set()
+        self.output_offset: Optional[int] = None
+        self.writer: Optional[TextWriter] = None
+        self._unsaved: int = 0
+
+    def load(self) -> bool:
+        """
+        Load state saved by previous run of the same search.
+
+        Returns:
+            bool: True if checkpoint found, False if there is nothing to resume
+        """
+        if not os.path.exists(self.checkpoint_path):
+            return False
+
+        with open(self.checkpoint_path, encoding="utf-8") as f:
+            state: Dict[str, Any] = json.load(f)
+
+        if state["search_key"] != self.search_key:
+            raise ValueError(
+                f"Checkpoint {self.checkpoint_path} was saved for other "
+                f"search: {state['search_key']}"
+            )
+
+        self.page = state["page"]
+        self.pending = state["pending"]
+        self.finished = set(state["finished"])
+        self.output_offset = state["output_offset"]
+
+        logging.info(
+            msg=f"Resuming crawl at listing page {self.page}: "
+            + f"{len(self.pending)} pending, {len(self.finished)} finished adverts"
+        )
+
+        return True
+
+    def start_page(self, page: int, slugs: List[str]) -> None:
+        """
+        Record start of listing page and save checkpoint.
+
+        Args:
+            page (int): listing page number
+            slugs (List[str]): slugs of adverts to be scraped from the page
+        """
+        self.page = page
+        self.pending = [slug for slug in slugs if slug not in self.finished]
+        self.save()
+
+    def finish(self, slug: str) -> None:
+        """
+        Record advert handed over to results writer, save checkpoint every
+        `every` adverts.
+        """
+        self.finished.add(slug)
+        if slug in self.pending:
+            self.pending.remove(slug)
+
+        self._unsaved += 1
+        if self._unsaved >= self.every:
+            self.save()
+
+    def save(self) -> None:
+        """
+        Flush results writer and save state atomically. Nothing is saved until
+        results writer is attached, as records would not be kept anywhere.
+        """
+        if not self.writer:
+            return
+
+        self.output_offset = self.writer.offset()
+
+        state: Dict[str, Any] = {
+            "search_key": self.search_key,
+            "page": self.page,
+            "pending": self.pending,
+            "finished": sorted(self.finished),
+            "output_offset": self.output_offset,
+            "saved_at": time.time(),
+        }
+        temp_path: str = self.checkpoint_path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(temp_path, self.checkpoint_path)
+
+        self._unsaved = 0
+
+    def clear(self) -> None:
+        """
+        Remove checkpoint file once crawl is completed.
+        """
+        if os.path.exists(self.checkpoint_path):
+            os.remove(self.checkpoint_path)
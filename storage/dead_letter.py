@@ -0,0 +1,99 @@
+import json
+import os
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+
+class DeadLetterFile:
+    """
+    JSON lines file of pages which failed once their retry budget ran out
+    (url, kind of page, error class and error), kept for later replay.
+    Every failure is appended at once, so nothing is lost when crawl dies.
+    """
+
+    def __init__(self, file_path: str) -> None:
+        """
+        Args:
+            file_path (str): dead-letter file path
+        """
+        self.file_path: str = file_path
+        # Appended by all advert workers and listing producer
+        self._lock: threading.Lock = threading.Lock()
+
+    def add(
+        self,
+        url: str,
+        kind: str,
+        error: BaseException,
+        error_class: Optional[str] = None,
+    ) -> None:
+        """
+        Append failed page.
+
+        Args:
+            url (str): url of failed page
+            kind (str): listing or advert
+            error (BaseException): error of the last attempt
+            error_class (Optional[str]): retry policy class of the error
+        """
+        entry: Dict[str, Any] = {
+            "url": url,
+            "kind": kind,
+            "error_class": error_class,
+            "error": repr(error),
+            "failed_at": time.time(),
+        }
+
+        with self._lock:
+            with open(self.file_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+    def read(self) -> List[Dict[str, Any]]:
+        """
+        Returns failed pages, empty list if nothing failed.
+        """
+        if not os.path.exists(self.file_path):
+            return []
+
+        with self._lock:
+            with open(self.file_path, encoding="utf-8") as f:
+                return [json.loads(line) for line in f if line.strip()]
+
+    def remove(self, entries: List[Dict[str, Any]]) -> None:
+        """
+        Remove given entries (as returned by read) from the file in one
+        rewrite - entries added since they were read are kept.
+
+        Args:
+            entries (List[Dict[str, Any]]): entries to remove
+        """
+        removed: Counter = Counter(
+            json.dumps(entry, sort_keys=True) for entry in entries
+        )
+
+        with self._lock:
+            if not removed or not os.path.exists(self.file_path):
+                return
+
+            kept: List[str] = []
+            with open(self.file_path, encoding="utf-8") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    key: str = json.dumps(json.loads(line), sort_keys=True)
+                    if removed[key]:
+                        removed[key] -= 1
+                    else:
+                        kept.append(line)
+
+            if not kept:
+                os.remove(self.file_path)
+                return
+
+            # Replaced at once, so file is never left half written
+            temp_path: str = f"{self.file_path}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                f.writelines(kept)
+            os.replace(temp_path, self.file_path)
@@ -0,0 +1,146 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Set
+
+
+def fingerprint(fields: Any) -> str:
+    """
+    Returns compact hash of JSON serializable advert fields.
+    """
+    return hashlib.blake2b(
+        json.dumps(fields, sort_keys=True, ensure_ascii=False).encode("utf-8"),
+        digest_size=8,
+    ).hexdigest()
+
+
+class FingerprintStore:
+    """
+    Persistent on-disk (sqlite) store of advert content fingerprints, keyed by
+    search parameters - tells which adverts are new or changed since last crawl.
+    Listing items are fingerprinted as a whole, advert details field by field
+    (to tell which fields changed).
+    """
+
+    def __init__(self, store_path: str, search_key: str) -> None:
+        self.search_key: str = search_key
+        # Store is shared by listing prefetch thread and advert workers
+        self._lock: threading.Lock = threading.Lock()
+        self.connection: sqlite3.Connection = sqlite3.connect(
+            store_path, check_same_thread=False
+        )
+        self.connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS fingerprints (
+                search_key TEXT NOT NULL,
+                slug TEXT NOT NULL,
+                fingerprint TEXT NOT NULL,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (search_key, slug)
+            )
+            """
+        )
+        self.connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS field_fingerprints (
+                search_key TEXT NOT NULL,
+                slug TEXT NOT NULL,
+                fields TEXT NOT NULL,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (search_key, slug)
+            )
+            """
+        )
+        self.connection.commit()
+
+    def changed(self, fingerprints: Dict[str, str]) -> Set[str]:
+        """
+        Returns slugs not present in the store for this search or stored
+        with other fingerprint.
+
+        Args:
+            fingerprints (Dict[str, str]): current fingerprints by advert slug
+        """
+        if not fingerprints:
+            return set()
+
+        with self._lock:
+            rows = self.connection.execute(
+                "SELECT slug, fingerprint FROM fingerprints "
+                "WHERE search_key = ? AND slug IN ("
+                + ",".join("?" * len(fingerprints))
+                + ")",
+                [self.search_key, *fingerprints],
+            ).fetchall()
+
+        stored: Dict[str, str] = dict(rows)
+
+        return {
+            slug
+            for slug, value in fingerprints.items()
+            if stored.get(slug) != value
+        }
+
+    def update(self, fingerprints: Dict[str, str]) -> None:
+        """
+        Store fingerprints of processed adverts.
+        """
+        now: float = time.time()
+
+        with self._lock:
+            self.connection.executemany(
+                "INSERT INTO fingerprints VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (search_key, slug) DO UPDATE SET "
+                "fingerprint = excluded.fingerprint, "
+                "updated_at = excluded.updated_at",
+                [
+                    (self.search_key, slug, value, now)
+                    for slug, value in fingerprints.items()
+                ],
+            )
+            self.connection.commit()
+
+    def changed_fields(self, slug: str, fields: Dict[str, str]) -> List[str]:
+        """
+        Returns names of advert fields which fingerprints differ from stored ones
+        (all fields of advert not present in the store).
+
+        Args:
+            slug (str): advert slug
+            fields (Dict[str, str]): current fingerprints by field name
+        """
+        with self._lock:
+            row = self.connection.execute(
+                "SELECT fields FROM field_fingerprints "
+                "WHERE search_key = ? AND slug = ?",
+                (self.search_key, slug),
+            ).fetchone()
+
+        stored: Dict[str, str] = json.loads(row[0]) if row else {}
+
+        return [
+            field for field, value in fields.items() if stored.get(field) != value
+        ]
+
+    def update_fields(self, slug: str, fields: Dict[str, str]) -> None:
+        """
+        Store field fingerprints of processed advert.
+        """
+        with self._lock:
+            self.connection.execute(
+                "INSERT INTO field_fingerprints VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (search_key, slug) DO UPDATE SET "
+                "fields = excluded.fields, updated_at = excluded.updated_at",
+                (
+                    self.search_key,
+                    slug,
+                    json.dumps(fields, separators=(",", ":")),
+                    time.time(),
+                ),
+            )
+            self.connection.commit()
+
+    def close(self) -> None:
+        self.connection.close()
@@ -0,0 +1,207 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import IO, Iterator, List, Optional, Tuple
+
+# Content kinds of archived pages
+NEXT_DATA: str = "next_data"
+BODY: str = "body"
+
+# slug, url, content kind, offset and length of compressed page in segment
+ArchiveEntry = Tuple[str, str, str, int, int]
+
+
+class RawArchive:
+    """
+    On-disk archive of fetched advert pages - __NEXT_DATA__ payload or full body,
+    every page zlib compressed on its own and appended to segment files
+    (new segment started once current one reaches segment_size). Sqlite index
+    keeps segment, offset and length of the latest version of every advert slug,
+    so adverts can be read one by one or segment by segment (re-parsed in
+    parallel) without network. Unchanged page is not appended again.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        segment_size: int = 64 * 1024 * 1024,
+        compression_level: int = 6,
+    ) -> None:
+        """
+        Args:
+            directory (str): archive directory, created if missing
+            segment_size (int): bytes after which new segment is started
+            compression_level (int): zlib compression level (1-9)
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.directory: str = directory
+        self.segment_size: int = segment_size
+        self.compression_level: int = compression_level
+        # Appended by all advert workers
+        self._lock: threading.Lock = threading.Lock()
+        self.connection: sqlite3.Connection = sqlite3.connect(
+            os.path.join(directory, "index.sqlite"), check_same_thread=False
+        )
+        self.connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS pages (
+                slug TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                content TEXT NOT NULL,
+                digest TEXT NOT NULL,
+                segment TEXT NOT NULL,
+                offset INTEGER NOT NULL,
+                length INTEGER NOT NULL,
+                fetched_at REAL NOT NULL
+            )
+            """
+        )
+        self.connection.commit()
+
+        segments: List[str] = self.segments()
+        self._segment: str = segments[-1] if segments else self._segment_name(1)
+        self._file: Optional[IO[bytes]] = None
+
+    @staticmethod
+    def _segment_name(number: int) -> str:
+        return f"segment_{number:06d}.z"
+
+    def segments(self) -> List[str]:
+        """
+        Returns names of segment files in write order.
+        """
+        return sorted(
+            name
+            for name in os.listdir(self.directory)
+            if name.startswith("segment_") and name.endswith(".z")
+        )
+
+    def _open_segment(self) -> IO[bytes]:
+        # Must be called with lock held
+        if not self._file:
+            self._file = open(
+                os.path.join(self.directory, self._segment), "ab"
+            )
+
+        if self._file.tell() >= self.segment_size:
+            self._file.close()
+            self._segment = self._segment_name(
+                int(self._segment[len("segment_"):-len(".z")]) + 1
+            )
+            self._file = open(
+                os.path.join(self.directory, self._segment), "ab"
+            )
+
+        return self._file
+
+    def put(self, slug: str, url: str, payload: bytes, content: str) -> bool:
+        """
+        Archive advert page.
+
+        Args:
+            slug (str): advert slug
+            url (str): advert url
+            payload (bytes): __NEXT_DATA__ payload or full page body
+            content (str): next_data or body
+
+        Returns:
+            bool: False if the same page is already archived for the slug
+        """
+        digest: str = hashlib.blake2b(payload, digest_size=8).hexdigest()
+        compressed: bytes = zlib.compress(payload, self.compression_level)
+
+        with self._lock:
+            row = self.connection.execute(
+                "SELECT digest FROM pages WHERE slug = ?", (slug,)
+            ).fetchone()
+            if row and row[0] == digest:
+                return False
+
+            segment_file: IO[bytes] = self._open_segment()
+            offset: int = segment_file.tell()
+            segment_file.write(compressed)
+            # Page is on disk before index points at it
+            segment_file.flush()
+
+            self.connection.execute(
+                "INSERT INTO pages VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (slug) DO UPDATE SET url = excluded.url, "
+                "content = excluded.content, digest = excluded.digest, "
+                "segment = excluded.segment, offset = excluded.offset, "
+                "length = excluded.length, fetched_at = excluded.fetched_at",
+                (
+                    slug,
+                    url,
+                    content,
+                    digest,
+                    self._segment,
+                    offset,
+                    len(compressed),
+                    time.time(),
+                ),
+            )
+            self.connection.commit()
+
+        return True
+
+    def get(self, slug: str) -> Optional[Tuple[str, bytes]]:
+        """
+        Returns content kind and payload of archived advert, None if not archived.
+        """
+        with self._lock:
+            row = self.connection.execute(
+                "SELECT content, segment, offset, length FROM pages "
+                "WHERE slug = ?",
+                (slug,),
+            ).fetchone()
+
+        if not row:
+            return None
+
+        content, segment, offset, length = row
+        with open(os.path.join(self.directory, segment), "rb") as f:
+            f.seek(offset)
+            return content, zlib.decompress(f.read(length))
+
+    def entries(self, segment: str) -> List[ArchiveEntry]:
+        """
+        Returns index entries of adverts which latest version is in segment,
+        in segment order.
+        """
+        with self._lock:
+            return self.connection.execute(
+                "SELECT slug, url, content, offset, length FROM pages "
+                "WHERE segment = ? ORDER BY offset",
+                (segment,),
+            ).fetchall()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file:
+                self._file.close()
+                self._file = None
+            self.connection.close()
+
+
+def read_segment(
+    segment_path: str, entries: List[ArchiveEntry]
+) -> Iterator[Tuple[str, str, str, bytes]]:
+    """
+    Read archived pages of single segment - index is not needed, so segments
+    can be read in parallel by worker processes.
+
+    Args:
+        segment_path (str): segment file path
+        entries (List[ArchiveEntry]): index entries of the segment
+
+    Returns:
+        Iterator[Tuple[str, str, str, bytes]]: slug, url, content kind
+            and payload of every page
+    """
+    with open(segment_path, "rb") as f:
+        for slug, url, content, offset, length in entries:
+            f.seek(offset)
+            yield slug, url, content, zlib.decompress(f.read(length))
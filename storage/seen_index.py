@@ -0,0 +1,75 @@
+import sqlite3
+import threading
+import time
+from typing import Iterable, List, Set
+
+
+class SeenIndex:
+    """
+    Persistent on-disk (sqlite) index of already scraped advert slugs,
+    keyed by search parameters, with first and last seen timestamps.
+    """
+
+    def __init__(self, index_path: str, search_key: str) -> None:
+        self.search_key: str = search_key
+        # Index is shared by listing prefetch thread and advert workers
+        self._lock: threading.Lock = threading.Lock()
+        self.connection: sqlite3.Connection = sqlite3.connect(
+            index_path, check_same_thread=False
+        )
+        self.connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS seen_slugs (
+                search_key TEXT NOT NULL,
+                slug TEXT NOT NULL,
+                first_seen REAL NOT NULL,
+                last_seen REAL NOT NULL,
+                PRIMARY KEY (search_key, slug)
+            )
+            """
+        )
+        self.connection.commit()
+
+    def seen(self, slugs: Iterable[str]) -> Set[str]:
+        """
+        Returns slugs already present in the index for this search and
+        refresh their last seen timestamp.
+        """
+        slugs: List[str] = list(slugs)
+        if not slugs:
+            return set()
+
+        with self._lock:
+            rows = self.connection.execute(
+                "SELECT slug FROM seen_slugs WHERE search_key = ? AND slug IN ("
+                + ",".join("?" * len(slugs))
+                + ")",
+                [self.search_key, *slugs],
+            ).fetchall()
+            known: Set[str] = {row[0] for row in rows}
+
+            self.connection.executemany(
+                "UPDATE seen_slugs SET last_seen = ? "
+                "WHERE search_key = ? AND slug = ?",
+                [(time.time(), self.search_key, slug) for slug in known],
+            )
+            self.connection.commit()
+
+        return known
+
+    def mark_seen(self, slugs: Iterable[str]) -> None:
+        """
+        Add scraped slugs to the index.
+        """
+        now: float = time.time()
+
+        with self._lock:
+            self.connection.executemany(
+                "INSERT INTO seen_slugs VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (search_key, slug) DO UPDATE SET last_seen = ?",
+                [(self.search_key, slug, now, now, now) for slug in slugs],
+            )
+            self.connection.commit()
+
+    def close(self) -> None:
+        self.connection.close()
@@ -0,0 +1,114 @@
+import json
+import sqlite3
+import time
+from typing import Any, Dict, List, Optional
+
+from storage.writers import BatchWriter
+
+COLUMNS = ("url", "price", "size", "location", "description")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS estates (
+    url TEXT PRIMARY KEY,
+    price REAL,
+    size REAL,
+    location TEXT,
+    description TEXT,
+    extra TEXT,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_estates_location ON estates (location);
+CREATE INDEX IF NOT EXISTS idx_estates_price ON estates (price);
+CREATE TABLE IF NOT EXISTS price_history (
+    url TEXT NOT NULL,
+    price REAL,
+    recorded_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_price_history_url
+    ON price_history (url, recorded_at);
+"""
+
+
+class SQLiteWriter(BatchWriter):
+    """
+    SQLite sink - estates are upserted by advert url, one transaction per batch.
+    New price (first one or changed) is recorded in price_history table.
+    Fields other than COLUMNS are kept as JSON in extra column.
+    """
+
+    def __init__(
+        self,
+        temp_path: str,
+        batch_size: int = 500,
+        resume_offset: Optional[int] = None,
+    ) -> None:
+        # Upserts by url make resumed crawl idempotent, nothing to truncate
+        super().__init__(temp_path=temp_path, batch_size=batch_size)
+        self.connection: sqlite3.Connection = sqlite3.connect(temp_path)
+        self.connection.executescript(SCHEMA)
+
+    def write_batch(self, rows: List[Dict[str, Any]]) -> None:
+        now: float = time.time()
+        urls: List[str] = [row["url"] for row in rows]
+
+        with self.connection:
+            known_prices: Dict[str, float] = dict(
+                self.connection.execute(
+                    "SELECT url, price FROM estates WHERE url IN ("
+                    + ",".join("?" * len(urls))
+                    + ")",
+                    urls,
+                ).fetchall()
+            )
+
+            price_changes: List[tuple] = []
+            for row in rows:
+                if (
+                    row["url"] not in known_prices
+                    or known_prices[row["url"]] != row["price"]
+                ):
+                    price_changes.append((row["url"], row["price"], now))
+                    # Same advert twice in one batch is recorded once per price
+                    known_prices[row["url"]] = row["price"]
+
+            self.connection.executemany(
+                "INSERT INTO price_history VALUES (?, ?, ?)", price_changes
+            )
+            self.connection.executemany(
+                """
+                INSERT INTO estates VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (url) DO UPDATE SET
+                    price = excluded.price,
+                    size = excluded.size,
+                    location = excluded.location,
+                    description = excluded.description,
+                    extra = excluded.extra,
+                    last_seen = excluded.last_seen
+                """,
+                [
+                    (
+                        *(row.get(column) for column in COLUMNS),
+                        json.dumps(
+                            {
+                                key: value
+                                for key, value in row.items()
+                                if key not in COLUMNS
+                            },
+                            ensure_ascii=False,
+                        ),
+                        now,
+                        now,
+                    )
+                    for row in rows
+                ],
+            )
+
+    def offset(self) -> Optional[int]:
+        self.flush()
+
+        return self.records_written
+
+    def close(self) -> None:
+        super().close()
+        self.connection.close()
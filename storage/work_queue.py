@@ -0,0 +1,251 @@
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+
+class Task:
+    """
+    Work queue task leased by crawl node.
+    """
+
+    def __init__(
+        self, task_id: int, kind: str, payload: Dict[str, Any], attempts: int
+    ) -> None:
+        self.task_id: int = task_id
+        self.kind: str = kind
+        self.payload: Dict[str, Any] = payload
+        self.attempts: int = attempts
+
+    def __repr__(self) -> str:
+        return f"Task({self.task_id}, {self.kind}, {self.payload})"
+
+
+class WorkQueue:
+    """
+    Persistent on-disk (sqlite) queue of crawl tasks shared by crawl nodes.
+    Tasks are unique by key within a crawl (shared dedup - advert found by many
+    nodes is queued once), leased by one node at a time and kept by heartbeats.
+    Tasks of expired leases (crashed or stuck node) and failed ones are queued
+    again, until max_attempts is reached. Finished tasks are cleared when next
+    crawl is seeded (see clear_finished).
+
+    Queue file is opened by processes of one host only, on local filesystem -
+    sqlite WAL mode keeps its lock state in shared memory of the host and sqlite
+    locking is not reliable over NFS/SMB. Nodes of other hosts work the queue
+    served by coordinator over HTTP (storage.work_queue_api).
+    """
+
+    QUEUED: str = "queued"
+    LEASED: str = "leased"
+    DONE: str = "done"
+    FAILED: str = "failed"
+
+    def __init__(
+        self,
+        queue_path: str,
+        lease_seconds: float = 60,
+        max_attempts: int = 3,
+    ) -> None:
+        """
+        Args:
+            queue_path (str): queue file path on local filesystem, shared
+                by all nodes of the host (and coordinator serving the queue)
+            lease_seconds (float): lease time, prolonged by heartbeats
+            max_attempts (int): leases of a task before it is marked failed
+        """
+        self.lease_seconds: float = lease_seconds
+        self.max_attempts: int = max_attempts
+        # Connection is shared by worker, its heartbeat threads and API handlers
+        self._lock: threading.Lock = threading.Lock()
+        self.connection: sqlite3.Connection = sqlite3.connect(
+            queue_path,
+            timeout=30,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        # Readers do not block writer - single host only, see class docstring
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS tasks (
+                task_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                key TEXT NOT NULL UNIQUE,
+                kind TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                state TEXT NOT NULL,
+                owner TEXT,
+                lease_until REAL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                error TEXT
+            )
+            """
+        )
+        self.connection.execute(
+            "CREATE INDEX IF NOT EXISTS idx_tasks_state ON tasks (state, task_id)"
+        )
+
+    def put(self, key: str, kind: str, payload: Dict[str, Any]) -> bool:
+        """
+        Queue task unless task of the same key is already in the queue
+        (queued, leased, or finished in current crawl).
+
+        Args:
+            key (str): unique task key (e.g. advert slug)
+            kind (str): task kind
+            payload (Dict[str, Any]): JSON serializable task data
+
+        Returns:
+            bool: True if task was queued, False if it is a duplicate
+        """
+        with self._lock:
+            cursor: sqlite3.Cursor = self.connection.execute(
+                "INSERT OR IGNORE INTO tasks (key, kind, payload, state) "
+                "VALUES (?, ?, ?, ?)",
+                (key, kind, json.dumps(payload), self.QUEUED),
+            )
+
+        return cursor.rowcount == 1
+
+    def clear_finished(self) -> int:
+        """
+        Remove done and failed tasks, so keys of finished crawl can be queued
+        again by the next one. Tasks queued or leased are kept.
+
+        Returns:
+            int: number of tasks removed
+        """
+        with self._lock:
+            cursor: sqlite3.Cursor = self.connection.execute(
+                "DELETE FROM tasks WHERE state IN (?, ?)",
+                (self.DONE, self.FAILED),
+            )
+
+        return cursor.rowcount
+
+    def lease(self, owner: str) -> Optional[Task]:
+        """
+        Lease oldest queued task, expired leases are queued again first.
+
+        Args:
+            owner (str): id of leasing node
+
+        Returns:
+            Optional[Task]: leased task or None if nothing is queued
+        """
+        now: float = time.time()
+
+        with self._lock:
+            self.connection.execute("BEGIN IMMEDIATE")
+            try:
+                self._requeue_expired(now=now)
+                row = self.connection.execute(
+                    "SELECT task_id, kind, payload, attempts FROM tasks "
+                    "WHERE state = ? ORDER BY task_id LIMIT 1",
+                    (self.QUEUED,),
+                ).fetchone()
+
+                if row:
+                    self.connection.execute(
+                        "UPDATE tasks SET state = ?, owner = ?, lease_until = ?, "
+                        "attempts = attempts + 1 WHERE task_id = ?",
+                        (self.LEASED, owner, now + self.lease_seconds, row[0]),
+                    )
+                self.connection.execute("COMMIT")
+            except BaseException:
+                self.connection.execute("ROLLBACK")
+                raise
+
+        if not row:
+            return None
+
+        return Task(
+            task_id=row[0],
+            kind=row[1],
+            payload=json.loads(row[2]),
+            attempts=row[3] + 1,
+        )
+
+    def _requeue_expired(self, now: float) -> None:
+        """
+        Queue again tasks of expired leases, or mark them failed when out of attempts.
+        """
+        self.connection.execute(
+            "UPDATE tasks SET state = CASE WHEN attempts < ? THEN ? ELSE ? END, "
+            "owner = NULL, error = 'lease expired' "
+            "WHERE state = ? AND lease_until < ?",
+            (self.max_attempts, self.QUEUED, self.FAILED, self.LEASED, now),
+        )
+
+    def heartbeat(self, task: Task, owner: str) -> bool:
+        """
+        Prolong lease of task in progress.
+
+        Returns:
+            bool: False if lease was lost (expired and taken over)
+        """
+        with self._lock:
+            cursor: sqlite3.Cursor = self.connection.execute(
+                "UPDATE tasks SET lease_until = ? "
+                "WHERE task_id = ? AND owner = ? AND state = ?",
+                (
+                    time.time() + self.lease_seconds,
+                    task.task_id,
+                    owner,
+                    self.LEASED,
+                ),
+            )
+
+        return cursor.rowcount == 1
+
+    def ack(self, task: Task, owner: str) -> None:
+        """
+        Mark leased task done.
+        """
+        with self._lock:
+            self.connection.execute(
+                "UPDATE tasks SET state = ?, lease_until = NULL "
+                "WHERE task_id = ? AND owner = ?",
+                (self.DONE, task.task_id, owner),
+            )
+
+    def fail(self, task: Task, owner: str, error: str) -> None:
+        """
+        Release leased task after error - queued again or marked failed when
+        out of attempts.
+        """
+        with self._lock:
+            self.connection.execute(
+                "UPDATE tasks SET state = CASE WHEN attempts < ? THEN ? ELSE ? END, "
+                "owner = NULL, lease_until = NULL, error = ? "
+                "WHERE task_id = ? AND owner = ?",
+                (
+                    self.max_attempts,
+                    self.QUEUED,
+                    self.FAILED,
+                    error,
+                    task.task_id,
+                    owner,
+                ),
+            )
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns number of tasks by state.
+        """
+        with self._lock:
+            rows = self.connection.execute(
+                "SELECT state, COUNT(*) FROM tasks GROUP BY state"
+            ).fetchall()
+
+        return {
+            **{
+                state: 0
+                for state in (self.QUEUED, self.LEASED, self.DONE, self.FAILED)
+            },
+            **dict(rows),
+        }
+
+    def close(self) -> None:
+        self.connection.close()
@@ -0,0 +1,195 @@
+import json
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Optional
+
+import requests
+
+from storage.work_queue import Task, WorkQueue
+
+
+def task_dict(task: Task) -> Dict[str, Any]:
+    """
+    Returns task as JSON serializable dict (body of work queue API).
+    """
+    return {
+        "task_id": task.task_id,
+        "kind": task.kind,
+        "payload": task.payload,
+        "attempts": task.attempts,
+    }
+
+
+class WorkQueueServer:
+    """
+    Serves work queue of coordinator host over HTTP, so that crawl nodes of other
+    hosts can share it (RemoteWorkQueue). Queue file stays on local filesystem
+    of the coordinator, all its writes are made by this process. Every queue
+    method is a POST to /<method> with JSON body of its arguments, answered
+    with JSON {"result": ...}. No authentication - serve on private network.
+    """
+
+    def __init__(
+        self, queue: WorkQueue, host: str = "127.0.0.1", port: int = 0
+    ) -> None:
+        """
+        Args:
+            queue (WorkQueue): served work queue
+            host (str): address to listen on, 0.0.0.0 for all interfaces
+            port (int): port to listen on, 0 - any free one
+        """
+        self.queue: WorkQueue = queue
+        self.methods: Dict[str, Callable[..., Any]] = {
+            "put": queue.put,
+            "clear_finished": queue.clear_finished,
+            "lease": self._lease,
+            "heartbeat": self._with_task(queue.heartbeat),
+            "ack": self._with_task(queue.ack),
+            "fail": self._with_task(queue.fail),
+            "stats": queue.stats,
+        }
+        self.server: ThreadingHTTPServer = ThreadingHTTPServer(
+            (host, port), self._handler()
+        )
+        self.server.daemon_threads = True
+        self.url: str = f"http://{host}:{self.server.server_port}"
+
+    def __enter__(self) -> "WorkQueueServer":
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def serve_forever(self) -> None:
+        """
+        Serve queue until interrupted (coordinator --serve).
+        """
+        try:
+            self.server.serve_forever()
+        finally:
+            self.server.server_close()
+
+    def close(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _lease(self, owner: str) -> Optional[Dict[str, Any]]:
+        task: Optional[Task] = self.queue.lease(owner=owner)
+
+        return task_dict(task) if task else None
+
+    @staticmethod
+    def _with_task(method: Callable[..., Any]) -> Callable[..., Any]:
+        """
+        Returns queue method taking task as dict, as sent by RemoteWorkQueue.
+        """
+
+        def call(task: Dict[str, Any], **kwargs: Any) -> Any:
+            return method(task=Task(**task), **kwargs)
+
+        return call
+
+    def _handler(self) -> type:
+        api: "WorkQueueServer" = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body are written apart - without it every answer
+            # waits for delayed ACK of the node (~40 ms per call)
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+            def do_POST(self) -> None:
+                method: Optional[Callable[..., Any]] = api.methods.get(
+                    self.path.strip("/")
+                )
+                length: int = int(self.headers.get("Content-Length", 0))
+                body: bytes = self.rfile.read(length)
+
+                if not method:
+                    self.respond(status=404, data={"error": "unknown method"})
+                    return
+
+                try:
+                    result: Any = method(**json.loads(body or b"{}"))
+                except (TypeError, ValueError) as e:
+                    # Malformed request, queue is left as it was
+                    self.respond(status=400, data={"error": repr(e)})
+                    return
+                except Exception as e:
+                    logging.warning(f"Work queue {self.path} failed: {e!r}")
+                    self.respond(status=500, data={"error": repr(e)})
+                    return
+
+                self.respond(status=200, data={"result": result})
+
+            def respond(self, status: int, data: Dict[str, Any]) -> None:
+                body: bytes = json.dumps(data).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        return Handler
+
+
+class RemoteWorkQueue:
+    """
+    Work queue served by coordinator (WorkQueueServer) - same methods as
+    WorkQueue, so that QueueWorker and CrawlCoordinator work either of them.
+    """
+
+    QUEUED: str = WorkQueue.QUEUED
+    LEASED: str = WorkQueue.LEASED
+    DONE: str = WorkQueue.DONE
+    FAILED: str = WorkQueue.FAILED
+
+    def __init__(self, url: str, timeout: float = 30) -> None:
+        """
+        Args:
+            url (str): coordinator url, e.g. http://10.0.0.1:8765
+            timeout (float): seconds to connect / wait for answer
+        """
+        self.url: str = url.rstrip("/")
+        self.timeout: float = timeout
+        # One connection pool shared by worker and its heartbeat threads
+        self.session: requests.Session = requests.Session()
+
+    def _call(self, method: str, **kwargs: Any) -> Any:
+        response: requests.Response = self.session.post(
+            f"{self.url}/{method}", json=kwargs, timeout=self.timeout
+        )
+        response.raise_for_status()
+
+        return response.json()["result"]
+
+    def put(self, key: str, kind: str, payload: Dict[str, Any]) -> bool:
+        return self._call("put", key=key, kind=kind, payload=payload)
+
+    def clear_finished(self) -> int:
+        return self._call("clear_finished")
+
+    def lease(self, owner: str) -> Optional[Task]:
+        task: Optional[Dict[str, Any]] = self._call("lease", owner=owner)
+
+        return Task(**task) if task else None
+
+    def heartbeat(self, task: Task, owner: str) -> bool:
+        return self._call("heartbeat", task=task_dict(task), owner=owner)
+
+    def ack(self, task: Task, owner: str) -> None:
+        self._call("ack", task=task_dict(task), owner=owner)
+
+    def fail(self, task: Task, owner: str, error: str) -> None:
+        self._call("fail", task=task_dict(task), owner=owner, error=error)
+
+    def stats(self) -> Dict[str, int]:
+        return self._call("stats")
+
+    def close(self) -> None:
+        self.session.close()
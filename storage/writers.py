@@ -0,0 +1,379 @@
+import csv
+import json
+from os import path
+from typing import Any, Dict, IO, Iterable, List, Optional
+
+# Details fields stored as real numbers instead of stripped strings
+NUMERIC_FIELDS = ("price", "size")
+
+
+def to_number(value: Any) -> Optional[float]:
+    """
+    Convert price/size string as produced by EstateDetails validators
+    (e.g. "545 000", "52,70") to float, None if not a number.
+    """
+    if isinstance(value, (int, float)):
+        return float(value)
+
+    try:
+        return float(
+            str(value).replace("\xa0", "").replace(" ", "").replace(",", ".")
+        )
+    except ValueError:
+        return None
+
+
+def estate_row(record: Any) -> Dict[str, Any]:
+    """
+    Flatten Estate model to a single row with typed numeric fields.
+    """
+    row: Dict[str, Any] = record.dict()
+    row.update(row.pop("details"))
+
+    for field in NUMERIC_FIELDS:
+        if field in row:
+            row[field] = to_number(row[field])
+
+    return row
+
+
+def arrow_schema(pa: Any, rows: List[Dict[str, Any]]) -> Any:
+    """
+    Returns Arrow schema of columns of rows - types declared by EstateFullDetails
+    fields, so that columns holding only nulls or empty lists in the first batch
+    (hidden prices, adverts without street or features) are typed as well.
+    Columns not known are inferred from rows.
+
+    Args:
+        pa (Any): pyarrow module
+        rows (List[Dict[str, Any]]): first batch of rows
+
+    Returns:
+        Any: pyarrow.Schema
+    """
+    from pydantic.fields import SHAPE_SINGLETON
+
+    from data_types.estate_full_details import EstateFullDetails
+
+    scalar_types: Dict[type, Any] = {
+        int: pa.int64(),
+        float: pa.float64(),
+        str: pa.string(),
+    }
+    types: Dict[str, Any] = {
+        "url": pa.string(),
+        # Search profiles (multi-search) and changed fields (change detection)
+        "profiles": pa.list_(pa.string()),
+        "changed": pa.list_(pa.string()),
+    }
+    for name, field in EstateFullDetails.__fields__.items():
+        scalar: Any = scalar_types[field.type_]
+        types[name] = (
+            scalar if field.shape == SHAPE_SINGLETON else pa.list_(scalar)
+        )
+    for name in NUMERIC_FIELDS:
+        types[name] = pa.float64()
+
+    inferred: Any = None
+    fields: List[Any] = []
+    for column in dict.fromkeys(key for row in rows for key in row):
+        if column not in types:
+            inferred = inferred or pa.Table.from_pylist(rows).schema
+            types[column] = inferred.field(column).type
+        fields.append(pa.field(column, types[column]))
+
+    return pa.schema(fields)
+
+
+def open_output(
+    temp_path: str,
+    resume_offset: Optional[int] = None,
+    newline: Optional[str] = None,
+) -> IO[str]:
+    """
+    Open results file for writing from scratch, or - when resuming crawl - for
+    appending at resume_offset (records written past it are dropped).
+
+    Args:
+        temp_path (str): results file path
+        resume_offset (Optional[int]): offset saved in crawl checkpoint
+
+    Returns:
+        IO[str]: opened results file
+    """
+    if resume_offset is None or not path.exists(temp_path):
+        return open(temp_path, "w+", encoding="utf-8", newline=newline)
+
+    file: IO[str] = open(temp_path, "r+", encoding="utf-8", newline=newline)
+    file.truncate(resume_offset)
+    file.seek(resume_offset)
+
+    return file
+
+
+class TextWriter:
+    """
+    Streaming writer of scraped records - one record repr per line, each line
+    flushed to disk as soon as it arrives.
+    """
+
+    def __init__(
+        self, temp_path: str, resume_offset: Optional[int] = None, **kwargs: Any
+    ) -> None:
+        self.file: IO[str] = open_output(
+            temp_path=temp_path, resume_offset=resume_offset
+        )
+        self.records_written: int = 0
+
+    def __enter__(self) -> "TextWriter":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def write(self, record: Any) -> None:
+        """
+        Write single record and flush it.
+        """
+        self.file.write(str(record))
+        self.file.write("\n")
+        self.file.flush()
+        self.records_written += 1
+
+    def write_all(self, records: Iterable[Any]) -> None:
+        """
+        Write records one by one as they are yielded.
+        """
+        for record in records:
+            self.write(record)
+
+    def offset(self) -> Optional[int]:
+        """
+        Returns position in results file after all records written so far,
+        to resume from (see CrawlCheckpoint).
+        """
+        return self.file.tell()
+
+    def close(self) -> None:
+        self.file.close()
+
+
+class BatchWriter(TextWriter):
+    """
+    Base of structured writers - records are flattened to rows (estate_row)
+    and written in batches of batch_size.
+    """
+
+    def __init__(self, temp_path: str, batch_size: int = 100) -> None:
+        self.temp_path: str = temp_path
+        self.batch_size: int = batch_size
+        self.batch: List[Dict[str, Any]] = []
+        self.records_written: int = 0
+
+    def write(self, record: Any) -> None:
+        self.batch.append(estate_row(record=record))
+        self.records_written += 1
+
+        if len(self.batch) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Write pending batch.
+        """
+        if self.batch:
+            self.write_batch(rows=self.batch)
+            self.batch = []
+
+    def write_batch(self, rows: List[Dict[str, Any]]) -> None:
+        raise NotImplementedError
+
+    def offset(self) -> Optional[int]:
+        self.flush()
+
+        return super().offset()
+
+    def close(self) -> None:
+        self.flush()
+
+
+class JsonLinesWriter(BatchWriter):
+    """
+    JSON Lines writer - one JSON object per record.
+    """
+
+    def __init__(
+        self,
+        temp_path: str,
+        batch_size: int = 100,
+        resume_offset: Optional[int] = None,
+    ) -> None:
+        super().__init__(temp_path=temp_path, batch_size=batch_size)
+        self.file: IO[str] = open_output(
+            temp_path=temp_path, resume_offset=resume_offset
+        )
+
+    def write_batch(self, rows: List[Dict[str, Any]]) -> None:
+        self.file.write(
+            "".join(json.dumps(row, ensure_ascii=False) + "\n" for row in rows)
+        )
+        self.file.flush()
+
+    def close(self) -> None:
+        super().close()
+        self.file.close()
+
+
+class CsvWriter(BatchWriter):
+    """
+    CSV writer - header taken from the first record.
+    """
+
+    def __init__(
+        self,
+        temp_path: str,
+        batch_size: int = 100,
+        resume_offset: Optional[int] = None,
+    ) -> None:
+        super().__init__(temp_path=temp_path, batch_size=batch_size)
+        self.file: IO[str] = open_output(
+            temp_path=temp_path, resume_offset=resume_offset, newline=""
+        )
+        self.writer: Optional[csv.DictWriter] = None
+
+    def write_batch(self, rows: List[Dict[str, Any]]) -> None:
+        if not self.writer:
+            self.writer = csv.DictWriter(self.file, fieldnames=list(rows[0]))
+            # Resumed file has header already
+            if not self.file.tell():
+                self.writer.writeheader()
+
+        self.writer.writerows(
+            {
+                key: ";".join(value) if isinstance(value, list) else value
+                for key, value in row.items()
+            }
+            for row in rows
+        )
+        self.file.flush()
+
+    def close(self) -> None:
+        super().close()
+        self.file.close()
+
+
+class ParquetWriter(BatchWriter):
+    """
+    Parquet writer (requires pyarrow) - every batch is a row group, columns
+    of the first batch typed by arrow_schema.
+    """
+
+    def __init__(
+        self,
+        temp_path: str,
+        batch_size: int = 1000,
+        resume_offset: Optional[int] = None,
+    ) -> None:
+        super().__init__(temp_path=temp_path, batch_size=batch_size)
+        if resume_offset is not None:
+            raise ValueError("Resume is not supported for parquet/arrow results")
+
+        try:
+            import pyarrow
+        except ImportError:
+            raise ImportError(
+                "pyarrow is required for parquet/arrow results file"
+            )
+
+        self.pa = pyarrow
+        self.writer: Any = None
+        self.schema: Any = None
+
+    def open_writer(self, schema: Any) -> Any:
+        import pyarrow.parquet
+
+        return pyarrow.parquet.ParquetWriter(self.temp_path, schema)
+
+    def write_batch(self, rows: List[Dict[str, Any]]) -> None:
+        if not self.writer:
+            self.schema = arrow_schema(pa=self.pa, rows=rows)
+            self.writer = self.open_writer(schema=self.schema)
+
+        self.writer.write_table(
+            self.pa.Table.from_pylist(rows, schema=self.schema)
+        )
+
+    def offset(self) -> Optional[int]:
+        # File cannot be appended once closed - records count is saved, so that
+        # resume is refused instead of overwriting written records
+        self.flush()
+
+        return self.records_written
+
+    def close(self) -> None:
+        super().close()
+        if self.writer:
+            self.writer.close()
+
+
+class ArrowWriter(ParquetWriter):
+    """
+    Arrow IPC (feather v2) writer (requires pyarrow).
+    """
+
+    def open_writer(self, schema: Any) -> Any:
+        import pyarrow.ipc
+
+        return pyarrow.ipc.new_file(self.temp_path, schema)
+
+
+WRITERS = {
+    "txt": TextWriter,
+    "jsonl": JsonLinesWriter,
+    "csv": CsvWriter,
+    "parquet": ParquetWriter,
+    "arrow": ArrowWriter,
+}
+
+EXTENSIONS = {
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+    ".csv": "csv",
+    ".parquet": "parquet",
+    ".arrow": "arrow",
+    ".feather": "arrow",
+    ".sqlite": "sqlite",
+    ".sqlite3": "sqlite",
+    ".db": "sqlite",
+}
+
+
+def get_writer(
+    temp_path: str, results_format: Optional[str] = None, **kwargs: Any
+) -> TextWriter:
+    """
+    Returns writer for results file - format given explicitly or taken from
+    file extension, records repr per line (txt) if extension is not known.
+
+    Args:
+        temp_path (str): results file path
+        results_format (Optional[str]): one of WRITERS keys or sqlite
+
+    Returns:
+        TextWriter: writer instance
+    """
+    if not results_format:
+        results_format = EXTENSIONS.get(
+            path.splitext(temp_path)[1].lower(), "txt"
+        )
+
+    if results_format == "sqlite":
+        # Imported here as sqlite sink builds on BatchWriter from this module
+        from storage.sqlite_sink import SQLiteWriter
+
+        return SQLiteWriter(temp_path=temp_path, **kwargs)
+
+    if results_format not in WRITERS:
+        raise ValueError(f"Unknown results format: {results_format}")
+
+    return WRITERS[results_format](temp_path=temp_path, **kwargs)
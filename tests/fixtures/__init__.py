@@ -0,0 +1,72 @@
+"""
+Recorded Otodom pages (listing and advert) and helpers of tests built on them,
+also used by the mock server and benchmarks.
+"""
+import json
+import re
+import unicodedata
+from os import path
+from typing import Any, Dict, List
+
+from scraper.next_data import extract_next_data
+
+FIXTURES: str = path.dirname(path.realpath(__file__))
+
+# Boilerplate and markup edge cases of advert descriptions
+EDGE_CASES: List[str] = [
+    "Mieszkanie\r\nz balkonem.\r\n<br/>Oferta pochodzi z serwisu obido",
+    "<p>Cena\xa0do negocjacji</p>\n<p>Oferta wysłana z programu dla biur "
+    "nieruchomości ASARI CRM ()</p>",
+    '<a href="x"\r\n   class="y">link</a> bez zamknięcia <b',
+    "Oferta pochodzi z serwisu obidoOferta pochodzi z serwisu obido",
+    "Plain ASCII description, nothing to clean.",
+    "",
+]
+
+
+def read_fixture(name: str) -> bytes:
+    with open(path.join(FIXTURES, name), "rb") as f:
+        return f.read()
+
+
+def legacy_clean(description: str) -> str:
+    """
+    Description cleaning as done by EstateDetails.validate_description before
+    DescriptionCleaner - kept as reference for output and speed.
+    """
+    des: str = (
+        description.replace(
+            "Oferta wysłana z programu dla biur nieruchomości ASARI CRM ()",
+            "",
+        )
+        .replace("Oferta pochodzi z serwisu obido", "")
+        .replace("\n", " ")
+        .replace("\r", "")
+    )
+    clear_tags = re.compile("<.*?>")
+    d: str = re.sub(clear_tags, "", des)
+
+    return unicodedata.normalize("NFKD", d)
+
+
+def load_corpus() -> List[str]:
+    """
+    Returns descriptions of fixture advert and listing adverts with edge cases.
+    """
+    advert: Dict[str, Any] = json.loads(
+        extract_next_data(page_source=read_fixture("estate_page.html"))
+    )
+    listing: Dict[str, Any] = json.loads(
+        extract_next_data(page_source=read_fixture("listing_page.html"))
+    )
+
+    return (
+        [advert["props"]["pageProps"]["ad"]["description"]]
+        + [
+            item["shortDescription"]
+            for item in listing["props"]["pageProps"]["data"]["searchAds"][
+                "items"
+            ]
+        ]
+        + EDGE_CASES
+    )
@@ -0,0 +1,118 @@
+import threading
+import time
+from email.utils import formatdate
+from unittest.mock import patch
+
+from scraper.adaptive_throttle import AdaptiveThrottle, parse_retry_after
+from scraper.metrics import Metrics
+from scraper.otodom_scraper import OtoDomScraper
+
+
+class TestAdaptiveThrottle:
+    def test_if_rate_raised_while_responses_fast(self):
+        throttle: AdaptiveThrottle = AdaptiveThrottle(
+            requests_per_second=50, max_rate=50.5, increase=0.1
+        )
+
+        for _ in range(10):
+            throttle.acquire()
+            throttle.release(status=200, latency=0.01)
+
+        assert throttle.rate == 50.5
+
+    def test_if_backed_off_on_throttling_status(self):
+        metrics: Metrics = Metrics()
+        throttle: AdaptiveThrottle = AdaptiveThrottle(
+            requests_per_second=4, max_concurrency=8, metrics=metrics
+        )
+
+        throttle.acquire()
+        throttle.release(status=429, latency=0.01)
+
+        assert throttle.rate == 2
+        assert throttle.concurrency == 4
+        assert metrics.gauges["throttle_rate"] == 2
+        assert metrics.gauges["throttle_concurrency"] == 4
+        assert metrics.counters["throttle_backoffs"] == 1
+
+    def test_if_backed_off_once_per_round_trip(self):
+        throttle: AdaptiveThrottle = AdaptiveThrottle(
+            requests_per_second=40, max_rate=100
+        )
+
+        for status in [200, 503, 503]:
+            throttle.acquire()
+            throttle.release(status=status, latency=10)
+
+        assert throttle.rate == 40.1 / 2
+
+    def test_if_backed_off_on_rising_latency(self):
+        throttle: AdaptiveThrottle = AdaptiveThrottle(
+            requests_per_second=40, max_rate=100, latency_tolerance=2.0
+        )
+
+        for latency in [0.001, 0.001, 0.1]:
+            throttle.acquire()
+            throttle.release(status=200, latency=latency)
+
+        assert throttle.rate == 40.2 / 2
+
+    def test_if_retry_after_honoured(self):
+        throttle: AdaptiveThrottle = AdaptiveThrottle(
+            requests_per_second=100, max_rate=100
+        )
+
+        throttle.acquire()
+        throttle.release(status=429, latency=0.0, retry_after=0.2)
+        start: float = time.monotonic()
+        throttle.acquire()
+
+        assert time.monotonic() - start >= 0.2
+
+    def test_if_requests_in_flight_bounded_by_concurrency(self):
+        throttle: AdaptiveThrottle = AdaptiveThrottle(
+            requests_per_second=100, max_rate=100, max_concurrency=1
+        )
+        throttle.acquire()
+        second: threading.Thread = threading.Thread(target=throttle.acquire)
+        second.start()
+
+        second.join(timeout=0.1)
+        assert second.is_alive()
+
+        throttle.release(status=200, latency=0.01)
+        second.join(timeout=1)
+        assert not second.is_alive()
+
+    def test_if_retry_after_parsed(self):
+        assert parse_retry_after("3") == 3.0
+        assert 8 < parse_retry_after(formatdate(time.time() + 10)) <= 10
+        assert parse_retry_after("soon") is None
+        assert parse_retry_after(None) is None
+
+    @patch(
+        "scraper.otodom_scraper.OtoDomScraper.PARAMS",
+        {
+            "agent": "test_header",
+            "retry": {"connect": None, "read": None, "redirect": None},
+            "verbose_logging": False,
+            "throttle": {"enabled": True, "max_rate": 100},
+        },
+    )
+    def test_if_throttled_response_retried(self, requests_mock):
+        test_url: str = "https://www.test/advert"
+        requests_mock.get(
+            test_url,
+            [
+                {"status_code": 429, "headers": {"Retry-After": "0.1"}},
+                {"status_code": 200, "content": b"advert"},
+            ],
+        )
+
+        sc: OtoDomScraper = OtoDomScraper()
+        result: bytes = sc.get_estate_page_source(estate_url=test_url)
+
+        assert result == b"advert"
+        assert requests_mock.call_count == 2
+        assert sc.metrics.counters["fetch_retries"] == 1
+        assert sc.metrics.counters["throttle_backoffs"] == 1
@@ -0,0 +1,143 @@
+import asyncio
+from typing import Any, Dict, List
+from unittest.mock import patch
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from benchmarks.mock_server import MockOtodomServer
+from data_types.estate import Estate
+from scraper.async_otodom_scraper import AsyncOtoDomScraper
+from scraper.otodom_scraper import OtoDomScraper
+
+ESTATE_PAGE: str = (
+    '<script id="__NEXT_DATA__">{"props": {"pageProps": {"ad": '
+    '{"description": "test_description", "target": {"City": "gdansk"}, '
+    '"characteristics": [{"key": "price", "value": "PRICE zł"}, {"key": "m", "value": "10 m²"}]}}}}'
+    "</script>"
+)
+
+PARAMS = {
+    "agent": "test_header",
+    "verbose_logging": False,
+    "requests_per_second": 0,
+    "max_in_flight": 2,
+}
+
+
+async def estate_handler(request: web.Request) -> web.Response:
+    slug: str = request.match_info["slug"]
+    if slug == "broken":
+        return web.Response(text="<p>no_data</p>", content_type="text/html")
+
+    return web.Response(
+        text=ESTATE_PAGE.replace("PRICE", slug), content_type="text/html"
+    )
+
+
+class TestAsyncScraper:
+    @pytest.fixture()
+    def scraper(self):
+        yield AsyncOtoDomScraper
+
+    @patch(
+        "scraper.async_otodom_scraper.AsyncOtoDomScraper.PARAMS", PARAMS
+    )
+    def test_if_page_fetched_with_custom_user_agent(self, scraper):
+        async def run() -> bytes:
+            async def handler(request: web.Request) -> web.Response:
+                return web.Response(text=request.headers["User-agent"])
+
+            app: web.Application = web.Application()
+            app.router.add_get("/", handler)
+
+            async with TestServer(app) as server, scraper() as sc:
+                return await sc.fetch(url=str(server.make_url("/")))
+
+        assert b"test_header" == asyncio.run(run())
+
+    @patch(
+        "scraper.async_otodom_scraper.AsyncOtoDomScraper.PARAMS", PARAMS
+    )
+    @patch(
+        "scraper.async_otodom_scraper.AsyncOtoDomScraper.get_estate_links_from_listing"
+    )
+    def test_if_estates_parsed_in_listing_order(self, mock_links, scraper):
+        async def run() -> List[Estate]:
+            app: web.Application = web.Application()
+            app.router.add_get("/{slug}", estate_handler)
+
+            async with TestServer(app) as server, scraper() as sc:
+                mock_links.return_value = [
+                    str(server.make_url(f"/{slug}"))
+                    for slug in ["1", "broken", "2", "3"]
+                ]
+                return await sc.parse_page(listing_soup="test")
+
+        result: List[Estate] = asyncio.run(run())
+
+        # Broken advert skipped, others in listing order
+        assert [estate.details.price for estate in result] == ["1", "2", "3"]
+        assert result[0].details.location == "gdansk"
+
+    def test_if_searches_crawled_with_many_requests_in_flight(self, tmp_path):
+        with MockOtodomServer(pages=3, latency=0.05) as server:
+            params: Dict[str, Any] = {
+                **OtoDomScraper.PARAMS,
+                "search_base_url": server.search_base_url,
+                "result_base_url": server.result_base_url,
+                "page_limit": 0,
+                "prefetch_pages": 2,
+                "max_in_flight": 64,
+                "requests_per_second": 0,
+                "verbose_logging": False,
+                "incremental": False,
+                "throttle": {"enabled": False},
+                "dead_letter_file": None,
+                # Overlapping searches - mock server finds the same adverts
+                "searches": [
+                    {"name": "a", "district": "a"},
+                    {"name": "b", "district": "b"},
+                ],
+            }
+
+            async def run() -> List[Estate]:
+                async with AsyncOtoDomScraper(params=params) as sc:
+                    return [estate async for estate in sc.iter_site()]
+
+            estates: List[Estate] = asyncio.run(run())
+
+            # Every advert fetched once, listing pages walked by both searches
+            assert len({estate.url for estate in estates}) == len(estates) == 72
+            assert server.requests_served == 72 + 2 * 6
+            # Adverts of several listing pages and searches fetched at once
+            assert server.peak_in_flight > 24
+
+        assert all(set(estate.profiles) <= {"a", "b"} for estate in estates)
+        assert all(estate.profiles for estate in estates)
+
+    def test_if_request_timeout_retried_as_network_error(self, scraper):
+        calls: List[int] = []
+
+        async def run() -> None:
+            async def handler(request: web.Request) -> web.Response:
+                calls.append(1)
+                await asyncio.sleep(1)
+                return web.Response(text="late")
+
+            app: web.Application = web.Application()
+            app.router.add_get("/", handler)
+
+            async with TestServer(app) as server, scraper(
+                params={
+                    **PARAMS,
+                    "request_timeout": 0.05,
+                    "retry_policy": {"network": {"attempts": 2}},
+                }
+            ) as sc:
+                await sc.fetch(url=str(server.make_url("/")))
+
+        with pytest.raises(asyncio.TimeoutError):
+            asyncio.run(run())
+        assert len(calls) == 2
@@ -0,0 +1,61 @@
+import argparse
+
+from benchmarks import bench_connections, bench_crawl, bench_import
+from benchmarks.mock_server import MockOtodomServer
+
+
+class TestBenchmarks:
+    def test_if_mock_server_ends_listing_after_pages(self):
+        with MockOtodomServer(pages=1) as server:
+            assert b'"slug": "' in server.listing_page(page=1)
+            assert b'"items": []' in server.listing_page(page=2)
+
+    def test_if_crawl_benchmark_reports_metrics(self):
+        results = bench_crawl.run(
+            args=argparse.Namespace(
+                pages=1,
+                workers=4,
+                parse_processes=0,
+                prefetch=1,
+                latency=0.0,
+                jitter=0.0,
+                error_rate=0.25,
+                throttle=True,
+                listing_only=False,
+                output=None,
+            )
+        )
+
+        # Injected 503s are retried
+        assert results["adverts"] == 24
+        assert results["requests"] == 1 + 24 + results["errors_injected"]
+        assert results["adverts_per_second"] > 0
+        assert results["advert_latency_p95"] >= results["advert_latency_p50"]
+        assert {"fetch", "parse", "validate"} <= set(results["cpu_seconds"])
+
+    def test_if_keep_alive_pool_reuses_connections(self):
+        results = bench_connections.run(
+            args=argparse.Namespace(pages=1, workers=4, latency=0.0)
+        )
+
+        per_request = results["per_request_session"]
+        keep_alive = results["keep_alive_pool"]
+        assert per_request["adverts"] == keep_alive["adverts"] == 24
+        assert per_request["connections_opened"] == per_request["requests"]
+        # One connection per worker and listing producer at most
+        assert keep_alive["connections_opened"] <= 4 + 1
+        assert results["handshakes_saved"] > 0
+
+    def test_if_import_benchmark_reports_no_lazy_modules(self):
+        results = bench_import.run(
+            args=argparse.Namespace(
+                modules=["scraper.otodom_scraper"],
+                repeat=1,
+                top=5,
+                output=None,
+            )
+        )
+
+        assert results["scraper.otodom_scraper"]["total_ms"] > 0
+        assert len(results["scraper.otodom_scraper"]["slowest_ms"]) == 5
+        assert not results["scraper.otodom_scraper"]["lazy_modules_loaded"]
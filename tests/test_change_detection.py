@@ -0,0 +1,125 @@
+import json
+from typing import Any, Dict, List
+
+import pytest
+
+from benchmarks.mock_server import MockOtodomServer
+from data_types.estate_delta import EstateDelta
+from scraper.otodom_scraper import OtoDomScraper
+from storage.fingerprints import FingerprintStore
+
+
+class TestChangeDetection:
+    def test_if_changed_fields_detected(self, tmp_path):
+        store: FingerprintStore = FingerprintStore(
+            store_path=str(tmp_path / "fingerprints.sqlite"),
+            search_key="search",
+        )
+
+        assert store.changed_fields(slug="a", fields={"price": "1"}) == [
+            "price"
+        ]
+        store.update_fields(slug="a", fields={"price": "1", "size": "2"})
+
+        assert store.changed_fields(
+            slug="a", fields={"price": "1", "size": "3"}
+        ) == ["size"]
+        assert not store.changed_fields(
+            slug="a", fields={"price": "1", "size": "2"}
+        )
+
+    def test_if_only_changed_adverts_written_as_deltas(self, tmp_path):
+        results_file: str = str(tmp_path / "results.jsonl")
+
+        with MockOtodomServer(pages=1) as server:
+            params: Dict[str, Any] = {
+                **OtoDomScraper.PARAMS,
+                "search_base_url": server.search_base_url,
+                "result_base_url": server.result_base_url,
+                "page_limit": 0,
+                "workers": 4,
+                "requests_per_second": 0,
+                "verbose_logging": False,
+                "incremental": False,
+                "http_cache": {"enabled": False},
+                "throttle": {"enabled": False},
+                "checkpoint_file": None,
+                "change_detection": True,
+                "fingerprint_file": str(tmp_path / "fingerprints.sqlite"),
+            }
+
+            def crawl() -> List[Dict[str, Any]]:
+                with OtoDomScraper(params=params) as sc:
+                    sc.save_data(temp_path=results_file, to_write=sc.iter_site())
+
+                with open(results_file, encoding="utf-8") as f:
+                    return [json.loads(line) for line in f]
+
+            # New adverts - all fields
+            records: List[Dict[str, Any]] = crawl()
+            assert len(records) == 24
+            assert records[0]["changed"] == [
+                "price",
+                "size",
+                "location",
+                "description",
+            ]
+
+            assert crawl() == []
+
+            server.estate_page = server.estate_page.replace(
+                "przestronne".encode("utf-8"), "jasne".encode("utf-8")
+            )
+            records = crawl()
+            assert len(records) == 24
+            assert {tuple(record["changed"]) for record in records} == {
+                ("description",)
+            }
+            assert "jasne" in records[0]["description"]
+
+    @pytest.mark.parametrize("prefetch_pages", [0, 2])
+    def test_if_walk_goes_past_page_of_unchanged_adverts(
+        self, tmp_path, prefetch_pages
+    ):
+        with MockOtodomServer(pages=2) as server:
+            params: Dict[str, Any] = {
+                **OtoDomScraper.PARAMS,
+                "search_base_url": server.search_base_url,
+                "result_base_url": server.result_base_url,
+                "page_limit": 1,
+                "workers": 1,
+                "prefetch_pages": prefetch_pages,
+                "requests_per_second": 0,
+                "verbose_logging": False,
+                "incremental": False,
+                "http_cache": {"enabled": False},
+                "throttle": {"enabled": False},
+                "checkpoint_file": None,
+                "change_detection": True,
+                "fingerprint_file": str(tmp_path / "fingerprints.sqlite"),
+            }
+
+            with OtoDomScraper(params=params) as sc:
+                assert len(list(sc.iter_site())) == 24
+
+            # Adverts of page 1 unchanged, the ones of page 2 new
+            with OtoDomScraper(params={**params, "page_limit": 0}) as sc:
+                estates: List[EstateDelta] = list(sc.iter_site())
+
+        assert len(estates) == 24
+        assert all(estate.url.endswith("-p2") for estate in estates)
+
+    def test_if_delta_written_in_record_shape(self):
+        sc: OtoDomScraper = OtoDomScraper(
+            params={**OtoDomScraper.PARAMS, "change_detection": False}
+        )
+        estate = sc.build_estate_record(
+            estate_url="https://www.otodom.pl/pl/oferta/a",
+            estate_details=["100 zł", "10 m²", "gdansk", "test"],
+        )
+        delta: EstateDelta = EstateDelta(
+            record=estate, changed=["price"], fingerprints={}
+        )
+
+        assert delta.dict() == {**estate.dict(), "changed": ["price"]}
+        assert str(delta) == f"{estate} changed=['price']"
@@ -0,0 +1,122 @@
+import json
+import os
+from typing import Any, Dict, Iterator, List
+
+import pytest
+
+from benchmarks.mock_server import MockOtodomServer
+from data_types.estate import Estate
+from scraper.otodom_scraper import OtoDomScraper
+from storage.checkpoint import CrawlCheckpoint
+from storage.writers import CsvWriter, JsonLinesWriter
+
+
+def interrupted(estates: Iterator[Estate], after: int) -> Iterator[Estate]:
+    for i, estate in enumerate(estates):
+        if i == after:
+            raise KeyboardInterrupt
+        yield estate
+
+
+class TestCheckpoint:
+    @pytest.fixture()
+    def estate(self):
+        yield Estate(
+            url="test_url",
+            details={
+                "price": "545000 zł",
+                "size": "52.7 m²",
+                "location": "gdansk",
+                "description": "test_description",
+            },
+        )
+
+    def test_if_records_past_offset_dropped_on_resume(self, estate, tmp_path):
+        results_file: str = str(tmp_path / "results.csv")
+        with CsvWriter(temp_path=results_file) as writer:
+            writer.write(estate)
+            offset: int = writer.offset()
+            writer.write(estate)
+
+        with CsvWriter(temp_path=results_file, resume_offset=offset) as writer:
+            writer.write(estate)
+
+        with open(results_file, encoding="utf-8") as f:
+            # Header and two records, header not repeated
+            assert len(f.readlines()) == 3
+
+    def test_if_state_saved_with_writer_offset(self, estate, tmp_path):
+        checkpoint_file: str = str(tmp_path / "checkpoint.json")
+        checkpoint: CrawlCheckpoint = CrawlCheckpoint(
+            checkpoint_path=checkpoint_file, search_key="search", every=2
+        )
+        checkpoint.writer = JsonLinesWriter(
+            temp_path=str(tmp_path / "results.jsonl")
+        )
+
+        checkpoint.start_page(page=3, slugs=["a", "b", "c"])
+        for slug in ["a", "b"]:
+            checkpoint.writer.write(estate)
+            checkpoint.finish(slug=slug)
+        checkpoint.writer.close()
+
+        resumed: CrawlCheckpoint = CrawlCheckpoint(
+            checkpoint_path=checkpoint_file, search_key="search"
+        )
+        assert resumed.load()
+        assert resumed.page == 3
+        assert resumed.pending == ["c"]
+        assert resumed.finished == {"a", "b"}
+        assert resumed.output_offset == checkpoint.output_offset > 0
+
+    def test_if_checkpoint_of_other_search_refused(self, tmp_path):
+        checkpoint_file: str = str(tmp_path / "checkpoint.json")
+        with open(checkpoint_file, "w", encoding="utf-8") as f:
+            json.dump({"search_key": "other"}, f)
+
+        with pytest.raises(ValueError):
+            CrawlCheckpoint(
+                checkpoint_path=checkpoint_file, search_key="search"
+            ).load()
+
+    def test_if_interrupted_crawl_resumed_without_duplicates(self, tmp_path):
+        results_file: str = str(tmp_path / "results.jsonl")
+        checkpoint_file: str = str(tmp_path / "checkpoint.json")
+
+        with MockOtodomServer(pages=2) as server:
+            params: Dict[str, Any] = {
+                **OtoDomScraper.PARAMS,
+                "search_base_url": server.search_base_url,
+                "result_base_url": server.result_base_url,
+                "page_limit": 0,
+                "workers": 1,
+                "prefetch_pages": 1,
+                "requests_per_second": 0,
+                "verbose_logging": False,
+                "incremental": False,
+                "http_cache": {"enabled": False},
+                "throttle": {"enabled": False},
+                "checkpoint_file": checkpoint_file,
+                # Saved on page 2 start (24 adverts) and at 30th advert
+                "checkpoint_every": 6,
+            }
+
+            sc: OtoDomScraper = OtoDomScraper(params=params)
+            with pytest.raises(KeyboardInterrupt):
+                sc.save_data(
+                    temp_path=results_file,
+                    to_write=interrupted(estates=sc.iter_site(), after=30),
+                )
+            requests_before_resume: int = server.requests_served
+
+            sc = OtoDomScraper(params=params, resume=True)
+            sc.save_data(temp_path=results_file, to_write=sc.iter_site())
+
+            # Pending 18 adverts of page 2 and empty page 3 only
+            assert server.requests_served - requests_before_resume == 19
+
+        with open(results_file, encoding="utf-8") as f:
+            urls: List[str] = [json.loads(line)["url"] for line in f]
+
+        assert len(urls) == len(set(urls)) == 48
+        assert not os.path.exists(checkpoint_file)
@@ -2,7 +2,8 @@ from unittest.mock import patch
 
 import pytest
 
-from config.config_handler import ParametersHandler
+from config.config_handler import ParametersHandler, load_params
+from scraper.otodom_scraper import OtoDomScraper
 
 
 class TestConfig:
@@ -20,3 +21,10 @@ class TestConfig:
         mock_safe_load.return_value: str = "value"
 
         assert "value" in ParametersHandler().get_params()
+
+    def test_if_params_loaded_once_and_overridden_by_instance(self):
+        params = {**load_params(), "workers": 1}
+
+        assert load_params() is load_params()
+        assert OtoDomScraper.PARAMS is load_params()
+        assert OtoDomScraper(params=params).PARAMS is params
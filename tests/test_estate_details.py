@@ -3,7 +3,9 @@ from typing import Dict
 import pytest
 from pydantic.error_wrappers import ValidationError
 
+from data_types.description_cleaner import DescriptionCleaner
 from data_types.estate_details import EstateDetails
+from tests.fixtures import legacy_clean, load_corpus
 
 
 class TestEstateDetails:
@@ -92,3 +94,23 @@ class TestEstateDetails:
 
         assert "\u003cbr\u003e\u003cbr\u003e" not in details.description
         assert "test_details" in details.description
+
+    def test_if_description_cleaned_same_as_legacy_validator(self):
+        for description in load_corpus():
+            details = EstateDetails(
+                price="100",
+                size="test",
+                location="test",
+                description=description,
+            )
+
+            assert details.description == legacy_clean(description)
+
+    def test_if_boilerplate_phrases_configurable(self):
+        cleaner: DescriptionCleaner = DescriptionCleaner(
+            phrases=["Zapraszam!"]
+        )
+
+        assert cleaner.clean(description="<p>Balkon.\nZapraszam!</p>") == (
+            "Balkon. "
+        )
@@ -0,0 +1,80 @@
+from typing import List
+from unittest.mock import patch
+
+import pytest
+
+from data_types.estate import Estate
+from data_types.estate_record import EstateRecord
+from scraper.otodom_scraper import OtoDomScraper
+from tests.fixtures import load_corpus
+
+
+class TestEstateRecord:
+    @pytest.fixture()
+    def details(self):
+        yield ["545 000 zł", "52,7 m²", "gdansk", "<p>test\ndescription</p>"]
+
+    def test_if_record_same_as_model(self, details):
+        record: EstateRecord = EstateRecord.from_details(
+            url="test_url", estate_details=details
+        )
+        model: Estate = Estate(
+            url="test_url",
+            details=OtoDomScraper.build_estate_details(estate_details=details),
+        )
+
+        assert record.dict() == model.dict()
+        assert str(record) == str(model)
+        assert record.to_model() == model
+        # Single-search output has no profiles field
+        assert "profiles" not in record.dict()
+        assert "profiles" not in str(model)
+
+        record.profiles = model.profiles = ["a", "b"]
+        assert record.dict() == model.dict()
+        assert record.dict()["profiles"] == ["a", "b"]
+        assert str(record) == str(model)
+
+    def test_if_description_cleaned_same_as_model(self):
+        for description in load_corpus():
+            details: List[str] = ["1 zł", "1 m²", "test", description]
+            record: EstateRecord = EstateRecord.from_details(
+                url="test_url", estate_details=details
+            )
+
+            assert record.description == (
+                OtoDomScraper.build_estate_details(
+                    estate_details=details
+                ).description
+            )
+
+    def test_if_exception_when_no_price_value(self, details):
+        details[0] = None
+        with pytest.raises(
+            AttributeError, match="price value not provided or not string"
+        ):
+            EstateRecord.from_details(url="test_url", estate_details=details)
+
+    def test_if_exception_when_none_in_location(self, details):
+        details[2] = None
+        with pytest.raises(ValueError):
+            EstateRecord.from_details(url="test_url", estate_details=details)
+
+    def test_if_exception_when_no_description_value(self, details):
+        details[3] = None
+        with pytest.raises(AttributeError):
+            EstateRecord.from_details(url="test_url", estate_details=details)
+
+    @patch.dict(
+        "scraper.otodom_scraper.OtoDomScraper.PARAMS", {"fast_records": True}
+    )
+    @patch("scraper.otodom_scraper.OtoDomScraper.get_estate_page_source")
+    @patch("scraper.otodom_scraper.OtoDomScraper.get_estate_details")
+    def test_if_fast_record_parsed(self, get_details, get_source, details):
+        get_details.return_value = details
+
+        record = OtoDomScraper().parse_estate_record(estate_url="test_url")
+
+        assert isinstance(record, EstateRecord)
+        assert record.price == "545 000"
+        assert record.size == "52,7"
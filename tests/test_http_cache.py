@@ -0,0 +1,139 @@
+from typing import Any, List
+from unittest.mock import patch
+
+import pytest
+from requests import PreparedRequest, Response
+from requests.sessions import Session
+
+from benchmarks.mock_server import MockOtodomServer
+from scraper.http_cache import CachingHTTPAdapter
+from scraper.otodom_scraper import OtoDomScraper
+
+
+def network_response(request: PreparedRequest, status: int, body: bytes) -> Response:
+    response: Response = Response()
+    response.status_code = status
+    response.url = request.url
+    response.request = request
+    response.headers["ETag"] = '"v1"'
+    response._content = body
+
+    return response
+
+
+class TestHttpCache:
+    @pytest.fixture()
+    def session(self, tmp_path):
+        def make(**kwargs: Any) -> Session:
+            session: Session = Session()
+            session.mount(
+                "https://",
+                CachingHTTPAdapter(
+                    cache_dir=str(tmp_path / "cache"),
+                    ttl_by_prefix=kwargs.get(
+                        "ttl_by_prefix",
+                        {"https://www.test/listing": 0, "https://www.test/": 60},
+                    ),
+                    max_size_bytes=kwargs.get("max_size_bytes", 1024),
+                ),
+            )
+            return session
+
+        yield make
+
+    @patch("requests.adapters.HTTPAdapter.send")
+    def test_if_fresh_entry_served_from_cache(self, mock_send, session):
+        mock_send.side_effect = lambda request, **kwargs: network_response(
+            request, 200, b"advert"
+        )
+        s: Session = session()
+
+        s.get("https://www.test/advert")
+        cached: Response = s.get("https://www.test/advert")
+
+        assert cached.content == b"advert"
+        assert mock_send.call_count == 1
+        assert s.get_adapter("https://").stats()["hits"] == 1
+
+    @patch("requests.adapters.HTTPAdapter.send")
+    def test_if_stale_entry_revalidated_with_etag(self, mock_send, session):
+        sent: List[PreparedRequest] = []
+
+        def send(request: PreparedRequest, **kwargs: Any) -> Response:
+            sent.append(request)
+            status: int = 304 if len(sent) > 1 else 200
+            return network_response(request, status, b"listing")
+
+        mock_send.side_effect = send
+        s: Session = session()
+
+        s.get("https://www.test/listing")
+        revalidated: Response = s.get("https://www.test/listing")
+
+        assert sent[1].headers["If-None-Match"] == '"v1"'
+        assert revalidated.status_code == 200
+        assert revalidated.content == b"listing"
+        assert s.get_adapter("https://").stats()["revalidated"] == 1
+
+    @patch("requests.adapters.HTTPAdapter.send")
+    def test_if_least_recently_used_evicted(self, mock_send, session):
+        mock_send.side_effect = lambda request, **kwargs: network_response(
+            request, 200, b"x" * 600
+        )
+        s: Session = session(max_size_bytes=1000)
+
+        s.get("https://www.test/advert-1")
+        s.get("https://www.test/advert-2")
+        s.get("https://www.test/advert-1")
+
+        assert mock_send.call_count == 3
+        assert s.get_adapter("https://").stats()["entries"] == 1
+
+    @patch("requests.adapters.HTTPAdapter.send")
+    def test_if_error_response_not_cached(self, mock_send, session):
+        mock_send.side_effect = lambda request, **kwargs: network_response(
+            request, 500, b"error"
+        )
+        s: Session = session()
+
+        s.get("https://www.test/advert")
+        s.get("https://www.test/advert")
+
+        assert s.get_adapter("https://").stats()["misses"] == 2
+        assert s.get_adapter("https://").stats()["entries"] == 0
+
+    def test_if_fresh_hit_not_paced_nor_fed_to_throttle(self, tmp_path):
+        with MockOtodomServer(pages=1) as server:
+            sc: OtoDomScraper = OtoDomScraper(
+                params={
+                    **OtoDomScraper.PARAMS,
+                    "search_base_url": server.search_base_url,
+                    "result_base_url": server.result_base_url,
+                    "requests_per_second": 0,
+                    "checkpoint_file": None,
+                    "dead_letter_file": None,
+                    "http_cache": {
+                        "enabled": True,
+                        "directory": str(tmp_path / "cache"),
+                        "max_size_mb": 1,
+                        "ttl": {"listing": 0, "advert": 60},
+                    },
+                }
+            )
+            url: str = server.result_base_url + "advert"
+            fetched: bytes = sc.fetch(url=url)
+
+            with patch.object(
+                sc.rate_limiter, "acquire"
+            ) as mock_acquire, patch.object(
+                sc.rate_limiter, "release"
+            ) as mock_release:
+                cached: bytes = sc.fetch(url=url)
+            hits: int = sc.http_cache.stats()["hits"]
+            sc.close()
+
+        assert cached == fetched
+        assert server.requests_served == 1
+        assert hits == 1
+        mock_acquire.assert_not_called()
+        mock_release.assert_not_called()
@@ -0,0 +1,121 @@
+from typing import Any, Dict, List
+
+import pytest
+
+from benchmarks.mock_server import MockOtodomServer
+from data_types.estate import Estate
+from data_types.estate_full_details import EstateFullDetails
+from scraper.async_otodom_scraper import AsyncOtoDomScraper
+from scraper.multi_search import MultiSearchScraper
+from scraper.otodom_scraper import OtoDomScraper
+
+
+def crawl_params(
+    server: MockOtodomServer, enrich: bool, fingerprint_file: str
+) -> Dict[str, Any]:
+    return {
+        **OtoDomScraper.PARAMS,
+        "search_base_url": server.search_base_url,
+        "result_base_url": server.result_base_url,
+        "page_limit": 0,
+        "workers": 4,
+        "requests_per_second": 0,
+        "verbose_logging": False,
+        "incremental": False,
+        "http_cache": {"enabled": False},
+        "throttle": {"enabled": False},
+        "checkpoint_file": None,
+        "full_details": True,
+        "listing_only": {"enabled": True, "enrich": enrich},
+        "fingerprint_file": fingerprint_file,
+    }
+
+
+class TestListingOnly:
+    def test_if_estates_built_from_listing_pages_only(self, tmp_path):
+        with MockOtodomServer(pages=2) as server:
+            sc: OtoDomScraper = OtoDomScraper(
+                params=crawl_params(
+                    server=server,
+                    enrich=False,
+                    fingerprint_file=str(tmp_path / "fingerprints.sqlite"),
+                )
+            )
+            estates: List[Estate] = sc.parse_site()
+
+            # Two listing pages and empty third one
+            assert server.requests_served == 3
+
+        assert len({estate.url for estate in estates}) == 48
+        assert estates[0].details.price == "631000"
+        assert estates[0].details.size == "78.44"
+        assert estates[0].details.location == "Gdańsk"
+        assert sc.metrics.summary()["counters"]["listing_records"] == 48
+
+    def test_if_only_new_or_changed_adverts_enriched(self, tmp_path):
+        fingerprint_file: str = str(tmp_path / "fingerprints.sqlite")
+
+        with MockOtodomServer(pages=2) as server:
+            params: Dict[str, Any] = crawl_params(
+                server=server, enrich=True, fingerprint_file=fingerprint_file
+            )
+
+            estates: List[Estate] = OtoDomScraper(params=params).parse_site()
+            # All adverts are new
+            assert server.requests_served == 3 + 48
+            assert all(
+                isinstance(estate.details, EstateFullDetails)
+                for estate in estates
+            )
+
+            OtoDomScraper(params=params).parse_site()
+            assert server.requests_served == 3 + 48 + 3
+
+            server.listing_data["props"]["pageProps"]["data"]["searchAds"][
+                "items"
+            ][0]["totalPrice"]["value"] = 599000
+            estates = OtoDomScraper(params=params).parse_site()
+            # First advert of both pages changed
+            assert server.requests_served == 3 + 48 + 3 + 3 + 2
+
+        assert len(estates) == 48
+        assert [
+            isinstance(estate.details, EstateFullDetails) for estate in estates
+        ].count(True) == 2
+
+    def test_if_adverts_not_fetched_without_enrichment(self, tmp_path):
+        with MockOtodomServer(pages=2) as server:
+            sc: OtoDomScraper = OtoDomScraper(
+                params={
+                    **crawl_params(
+                        server=server,
+                        enrich=False,
+                        fingerprint_file=str(tmp_path / "fingerprints.sqlite"),
+                    ),
+                    "change_detection": True,
+                }
+            )
+            estates: List[Estate] = sc.parse_site()
+
+            assert server.requests_served == 3
+
+        assert len(estates) == 48
+
+    @pytest.mark.parametrize(
+        "scraper_class", [MultiSearchScraper, AsyncOtoDomScraper]
+    )
+    def test_if_listing_only_rejected_by_other_backends(
+        self, tmp_path, scraper_class
+    ):
+        with MockOtodomServer() as server:
+            params: Dict[str, Any] = {
+                **crawl_params(
+                    server=server,
+                    enrich=False,
+                    fingerprint_file=str(tmp_path / "fingerprints.sqlite"),
+                ),
+                "searches": [{"name": "a"}, {"name": "b"}],
+            }
+
+            with pytest.raises(ValueError, match="listing_only"):
+                scraper_class(params=params)
@@ -0,0 +1,72 @@
+import json
+from types import SimpleNamespace
+
+from scraper.metrics import (
+    CountingRetry,
+    JsonSummaryExporter,
+    Metrics,
+    PrometheusFileExporter,
+    count_retry,
+)
+
+
+class TestMetrics:
+    def test_if_stage_latency_observed(self):
+        metrics: Metrics = Metrics()
+
+        with metrics.timer("advert_fetch"):
+            pass
+        metrics.observe("advert_fetch", 0.2)
+
+        summary = metrics.summary()["stages"]["advert_fetch"]
+        assert summary["count"] == 2
+        assert summary["max"] == 0.2
+
+    def test_if_prometheus_text_format_written(self, tmp_path):
+        metrics_file: str = str(tmp_path / "metrics.prom")
+        metrics: Metrics = Metrics(
+            exporters=[PrometheusFileExporter(file_path=metrics_file)]
+        )
+        metrics.inc("bytes_downloaded", 100)
+        metrics.observe("listing_fetch", 0.07)
+        metrics.observe("listing_fetch", 20)
+
+        metrics.export()
+
+        with open(metrics_file, encoding="utf-8") as f:
+            content: str = f.read()
+        assert "otodom_bytes_downloaded_total 100" in content
+        assert 'otodom_listing_fetch_seconds_bucket{le="0.05"} 0' in content
+        assert 'otodom_listing_fetch_seconds_bucket{le="0.1"} 1' in content
+        assert 'otodom_listing_fetch_seconds_bucket{le="+Inf"} 2' in content
+        assert "otodom_listing_fetch_seconds_count 2" in content
+
+    def test_if_json_summary_written(self, tmp_path):
+        summary_file: str = str(tmp_path / "metrics.json")
+        metrics: Metrics = Metrics(
+            exporters=[JsonSummaryExporter(file_path=summary_file)]
+        )
+        metrics.inc("adverts_fetched")
+
+        metrics.export()
+
+        with open(summary_file, encoding="utf-8") as f:
+            assert json.load(f)["counters"] == {"adverts_fetched": 1}
+
+    def test_if_retries_counted(self):
+        metrics: Metrics = Metrics()
+        retry: CountingRetry = CountingRetry(connect=3)
+        retry.metrics = metrics
+
+        retry.new(connect=2).increment(method="GET", url="/")
+        count_retry(
+            SimpleNamespace(
+                args=(SimpleNamespace(metrics=metrics),),
+                fn=SimpleNamespace(__name__="get_estate_page_source"),
+            )
+        )
+
+        assert metrics.counters == {
+            "urllib3_retries": 1,
+            "get_estate_page_source_retries": 1,
+        }
@@ -0,0 +1,30 @@
+import pytest
+from bs4 import BeautifulSoup
+
+from scraper.next_data import extract_next_data, next_data_from_soup
+from tests.fixtures import read_fixture
+
+
+class TestNextData:
+    @pytest.mark.parametrize(
+        "fixture", ["listing_page.html", "estate_page.html"]
+    )
+    def test_if_fast_path_matches_bs4(self, fixture):
+        page: bytes = read_fixture(fixture)
+        soup: BeautifulSoup = BeautifulSoup(page, "html.parser")
+
+        assert extract_next_data(page_source=page) == next_data_from_soup(
+            soup=soup
+        )
+
+    def test_if_bs4_fallback_used_for_unexpected_markup(self):
+        page: bytes = (
+            b"<script id='__NEXT_DATA__' type='application/json'>"
+            b'{"a": 1}</script>'
+        )
+
+        assert extract_next_data(page_source=page) == '{"a": 1}'
+
+    def test_if_exception_when_no_next_data(self):
+        with pytest.raises(AttributeError):
+            extract_next_data(page_source=b"<p>test_html_markup</p>")
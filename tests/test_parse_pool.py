@@ -0,0 +1,104 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+
+import pytest
+
+from benchmarks.mock_server import MockOtodomServer
+from data_types.estate import Estate
+from scraper.otodom_scraper import OtoDomScraper
+from scraper.parse_pool import bounded_map
+
+
+class TestParsePool:
+    def test_if_calls_in_flight_bounded_by_window(self):
+        submitted: List[int] = []
+        lock: threading.Lock = threading.Lock()
+
+        def record(item: int) -> int:
+            with lock:
+                submitted.append(item)
+            return item * 2
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = bounded_map(
+                executor=executor,
+                function=record,
+                items=((i,) for i in range(10)),
+                window=3,
+            )
+            (first,), future = next(results)
+
+            # Nothing beyond the window is submitted before consumer pulls more
+            assert first == 0 and future.result() == 0
+            assert len(submitted) == 3
+            assert [f.result() for _, f in results] == [
+                i * 2 for i in range(1, 10)
+            ]
+
+    def test_if_adverts_parsed_on_processes_in_listing_order(self):
+        with MockOtodomServer(pages=1, error_rate=0.0) as server:
+            params: Dict[str, Any] = {
+                **OtoDomScraper.PARAMS,
+                "search_base_url": server.search_base_url,
+                "result_base_url": server.result_base_url,
+                "page_limit": 1,
+                "workers": 4,
+                "parse_processes": 2,
+                "parse_queue_size": 4,
+                "requests_per_second": 0,
+                "verbose_logging": False,
+                "incremental": False,
+                "http_cache": {"enabled": False},
+                "throttle": {"enabled": False},
+                "checkpoint_file": None,
+                "dead_letter_file": None,
+            }
+            sc: OtoDomScraper = OtoDomScraper(params=params)
+            estate_links: List[str] = sc.get_estate_links_from_listing(
+                listing_soup=server.listing_page(page=1)
+            )
+            # Advert without __NEXT_DATA__ should be skipped
+            estate_links[3] = server.url + "/missing"
+
+            result: List[Estate] = sc.parse_estates(estate_links=estate_links)
+            sc.close_parse_pool()
+
+        assert [estate.url for estate in result] == (
+            estate_links[:3] + estate_links[4:]
+        )
+        assert sc.metrics.counters["adverts_failed"] == 1
+        assert sc.metrics.summary()["stages"]["validation"]["count"] == 23
+
+    @pytest.mark.parametrize("parse_processes", [0, 2])
+    def test_if_description_cleaned_with_phrases_of_params(
+        self, parse_processes
+    ):
+        with MockOtodomServer(pages=1) as server:
+            params: Dict[str, Any] = {
+                **OtoDomScraper.PARAMS,
+                "search_base_url": server.search_base_url,
+                "result_base_url": server.result_base_url,
+                "workers": 2,
+                "parse_processes": parse_processes,
+                "requests_per_second": 0,
+                "verbose_logging": False,
+                "incremental": False,
+                "http_cache": {"enabled": False},
+                "throttle": {"enabled": False},
+                "checkpoint_file": None,
+                "dead_letter_file": None,
+                "description_boilerplate": ["Oferujemy na sprzedaż "],
+            }
+            sc: OtoDomScraper = OtoDomScraper(params=params)
+            estate_links: List[str] = sc.get_estate_links_from_listing(
+                listing_soup=server.listing_page(page=1)
+            )[:2]
+
+            result: List[Estate] = sc.parse_estates(estate_links=estate_links)
+            sc.close()
+
+        assert [
+            estate.details.description.startswith("przestronne")
+            for estate in result
+        ] == [True, True]
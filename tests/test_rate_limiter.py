@@ -0,0 +1,26 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from scraper.rate_limiter import RateLimiter
+
+
+class TestRateLimiter:
+    def test_if_requests_spread_to_desired_rate(self):
+        limiter: RateLimiter = RateLimiter(requests_per_second=50)
+        start: float = time.monotonic()
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            for _ in range(6):
+                executor.submit(limiter.acquire)
+
+        # First request goes instantly, next five wait 0.02s each
+        assert time.monotonic() - start >= 0.1
+
+    def test_if_no_limit_when_rate_not_set(self):
+        limiter: RateLimiter = RateLimiter(requests_per_second=0)
+        start: float = time.monotonic()
+
+        for _ in range(100):
+            limiter.acquire()
+
+        assert time.monotonic() - start < 0.1
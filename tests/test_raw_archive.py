@@ -0,0 +1,121 @@
+import json
+import os
+from typing import Any, Dict, List, Tuple
+
+import pytest
+
+from benchmarks.mock_server import MockOtodomServer
+from main import save_reparse
+from scraper.otodom_scraper import OtoDomScraper
+from scraper.reparse import iter_reparsed, reparse_tasks
+from storage.raw_archive import BODY, NEXT_DATA, ArchiveEntry, RawArchive
+
+
+class TestRawArchive:
+    def test_if_pages_read_back_by_slug(self, tmp_path):
+        archive: RawArchive = RawArchive(
+            directory=str(tmp_path / "archive"), segment_size=10
+        )
+
+        assert archive.put(
+            slug="a", url="u/a", payload=b"{}" * 50, content=NEXT_DATA
+        )
+        assert archive.put(slug="b", url="u/b", payload=b"<p>b</p>", content=BODY)
+        # Unchanged page is not appended again
+        assert not archive.put(
+            slug="a", url="u/a", payload=b"{}" * 50, content=NEXT_DATA
+        )
+        assert archive.put(slug="a", url="u/a", payload=b"{1}", content=NEXT_DATA)
+
+        assert archive.get(slug="a") == (NEXT_DATA, b"{1}")
+        assert archive.get(slug="b") == (BODY, b"<p>b</p>")
+        assert archive.get(slug="c") is None
+        # Every page fills its segment up, next one goes to the new segment.
+        # Old version of a is left in the first one, index points at the new one.
+        assert [
+            [slug for slug, *_ in archive.entries(segment)]
+            for segment in archive.segments()
+        ] == [[], ["b"], ["a"]]
+        archive.close()
+
+        reopened: RawArchive = RawArchive(directory=str(tmp_path / "archive"))
+        assert reopened.get(slug="b") == (BODY, b"<p>b</p>")
+        reopened.close()
+
+    def test_if_segment_split_into_chunks_of_entries(self, tmp_path):
+        archive: RawArchive = RawArchive(directory=str(tmp_path / "archive"))
+        for slug in "abcde":
+            archive.put(slug=slug, url=f"u/{slug}", payload=b"{}", content=NEXT_DATA)
+
+        tasks: List[Tuple[str, List[ArchiveEntry]]] = reparse_tasks(
+            archive=archive, chunk_size=2
+        )
+        archive.close()
+
+        # Single segment is parsed by several processes
+        assert len({path for path, _ in tasks}) == 1
+        assert [[slug for slug, *_ in entries] for _, entries in tasks] == [
+            ["a", "b"],
+            ["c", "d"],
+            ["e"],
+        ]
+
+    @pytest.mark.parametrize("content", [NEXT_DATA, BODY])
+    def test_if_records_rebuilt_from_archive_without_network(
+        self, tmp_path, content
+    ):
+        with MockOtodomServer(pages=2) as server:
+            params: Dict[str, Any] = {
+                **OtoDomScraper.PARAMS,
+                "search_base_url": server.search_base_url,
+                "result_base_url": server.result_base_url,
+                "page_limit": 2,
+                "workers": 4,
+                "requests_per_second": 0,
+                "verbose_logging": False,
+                "incremental": False,
+                "http_cache": {"enabled": False},
+                "throttle": {"enabled": False},
+                "checkpoint_file": None,
+                "raw_archive": {
+                    "enabled": True,
+                    "directory": str(tmp_path / "archive"),
+                    "content": content,
+                    # Segment per few adverts, parsed in parallel
+                    "segment_size_mb": 1 / 1024,
+                    "reparse_chunk_size": 5,
+                },
+            }
+            with OtoDomScraper(params=params) as sc:
+                crawled: List[Dict[str, Any]] = [
+                    estate.dict() for estate in sc.iter_site()
+                ]
+                # Mock server serves the same advert page under every slug
+                assert sc.metrics.counters["pages_archived"] == 48
+
+            requests_served: int = server.requests_served
+            reparsed: List[Dict[str, Any]] = [
+                estate.dict() for estate in iter_reparsed(params, processes=2)
+            ]
+            assert server.requests_served == requests_served
+
+        assert len(os.listdir(tmp_path / "archive")) > 2
+        assert sorted(reparsed, key=lambda e: e["url"]) == sorted(
+            crawled, key=lambda e: e["url"]
+        )
+
+        # Checkpoint of interrupted crawl is kept
+        checkpoint_file: str = str(tmp_path / "checkpoint.json")
+        with open(checkpoint_file, "w", encoding="utf-8") as f:
+            f.write("{}")
+        save_reparse(
+            params={
+                **params,
+                "results_file": str(tmp_path / "results.jsonl"),
+                "checkpoint_file": checkpoint_file,
+            }
+        )
+
+        assert os.path.exists(checkpoint_file)
+        with open(tmp_path / "results_reparse.jsonl", encoding="utf-8") as f:
+            assert len([json.loads(line) for line in f]) == len(crawled)
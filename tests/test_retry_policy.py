@@ -0,0 +1,306 @@
+import json
+import os
+import time
+from typing import Any, Dict, Iterator, List
+
+import pytest
+from requests.exceptions import ConnectionError
+
+from benchmarks.mock_server import MockOtodomServer
+from data_types.estate import Estate
+from main import save_replay
+from scraper.adaptive_throttle import ResponseStatusError, ThrottledResponseError
+from scraper.circuit_breaker import CircuitBreaker
+from scraper.multi_search import MultiSearchScraper
+from scraper.next_data import MissingNextDataError
+from scraper.otodom_scraper import OtoDomScraper
+from scraper.retry_policy import (
+    CLIENT_ERROR,
+    NETWORK,
+    PARSE,
+    SERVER_ERROR,
+    THROTTLED,
+    RetryPolicy,
+)
+from storage.dead_letter import DeadLetterFile
+
+ESTATE_PAGE: str = (
+    '<script id="__NEXT_DATA__">{"props": {"pageProps": {"ad": '
+    '{"description": "test_description", "target": {"City": "gdansk"}, '
+    '"characteristics": [{"key": "price", "value": "100 zł"}, '
+    '{"key": "m", "value": "10 m²"}]}}}}'
+    "</script>"
+)
+
+
+@pytest.fixture
+def scraper(tmp_path):
+    def build(**params: Any) -> OtoDomScraper:
+        return OtoDomScraper(
+            params={
+                "agent": "test_header",
+                "retry": {"connect": None, "read": None, "redirect": None},
+                "verbose_logging": False,
+                # Retried at once
+                "throttle": {"enabled": True, "max_rate": 1000},
+                "dead_letter_file": str(tmp_path / "dead_letters.jsonl"),
+                **params,
+            }
+        )
+
+    return build
+
+
+class TestRetryPolicy:
+    def test_if_errors_classified(self):
+        policy: RetryPolicy = RetryPolicy()
+
+        assert policy.classify(ConnectionError()) == NETWORK
+        assert policy.classify(TimeoutError()) == NETWORK
+        assert policy.classify(ResponseStatusError("a", 404)) == CLIENT_ERROR
+        assert policy.classify(ThrottledResponseError("a", 429)) == THROTTLED
+        assert policy.classify(ThrottledResponseError("a", 503)) == SERVER_ERROR
+        assert policy.classify(MissingNextDataError()) == PARSE
+        # Invalid advert is not fixed by fetching it again
+        assert policy.classify(AttributeError("price")) is None
+
+    def test_if_budgets_bounded_by_attempts_and_time(self):
+        policy: RetryPolicy = RetryPolicy.from_params(
+            settings={"network": {"attempts": 3, "max_seconds": 10}}
+        )
+
+        assert policy.should_retry(ConnectionError(), attempt=2, elapsed=1)
+        assert not policy.should_retry(ConnectionError(), attempt=3, elapsed=1)
+        assert not policy.should_retry(ConnectionError(), attempt=1, elapsed=10)
+        # Defaults of other classes kept
+        assert not policy.should_retry(
+            ResponseStatusError("a", 404), attempt=1, elapsed=0
+        )
+
+    def test_if_dead_advert_not_retried_forever(self, requests_mock, scraper):
+        test_url: str = "https://www.test/advert"
+        requests_mock.get(test_url, status_code=503)
+
+        sc: OtoDomScraper = scraper(
+            retry_policy={"server_error": {"attempts": 3}}
+        )
+
+        with pytest.raises(ThrottledResponseError):
+            sc.fetch(url=test_url)
+        assert requests_mock.call_count == 3
+        assert sc.metrics.counters["fetch_retries"] == 2
+
+    def test_if_client_error_not_retried(self, requests_mock, scraper):
+        test_url: str = "https://www.test/advert"
+        requests_mock.get(test_url, status_code=404)
+
+        sc: OtoDomScraper = scraper()
+
+        with pytest.raises(ResponseStatusError):
+            sc.fetch(url=test_url)
+        assert requests_mock.call_count == 1
+
+    def test_if_page_without_next_data_fetched_again(
+        self, requests_mock, scraper
+    ):
+        test_url: str = "https://www.test/advert"
+        requests_mock.get(
+            test_url, [{"text": "<p>anti-bot wall</p>"}, {"text": ESTATE_PAGE}]
+        )
+
+        estate: Estate = scraper().parse_estate_record(estate_url=test_url)
+
+        assert estate.details.price == "100"
+        assert requests_mock.call_count == 2
+
+    def test_if_failed_adverts_dead_lettered_and_replayed(
+        self, requests_mock, scraper
+    ):
+        urls: List[str] = [f"https://www.test/{i}" for i in range(3)]
+        requests_mock.get(urls[0], text=ESTATE_PAGE)
+        requests_mock.get(urls[1], status_code=404)
+        requests_mock.get(urls[2], exc=ConnectionError)
+
+        sc: OtoDomScraper = scraper(
+            retry_policy={"network": {"attempts": 1}}
+        )
+        result: List[Estate] = list(sc.iter_estates(estate_links=urls))
+
+        assert [estate.url for estate in result] == urls[:1]
+        assert sc.metrics.counters["adverts_failed"] == 2
+        entries: List[Dict[str, Any]] = sc.dead_letters.read()
+        assert [(entry["url"], entry["error_class"]) for entry in entries] == [
+            (urls[1], CLIENT_ERROR),
+            (urls[2], NETWORK),
+        ]
+
+        # Advert is back, the other one fails again
+        requests_mock.get(urls[1], text=ESTATE_PAGE)
+        replayed: List[Estate] = list(sc.iter_dead_letters())
+
+        assert [estate.url for estate in replayed] == [urls[1]]
+        assert [entry["url"] for entry in sc.dead_letters.read()] == [urls[2]]
+
+    def test_if_stalled_advert_dead_lettered(self, scraper):
+        with MockOtodomServer(latency=5) as server:
+            url: str = server.result_base_url + "advert"
+            sc: OtoDomScraper = scraper(
+                request_timeout=0.1,
+                # Timeouts retried by retry policy alone
+                retry={"connect": 0, "read": 0, "redirect": 0},
+                retry_policy={"network": {"attempts": 2}},
+            )
+            start: float = time.monotonic()
+            result: List[Estate] = list(sc.iter_estates(estate_links=[url]))
+
+            assert time.monotonic() - start < 2
+            assert result == []
+            assert server.requests_served == 2
+            assert [
+                (entry["url"], entry["error_class"])
+                for entry in sc.dead_letters.read()
+            ] == [(url, NETWORK)]
+
+    def test_if_replay_keeps_checkpoint_of_interrupted_crawl(
+        self, requests_mock, tmp_path
+    ):
+        test_url: str = "https://www.test/advert"
+        requests_mock.get(test_url, text=ESTATE_PAGE)
+        params: Dict[str, Any] = {
+            **OtoDomScraper.PARAMS,
+            "verbose_logging": False,
+            "incremental": False,
+            "http_cache": {"enabled": False},
+            "results_file": str(tmp_path / "results.jsonl"),
+            "checkpoint_file": str(tmp_path / "checkpoint.json"),
+            "dead_letter_file": str(tmp_path / "dead_letters.jsonl"),
+        }
+        with open(params["checkpoint_file"], "w", encoding="utf-8") as f:
+            f.write("{}")
+        DeadLetterFile(file_path=params["dead_letter_file"]).add(
+            url=test_url, kind="advert", error=ConnectionError()
+        )
+
+        save_replay(params=params)
+
+        assert os.path.exists(params["checkpoint_file"])
+        with open(tmp_path / "results_replay.jsonl", encoding="utf-8") as f:
+            assert [json.loads(line)["url"] for line in f] == [test_url]
+
+    def test_if_only_given_dead_letters_removed(self, tmp_path):
+        dead_letters: DeadLetterFile = DeadLetterFile(
+            file_path=str(tmp_path / "dead_letters.jsonl")
+        )
+        dead_letters.add(url="a", kind="listing", error=ConnectionError())
+        dead_letters.add(url="b", kind="advert", error=ConnectionError())
+
+        entries: List[Dict[str, Any]] = dead_letters.read()
+        dead_letters.add(url="c", kind="advert", error=ConnectionError())
+
+        dead_letters.remove(entries=entries[1:])
+        assert [entry["url"] for entry in dead_letters.read()] == ["a", "c"]
+        dead_letters.remove(entries=dead_letters.read())
+        assert dead_letters.read() == []
+
+    def test_if_adverts_not_replayed_kept_when_replay_stopped(
+        self, requests_mock, scraper
+    ):
+        urls: List[str] = [f"https://www.test/{i}" for i in range(3)]
+        for url in urls:
+            requests_mock.get(url, text=ESTATE_PAGE)
+        sc: OtoDomScraper = scraper()
+        for url in urls:
+            sc.dead_letters.add(url=url, kind="advert", error=ConnectionError())
+
+        replay: Iterator[Estate] = sc.iter_dead_letters()
+        assert [next(replay).url, next(replay).url] == urls[:2]
+        # Replay stopped while the second advert is written
+        replay.close()
+
+        assert [entry["url"] for entry in sc.dead_letters.read()] == urls[1:]
+
+
+class TestCircuitBreaker:
+    def test_if_crawl_paused_when_error_rate_spikes(self):
+        breaker: CircuitBreaker = CircuitBreaker(
+            error_rate=0.5, window=4, min_requests=4, cooldown=0.1
+        )
+
+        for failed in (False, True, False):
+            breaker.acquire()
+            breaker.release(failed=failed)
+        assert breaker.state == CircuitBreaker.CLOSED
+
+        breaker.acquire()
+        breaker.release(failed=True)
+        assert breaker.state == CircuitBreaker.OPEN
+        assert breaker.reserve()[0] > 0
+
+        start: float = time.monotonic()
+        # Probe request
+        probe: bool = breaker.acquire()
+        assert probe
+        assert time.monotonic() - start >= 0.09
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        # Others wait for the probe outcome
+        assert breaker.reserve()[0] > 0
+
+        breaker.release(failed=False, probe=probe)
+        assert breaker.state == CircuitBreaker.CLOSED
+        assert breaker.reserve() == (0, False)
+
+    def test_if_failed_probe_doubles_pause(self):
+        breaker: CircuitBreaker = CircuitBreaker(
+            error_rate=0.5, window=2, min_requests=2, cooldown=0.05
+        )
+        for _ in range(2):
+            breaker.release(failed=True)
+
+        breaker.release(failed=True, probe=breaker.acquire())
+
+        assert breaker.state == CircuitBreaker.OPEN
+        assert 0.05 < breaker.reserve()[0] <= 0.1
+
+    def test_if_probe_outcome_not_decided_by_earlier_requests(self):
+        breaker: CircuitBreaker = CircuitBreaker(
+            error_rate=0.5, window=2, min_requests=2, cooldown=0.05
+        )
+        # Sent before the circuit opened, finished after probe is sent
+        assert breaker.acquire() is False
+        for _ in range(2):
+            breaker.release(failed=True)
+
+        probe: bool = breaker.acquire()
+        breaker.release(failed=False)
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+
+        breaker.release(failed=True, probe=probe)
+        assert breaker.state == CircuitBreaker.OPEN
+
+    def test_if_breaker_shared_by_search_profiles(self):
+        sc: MultiSearchScraper = MultiSearchScraper(
+            params={
+                **OtoDomScraper.PARAMS,
+                "circuit_breaker": {"enabled": True},
+                "searches": [{"name": "a"}, {"name": "b"}],
+            }
+        )
+
+        assert sc.circuit_breaker is not None
+        assert {
+            id(profile.circuit_breaker) for profile in sc.scrapers.values()
+        } == {id(sc.circuit_breaker)}
+
+    def test_if_dead_letter_file_shared_by_search_profiles(self, tmp_path):
+        sc: MultiSearchScraper = MultiSearchScraper(
+            params={
+                **OtoDomScraper.PARAMS,
+                "dead_letter_file": str(tmp_path / "dead_letters.jsonl"),
+                "searches": [{"name": "a"}, {"name": "b"}],
+            }
+        )
+
+        assert sc.dead_letters is not None
+        assert {
+            id(profile.dead_letters) for profile in sc.scrapers.values()
+        } == {id(sc.dead_letters)}
@@ -1,3 +1,4 @@
+from threading import Event
 from typing import List
 from unittest.mock import patch
 
@@ -7,7 +8,10 @@ from requests.sessions import Session
 
 from data_types.estate import Estate
 from data_types.estate_details import EstateDetails
+from data_types.estate_full_details import EstateFullDetails
+from scraper.multi_search import MultiSearchScraper
 from scraper.otodom_scraper import OtoDomScraper
+from tests.fixtures import read_fixture
 
 
 class TestScraper:
@@ -30,6 +34,30 @@ class TestScraper:
         assert isinstance(sc.session, Session)
         assert "test_header" in sc.session.headers["User-agent"]
 
+    @patch(
+        "scraper.otodom_scraper.OtoDomScraper.PARAMS",
+        {
+            "agent": "test_header",
+            "retry": {"connect": None, "read": None, "redirect": None},
+            "workers": 6,
+            "connection_pool": {
+                "size": 0,
+                "keep_alive": False,
+                "compression": False,
+            },
+        },
+    )
+    def test_if_connection_pool_set_up_from_params(
+        self, scraper: OtoDomScraper
+    ):
+        with scraper() as sc:
+            adapter = sc.session.get_adapter("https://www.otodom.pl")
+
+            # Workers and listing producer
+            assert adapter._pool_maxsize == 7
+            assert sc.session.headers["Connection"] == "close"
+            assert sc.session.headers["Accept-Encoding"] == "identity"
+
     @patch(
         "scraper.otodom_scraper.OtoDomScraper.construct_url_for_listing"
     )
@@ -61,7 +89,7 @@ class TestScraper:
         assert "test_html_markup" in bs4.text
 
     @patch("json.loads")
-    @patch("scraper.otodom_scraper.BeautifulSoup.find")
+    @patch("bs4.BeautifulSoup.find")
     def test_if_listing_links_returned(
         self, mock_find, mock_json, scraper
     ):
@@ -93,7 +121,7 @@ class TestScraper:
         )
 
     @patch("json.loads")
-    @patch("scraper.otodom_scraper.BeautifulSoup.find")
+    @patch("bs4.BeautifulSoup.find")
     def test_if_estate_details_returned(
         self, mock_find, mock_json, scraper
     ):
@@ -128,13 +156,68 @@ class TestScraper:
 
         assert "gdansk" in sc.get_estate_details(estate_soup=bs4)
 
+    def test_if_characteristics_mapped_by_key(self, scraper: OtoDomScraper):
+        script_json = {
+            "props": {
+                "pageProps": {
+                    "ad": {
+                        "description": "test_description",
+                        "target": {"City": "gdansk"},
+                        "characteristics": [
+                            {"key": "rooms_num", "value": "3"},
+                            {"key": "m", "value": "52.7"},
+                            {"key": "price", "value": "545000"},
+                        ],
+                    }
+                }
+            }
+        }
+
+        assert scraper.details_from_next_data(script_json=script_json) == [
+            "545000",
+            "52.7",
+            "gdansk",
+            "test_description",
+        ]
+
+    @patch.dict(
+        "scraper.otodom_scraper.OtoDomScraper.PARAMS", {"full_details": True}
+    )
+    def test_if_full_details_extracted_in_one_pass(
+        self, scraper: OtoDomScraper
+    ):
+        sc: OtoDomScraper = scraper()
+        estate: Estate = Estate(
+            url="test_url",
+            details=sc.build_estate_details(
+                estate_details=sc.get_estate_details(
+                    estate_soup=read_fixture("estate_page.html")
+                )
+            ),
+        )
+
+        assert isinstance(estate.details, EstateFullDetails)
+        assert estate.details.price == "545000"
+        assert estate.details.rooms == 3
+        assert estate.details.floor == "2"
+        assert estate.details.build_year == 2012
+        assert estate.details.price_per_m == 10342
+        assert estate.details.district == "chelm"
+        assert estate.details.street == "Łostowicka"
+        assert (estate.details.latitude, estate.details.longitude) == (
+            54.3301,
+            18.6188,
+        )
+        assert estate.details.features.count("balkon") == 1
+        assert estate.dict()["details"]["market"] == "secondary"
+
     @patch("scraper.otodom_scraper.OtoDomScraper.get_estate_details")
-    @patch("scraper.otodom_scraper.OtoDomScraper.get_estate_page_soup")
+    @patch("scraper.otodom_scraper.OtoDomScraper.get_estate_page_source")
     def test_if_estate_details_returned_at_parse_estate(
-        self, mock_soup, mock_details, scraper: OtoDomScraper
+        self, mock_source, mock_details, scraper: OtoDomScraper
     ):
 
-        mock_soup.return_value = None
+        mock_source.return_value = None
         mock_details.return_value = [
             "test_price",
             "test_size",
@@ -153,7 +236,6 @@ class TestScraper:
         {
             "agent": "test_header",
             "retry": {"connect": None, "read": None, "redirect": None},
-            "sleep_time": 0,
             "verbose_logging": False,
         },
     )
@@ -183,17 +265,20 @@ class TestScraper:
         {
             "agent": "test_header",
             "retry": {"connect": None, "read": None, "redirect": None},
-            "sleep_time": 0,
             "verbose_logging": False,
             "page_limit": 1,
         },
     )
-    @patch("scraper.otodom_scraper.OtoDomScraper.parse_page")
-    @patch("scraper.otodom_scraper.OtoDomScraper.get_listing_page_soup")
+    @patch("scraper.otodom_scraper.OtoDomScraper.iter_estates")
+    @patch(
+        "scraper.otodom_scraper.OtoDomScraper.get_estate_links_from_listing"
+    )
+    @patch("scraper.otodom_scraper.OtoDomScraper.get_listing_page_source")
     def test_if_list_of_estates_returned_when_parse_site(
-        self, mock_listing, mock_parse, scraper
+        self, mock_listing, mock_links, mock_parse, scraper
     ):
         mock_listing.return_value = None
+        mock_links.return_value = ["test_url_estate_1", "test_url_estate_2"]
         mock_parse.return_value = [
             Estate(
                 url="test_url_estate_1",
@@ -221,3 +306,217 @@ class TestScraper:
         assert "test_url_estate_1" in result[0].url
         assert "test_price_2" in result[1].details.price
         assert len(result) == 2
+
+    @patch(
+        "scraper.otodom_scraper.OtoDomScraper.PARAMS",
+        {
+            "agent": "test_header",
+            "retry": {"connect": None, "read": None, "redirect": None},
+            "verbose_logging": False,
+            "workers": 3,
+            "requests_per_second": 0,
+        },
+    )
+    @patch(
+        "scraper.otodom_scraper.OtoDomScraper.get_estate_links_from_listing"
+    )
+    def test_if_estates_fetched_concurrently_in_listing_order(
+        self, mock_links, requests_mock, scraper
+    ):
+        estate_page: str = (
+            '<script id="__NEXT_DATA__">{"props": {"pageProps": {"ad": '
+            '{"description": "test_description", "target": {"City": "gdansk"}, '
+            '"characteristics": [{"key": "price", "value": "PRICE zł"}, {"key": "m", "value": "10 m²"}]}}}}'
+            "</script>"
+        )
+        urls: List[str] = [f"https://www.test/{i}" for i in range(5)]
+        mock_links.return_value = urls
+        for i, url in enumerate(urls):
+            requests_mock.get(url, text=estate_page.replace("PRICE", str(i)))
+        # Advert without __NEXT_DATA__ should be skipped, not sink the page
+        requests_mock.get(urls[2], text="<p>no_data</p>")
+
+        sc: OtoDomScraper = scraper()
+        result: List[Estate] = sc.parse_page(listing_soup="test")
+
+        assert [estate.url for estate in result] == [
+            urls[0],
+            urls[1],
+            urls[3],
+            urls[4],
+        ]
+        assert [estate.details.price for estate in result] == [
+            "0",
+            "1",
+            "3",
+            "4",
+        ]
+
+    @patch(
+        "scraper.otodom_scraper.OtoDomScraper.PARAMS",
+        {
+            "agent": "test_header",
+            "retry": {"connect": None, "read": None, "redirect": None},
+            "verbose_logging": False,
+            "page_limit": 0,
+            "prefetch_pages": 1,
+        },
+    )
+    @patch("scraper.otodom_scraper.OtoDomScraper.iter_estates")
+    @patch("scraper.otodom_scraper.OtoDomScraper.get_estate_links_from_listing")
+    @patch("scraper.otodom_scraper.OtoDomScraper.get_listing_page_source")
+    def test_if_next_listing_page_prefetched_while_parsing(
+        self, mock_listing, mock_links, mock_parse, scraper
+    ):
+        page_2_requested: Event = Event()
+
+        def listing(page_no: int) -> int:
+            if page_no == 2:
+                page_2_requested.set()
+            return page_no
+
+        def parse(estate_links: List[str]) -> List[str]:
+            # Page 1 adverts finish only once page 2 was already requested
+            if estate_links == ["url_1"]:
+                assert page_2_requested.wait(timeout=5)
+            return estate_links
+
+        mock_listing.side_effect = listing
+        # Empty searchAds.items on page 3 ends the crawl
+        mock_links.side_effect = lambda listing_soup: (
+            [f"url_{listing_soup}"] if listing_soup < 3 else []
+        )
+        mock_parse.side_effect = parse
+
+        sc: OtoDomScraper = scraper()
+        result: List[str] = sc.parse_site()
+
+        assert result == ["url_1", "url_2"]
+        assert mock_listing.call_count == 3
+
+    @patch(
+        "scraper.otodom_scraper.OtoDomScraper.PARAMS",
+        {
+            "agent": "test_header",
+            "retry": {"connect": None, "read": None, "redirect": None},
+            "verbose_logging": False,
+            "page_limit": 2,
+            "prefetch_pages": 2,
+        },
+    )
+    @patch("scraper.otodom_scraper.OtoDomScraper.iter_estates")
+    @patch("scraper.otodom_scraper.OtoDomScraper.get_estate_links_from_listing")
+    @patch("scraper.otodom_scraper.OtoDomScraper.get_listing_page_source")
+    def test_if_pipelined_crawl_stops_at_page_limit(
+        self, mock_listing, mock_links, mock_parse, scraper
+    ):
+        mock_listing.side_effect = lambda page_no: page_no
+        mock_links.side_effect = lambda listing_soup: [f"url_{listing_soup}"]
+        mock_parse.side_effect = lambda estate_links: estate_links
+
+        sc: OtoDomScraper = scraper()
+
+        assert sc.parse_site() == ["url_1", "url_2"]
+        assert mock_listing.call_count == 2
+
+    @patch("scraper.otodom_scraper.OtoDomScraper.iter_estates")
+    @patch("scraper.otodom_scraper.OtoDomScraper.get_estate_links_from_listing")
+    @patch("scraper.otodom_scraper.OtoDomScraper.get_listing_page_source")
+    def test_if_incremental_crawl_skips_known_adverts(
+        self, mock_listing, mock_links, mock_parse, scraper, tmp_path
+    ):
+        params = {
+            **OtoDomScraper.PARAMS,
+            "verbose_logging": False,
+            "page_limit": 0,
+            "prefetch_pages": 1,
+            "incremental": True,
+            "seen_index_file": str(tmp_path / "index.sqlite"),
+            "checkpoint_file": None,
+        }
+        mock_listing.side_effect = lambda page_no: page_no
+        mock_links.side_effect = lambda listing_soup: [
+            f"https://www.test/slug-{listing_soup}-{i}" for i in range(2)
+        ]
+        mock_parse.side_effect = lambda estate_links: estate_links
+
+        with patch("scraper.otodom_scraper.OtoDomScraper.PARAMS", params):
+            sc: OtoDomScraper = scraper()
+            sc.seen_index.mark_seen(slugs=["slug-1-0", "slug-2-0", "slug-2-1"])
+
+            result: List[str] = sc.parse_site()
+
+        # Page 2 entirely known - walk stops before page 3
+        assert result == ["https://www.test/slug-1-1"]
+        assert mock_listing.call_count == 2
+
+    def test_if_advert_stages_recorded_in_metrics(self, requests_mock, scraper):
+        test_url: str = "https://www.test/advert"
+        with open("tests/fixtures/estate_page.html", "rb") as f:
+            requests_mock.get(test_url, content=f.read())
+
+        sc: OtoDomScraper = scraper()
+        sc.parse_estate(estate_url=test_url)
+
+        summary = sc.metrics.summary()
+        assert summary["counters"]["adverts_fetched"] == 1
+        assert summary["counters"]["bytes_downloaded"] > 0
+        assert {
+            "advert_fetch",
+            "next_data_decode",
+            "details_extraction",
+            "validation",
+        } <= set(summary["stages"])
+
+
+class TestMultiSearchScraper:
+    def test_if_overlapping_adverts_fetched_once_and_tagged(
+        self, requests_mock
+    ):
+        params = {
+            **OtoDomScraper.PARAMS,
+            "verbose_logging": False,
+            "page_limit": 1,
+            "workers": 2,
+            "requests_per_second": 0,
+            "incremental": False,
+            "searches": [
+                {"name": "chelm", "district": "chelm"},
+                {"name": "orunia", "district": "orunia"},
+            ],
+        }
+        listing_page: str = (
+            '<script id="__NEXT_DATA__">{"props": {"pageProps": {"data": '
+            '{"searchAds": {"items": [ITEMS]}}}}}</script>'
+        )
+        estate_page: str = (
+            '<script id="__NEXT_DATA__">{"props": {"pageProps": {"ad": '
+            '{"description": "test_description", "target": {"City": "gdansk"}, '
+            '"characteristics": [{"key": "price", "value": "100 zł"}, {"key": "m", "value": "10 m²"}]}}}}'
+            "</script>"
+        )
+        sc: MultiSearchScraper = MultiSearchScraper(params=params)
+
+        for name, slugs in [("chelm", ["a", "b"]), ("orunia", ["b", "c"])]:
+            requests_mock.get(
+                sc.scrapers[name].construct_url_for_listing(page=1),
+                text=listing_page.replace(
+                    "ITEMS", ", ".join(f'{{"slug": "{slug}"}}' for slug in slugs)
+                ),
+            )
+        for slug in ["a", "b", "c"]:
+            requests_mock.get(
+                params["result_base_url"] + slug, text=estate_page
+            )
+
+        result: List[Estate] = list(sc.iter_site())
+
+        assert [(estate.url[-1], estate.profiles) for estate in result] == [
+            ("a", ["chelm"]),
+            ("b", ["chelm", "orunia"]),
+            ("c", ["orunia"]),
+        ]
+        assert requests_mock.call_count == 5
+        assert all(
+            scraper.session is sc.session for scraper in sc.scrapers.values()
+        )
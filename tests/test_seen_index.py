@@ -0,0 +1,38 @@
+from storage.seen_index import SeenIndex
+
+
+class TestSeenIndex:
+    def test_if_marked_slugs_seen_after_reopen(self, tmp_path):
+        index_path: str = str(tmp_path / "index.sqlite")
+        SeenIndex(index_path=index_path, search_key="search").mark_seen(
+            slugs=["slug-1", "slug-2"]
+        )
+
+        index: SeenIndex = SeenIndex(index_path=index_path, search_key="search")
+
+        assert index.seen(slugs=["slug-1", "slug-3"]) == {"slug-1"}
+
+    def test_if_index_keyed_by_search(self, tmp_path):
+        index_path: str = str(tmp_path / "index.sqlite")
+        SeenIndex(index_path=index_path, search_key="search_1").mark_seen(
+            slugs=["slug-1"]
+        )
+
+        index: SeenIndex = SeenIndex(
+            index_path=index_path, search_key="search_2"
+        )
+
+        assert index.seen(slugs=["slug-1"]) == set()
+
+    def test_if_last_seen_refreshed(self, tmp_path):
+        index: SeenIndex = SeenIndex(
+            index_path=str(tmp_path / "index.sqlite"), search_key="search"
+        )
+        index.mark_seen(slugs=["slug-1"])
+        index.connection.execute("UPDATE seen_slugs SET last_seen = 0")
+
+        index.seen(slugs=["slug-1"])
+
+        assert index.connection.execute(
+            "SELECT last_seen FROM seen_slugs"
+        ).fetchone()[0] > 0
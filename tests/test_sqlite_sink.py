@@ -0,0 +1,61 @@
+import sqlite3
+from typing import List
+
+import pytest
+
+from data_types.estate import Estate
+from storage.sqlite_sink import SQLiteWriter
+from storage.writers import get_writer
+
+
+def estate(url: str, price: str) -> Estate:
+    return Estate(
+        url=url,
+        details={
+            "price": price,
+            "size": "52.7",
+            "location": "gdansk",
+            "description": "test_description",
+        },
+    )
+
+
+class TestSQLiteSink:
+    @pytest.fixture()
+    def db_path(self, tmp_path):
+        yield str(tmp_path / "results.sqlite")
+
+    def test_if_sqlite_writer_picked_by_extension(self, db_path):
+        with get_writer(temp_path=db_path) as writer:
+            assert isinstance(writer, SQLiteWriter)
+
+    def test_if_estates_upserted_between_runs(self, db_path):
+        with get_writer(temp_path=db_path) as writer:
+            writer.write_all(records=[estate("url_1", "100"), estate("url_2", "200")])
+        with get_writer(temp_path=db_path) as writer:
+            writer.write_all(records=[estate("url_1", "90")])
+
+        connection: sqlite3.Connection = sqlite3.connect(db_path)
+        rows: List[tuple] = connection.execute(
+            "SELECT url, price, size FROM estates ORDER BY url"
+        ).fetchall()
+
+        assert rows == [("url_1", 90.0, 52.7), ("url_2", 200.0, 52.7)]
+
+    def test_if_price_history_recorded_on_change_only(self, db_path):
+        with get_writer(temp_path=db_path, batch_size=2) as writer:
+            writer.write_all(
+                records=[
+                    estate("url_1", "100"),
+                    estate("url_1", "100"),
+                    estate("url_1", "90"),
+                    estate("url_2", "200"),
+                ]
+            )
+
+        connection: sqlite3.Connection = sqlite3.connect(db_path)
+        history: List[tuple] = connection.execute(
+            "SELECT url, price FROM price_history ORDER BY rowid"
+        ).fetchall()
+
+        assert history == [("url_1", 100.0), ("url_1", 90.0), ("url_2", 200.0)]
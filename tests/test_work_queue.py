@@ -0,0 +1,261 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+from unittest.mock import patch
+
+from benchmarks.mock_server import MockOtodomServer
+from scraper.distributed import CrawlCoordinator, QueueWorker, open_work_queue
+from scraper.otodom_scraper import OtoDomScraper
+from storage.work_queue import Task, WorkQueue
+from storage.work_queue_api import RemoteWorkQueue, WorkQueueServer
+
+
+class TestWorkQueue:
+    def test_if_duplicate_task_not_queued(self, tmp_path):
+        queue: WorkQueue = WorkQueue(queue_path=str(tmp_path / "queue.sqlite"))
+
+        assert queue.put(key="advert:a", kind="advert", payload={"url": "a"})
+        assert not queue.put(key="advert:a", kind="advert", payload={"url": "a"})
+
+        task: Task = queue.lease(owner="node-1")
+        assert task.payload == {"url": "a"}
+        assert queue.lease(owner="node-2") is None
+
+        queue.ack(task=task, owner="node-1")
+        assert queue.stats()[WorkQueue.DONE] == 1
+        # Done task is not queued again
+        assert not queue.put(key="advert:a", kind="advert", payload={"url": "a"})
+
+        # Unless next crawl is started
+        assert queue.clear_finished() == 1
+        assert queue.put(key="advert:a", kind="advert", payload={"url": "a"})
+
+    def test_if_expired_lease_requeued(self, tmp_path):
+        queue: WorkQueue = WorkQueue(
+            queue_path=str(tmp_path / "queue.sqlite"), lease_seconds=0.01
+        )
+        queue.put(key="advert:a", kind="advert", payload={"url": "a"})
+
+        lost: Task = queue.lease(owner="crashed-node")
+        time.sleep(0.02)
+        taken_over: Task = queue.lease(owner="node-2")
+
+        assert taken_over.task_id == lost.task_id
+        assert taken_over.attempts == 2
+        assert not queue.heartbeat(task=lost, owner="crashed-node")
+
+        # Late ack of node which lost the lease is ignored
+        queue.ack(task=lost, owner="crashed-node")
+        assert queue.stats()[WorkQueue.DONE] == 0
+        queue.ack(task=taken_over, owner="node-2")
+        assert queue.stats()[WorkQueue.DONE] == 1
+
+    def test_if_task_failed_after_max_attempts(self, tmp_path):
+        queue: WorkQueue = WorkQueue(
+            queue_path=str(tmp_path / "queue.sqlite"), max_attempts=2
+        )
+        queue.put(key="advert:a", kind="advert", payload={"url": "a"})
+
+        for _ in range(2):
+            queue.fail(
+                task=queue.lease(owner="node-1"), owner="node-1", error="503"
+            )
+
+        assert queue.lease(owner="node-1") is None
+        assert queue.stats()[WorkQueue.FAILED] == 1
+
+    def test_if_crawl_spread_over_nodes_without_duplicates(self, tmp_path):
+        queue_file: str = str(tmp_path / "queue.sqlite")
+
+        with MockOtodomServer(pages=2) as server:
+            params: Dict[str, Any] = {
+                **OtoDomScraper.PARAMS,
+                "search_base_url": server.search_base_url,
+                "result_base_url": server.result_base_url,
+                "page_limit": 0,
+                "requests_per_second": 0,
+                "verbose_logging": False,
+                "incremental": False,
+                "http_cache": {"enabled": False},
+                "throttle": {"enabled": False},
+                "searches": [],
+                "work_queue": {"heartbeat_seconds": 0.1, "poll_seconds": 0.05},
+            }
+            CrawlCoordinator(
+                queue=WorkQueue(queue_path=queue_file), params=params
+            ).seed()
+
+            def node(node_id: str) -> List[str]:
+                with QueueWorker(
+                    queue=WorkQueue(queue_path=queue_file),
+                    params=params,
+                    node_id=node_id,
+                ) as worker:
+                    return [estate.url for estate in worker.iter_estates()]
+
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                urls: List[List[str]] = list(
+                    executor.map(node, ["node-1", "node-2"])
+                )
+
+            # Two listing pages, empty third one and every advert once
+            assert server.requests_served == 3 + 48
+
+        assert len(urls[0]) + len(urls[1]) == len(set(urls[0] + urls[1])) == 48
+        assert WorkQueue(queue_path=queue_file).stats()[WorkQueue.DONE] == 51
+
+    def test_if_unchanged_adverts_skipped_in_queue_mode(self, tmp_path):
+        with MockOtodomServer(pages=1) as server:
+            params: Dict[str, Any] = {
+                **OtoDomScraper.PARAMS,
+                "search_base_url": server.search_base_url,
+                "result_base_url": server.result_base_url,
+                "page_limit": 1,
+                "requests_per_second": 0,
+                "verbose_logging": False,
+                "incremental": False,
+                "http_cache": {"enabled": False},
+                "throttle": {"enabled": False},
+                "searches": [],
+                "change_detection": True,
+                "fingerprint_file": str(tmp_path / "fingerprints.sqlite"),
+            }
+
+            queue: WorkQueue = WorkQueue(
+                queue_path=str(tmp_path / "queue.sqlite")
+            )
+
+            def crawl() -> List[List[str]]:
+                # Next crawl seeded on the same queue file
+                assert CrawlCoordinator(queue=queue, params=params).seed() == 1
+                with QueueWorker(queue=queue, params=params) as worker:
+                    return [estate.changed for estate in worker.iter_estates()]
+
+            assert crawl() == [["price", "size", "location", "description"]] * 24
+            assert crawl() == []
+            # Listing page and all its adverts fetched again
+            assert server.requests_served == 2 * (1 + 24)
+
+    def test_if_node_works_tasks_on_worker_threads(self, tmp_path):
+        in_flight: List[int] = [0, 0]
+        lock: threading.Lock = threading.Lock()
+        parse_estate_record = OtoDomScraper.parse_estate_record
+
+        def tracked(sc: OtoDomScraper, estate_url: str) -> Any:
+            with lock:
+                in_flight[0] += 1
+                in_flight[1] = max(in_flight)
+            time.sleep(0.02)
+            try:
+                return parse_estate_record(sc, estate_url=estate_url)
+            finally:
+                with lock:
+                    in_flight[0] -= 1
+
+        with MockOtodomServer(pages=1) as server:
+            params: Dict[str, Any] = {
+                **OtoDomScraper.PARAMS,
+                "search_base_url": server.search_base_url,
+                "result_base_url": server.result_base_url,
+                "page_limit": 1,
+                "workers": 4,
+                "requests_per_second": 0,
+                "verbose_logging": False,
+                "incremental": False,
+                "http_cache": {"enabled": False},
+                "throttle": {"enabled": False},
+                "searches": [],
+                "work_queue": {"poll_seconds": 0.05},
+            }
+            queue: WorkQueue = WorkQueue(queue_path=str(tmp_path / "queue.sqlite"))
+            CrawlCoordinator(queue=queue, params=params).seed()
+
+            with patch.object(OtoDomScraper, "parse_estate_record", tracked):
+                with QueueWorker(queue=queue, params=params) as worker:
+                    urls: List[str] = [
+                        estate.url for estate in worker.iter_estates()
+                    ]
+
+        assert len(set(urls)) == 24
+        # Leased tasks bounded by workers
+        assert in_flight[1] == 4
+        assert queue.stats()[WorkQueue.DONE] == 25
+
+    def test_if_queue_served_over_http(self, tmp_path):
+        local: WorkQueue = WorkQueue(
+            queue_path=str(tmp_path / "queue.sqlite"), lease_seconds=0.5
+        )
+
+        with WorkQueueServer(queue=local) as server:
+            queue: RemoteWorkQueue = RemoteWorkQueue(url=server.url)
+
+            assert queue.put(key="advert:a", kind="advert", payload={"url": "a"})
+            assert not queue.put(
+                key="advert:a", kind="advert", payload={"url": "a"}
+            )
+
+            lost: Task = queue.lease(owner="crashed-node")
+            assert lost.payload == {"url": "a"}
+            assert queue.heartbeat(task=lost, owner="crashed-node")
+            assert queue.lease(owner="node-2") is None
+
+            time.sleep(0.6)
+            taken_over: Task = queue.lease(owner="node-2")
+            assert taken_over.task_id == lost.task_id
+            assert taken_over.attempts == 2
+            assert not queue.heartbeat(task=lost, owner="crashed-node")
+
+            queue.ack(task=lost, owner="crashed-node")
+            queue.ack(task=taken_over, owner="node-2")
+            assert queue.stats()[WorkQueue.DONE] == 1
+            # Served queue is the coordinator queue file
+            assert local.stats()[WorkQueue.DONE] == 1
+            assert queue.clear_finished() == 1
+            queue.close()
+
+    def test_if_crawl_spread_over_hosts_by_coordinator(self, tmp_path):
+        with MockOtodomServer(pages=2) as server, WorkQueueServer(
+            queue=WorkQueue(queue_path=str(tmp_path / "queue.sqlite"))
+        ) as coordinator:
+            params: Dict[str, Any] = {
+                **OtoDomScraper.PARAMS,
+                "search_base_url": server.search_base_url,
+                "result_base_url": server.result_base_url,
+                "page_limit": 0,
+                "requests_per_second": 0,
+                "verbose_logging": False,
+                "incremental": False,
+                "http_cache": {"enabled": False},
+                "throttle": {"enabled": False},
+                "searches": [],
+                "work_queue": {
+                    # Nodes share no file with the coordinator
+                    "file": str(tmp_path / "not_used.sqlite"),
+                    "coordinator_url": coordinator.url,
+                    "heartbeat_seconds": 0.1,
+                    "poll_seconds": 0.05,
+                },
+            }
+            CrawlCoordinator(
+                queue=open_work_queue(params=params), params=params
+            ).seed()
+
+            def node(node_id: str) -> List[str]:
+                queue = open_work_queue(params=params)
+                assert isinstance(queue, RemoteWorkQueue)
+                with QueueWorker(
+                    queue=queue, params=params, node_id=node_id
+                ) as worker:
+                    return [estate.url for estate in worker.iter_estates()]
+
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                urls: List[List[str]] = list(
+                    executor.map(node, ["host-1", "host-2"])
+                )
+
+            assert server.requests_served == 3 + 48
+            assert coordinator.queue.stats()[WorkQueue.DONE] == 51
+
+        assert len(urls[0]) + len(urls[1]) == len(set(urls[0] + urls[1])) == 48
+        assert not (tmp_path / "not_used.sqlite").exists()
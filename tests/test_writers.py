@@ -0,0 +1,170 @@
+import csv
+import json
+from typing import Any, Dict, Iterator, List
+
+import pytest
+
+from data_types.estate import Estate
+from data_types.estate_full_details import EstateFullDetails
+from storage.writers import (
+    CsvWriter,
+    JsonLinesWriter,
+    TextWriter,
+    get_writer,
+    to_number,
+)
+
+
+class TestWriters:
+    @pytest.fixture()
+    def estate(self):
+        yield Estate(
+            url="test_url",
+            details={
+                "price": "545000 zł",
+                "size": "52.7 m²",
+                "location": "gdansk",
+                "description": "test_description",
+            },
+        )
+
+    def test_if_each_record_flushed_as_it_arrives(self, tmp_path):
+        results_file: str = str(tmp_path / "results.txt")
+
+        def records() -> Iterator[str]:
+            yield "record_1"
+            # First record already on disk before second one is produced
+            with open(results_file, encoding="utf-8") as f:
+                assert f.read() == "record_1\n"
+            yield "record_2"
+
+        with TextWriter(temp_path=results_file) as writer:
+            writer.write_all(records=records())
+
+        with open(results_file, encoding="utf-8") as f:
+            assert f.read() == "record_1\nrecord_2\n"
+        assert writer.records_written == 2
+
+    def test_if_writer_picked_by_extension(self, tmp_path):
+        for name, expected in [
+            ("results.txt", TextWriter),
+            ("results.jsonl", JsonLinesWriter),
+            ("results.csv", CsvWriter),
+        ]:
+            with get_writer(temp_path=str(tmp_path / name)) as writer:
+                assert type(writer) is expected
+
+    def test_if_explicit_format_overrides_extension(self, tmp_path):
+        with get_writer(
+            temp_path=str(tmp_path / "results.txt"), results_format="csv"
+        ) as writer:
+            assert isinstance(writer, CsvWriter)
+
+    def test_if_exception_when_unknown_format(self, tmp_path):
+        with pytest.raises(ValueError):
+            get_writer(temp_path=str(tmp_path / "results"), results_format="xml")
+
+    def test_if_jsonl_written_in_batches_with_numeric_fields(
+        self, tmp_path, estate
+    ):
+        results_file: str = str(tmp_path / "results.jsonl")
+
+        with get_writer(temp_path=results_file, batch_size=2) as writer:
+            writer.write(estate)
+            # Batch not full yet - nothing written
+            with open(results_file, encoding="utf-8") as f:
+                assert f.read() == ""
+            writer.write(estate)
+            writer.write(estate)
+
+        with open(results_file, encoding="utf-8") as f:
+            rows: List[Dict[str, Any]] = [json.loads(line) for line in f]
+
+        assert len(rows) == 3
+        assert rows[0]["price"] == 545000.0
+        assert rows[0]["size"] == 52.7
+        assert rows[0]["location"] == "gdansk"
+
+    def test_if_csv_written_with_header(self, tmp_path, estate):
+        results_file: str = str(tmp_path / "results.csv")
+
+        with get_writer(temp_path=results_file) as writer:
+            writer.write_all(records=[estate, estate])
+
+        with open(results_file, encoding="utf-8") as f:
+            rows: List[Dict[str, str]] = list(csv.DictReader(f))
+
+        assert len(rows) == 2
+        assert float(rows[1]["price"]) == 545000.0
+
+    @pytest.mark.parametrize("extension", ["parquet", "arrow"])
+    def test_if_columnar_file_has_numeric_columns(
+        self, tmp_path, estate, extension
+    ):
+        pyarrow = pytest.importorskip("pyarrow")
+        import pyarrow.ipc
+        import pyarrow.parquet
+
+        results_file: str = str(tmp_path / f"results.{extension}")
+
+        with get_writer(temp_path=results_file, batch_size=2) as writer:
+            writer.write_all(records=[estate] * 5)
+
+        if extension == "parquet":
+            table = pyarrow.parquet.read_table(results_file)
+        else:
+            table = pyarrow.ipc.open_file(results_file).read_all()
+
+        assert table.num_rows == 5
+        assert table.schema.field("price").type == pyarrow.float64()
+        assert table.column("size").to_pylist()[0] == 52.7
+
+    @pytest.mark.parametrize("extension", ["parquet", "arrow"])
+    def test_if_columns_empty_in_first_batch_typed(self, tmp_path, extension):
+        pyarrow = pytest.importorskip("pyarrow")
+        import pyarrow.ipc
+        import pyarrow.parquet
+
+        results_file: str = str(tmp_path / f"results.{extension}")
+        estates: List[Estate] = [
+            Estate(
+                url=f"test_url_{i}",
+                details=EstateFullDetails(
+                    # Hidden price of listing-only record
+                    price=price,
+                    size="52.7 m²",
+                    location="gdansk",
+                    description="test_description",
+                    street=street,
+                    features=features,
+                ),
+                profiles=profiles,
+            )
+            for i, (price, street, features, profiles) in enumerate(
+                [
+                    ("", None, [], ["chelm"]),
+                    ("100 zł", "Długa", ["balcony"], ["chelm", "gdansk"]),
+                ]
+            )
+        ]
+
+        with get_writer(temp_path=results_file, batch_size=1) as writer:
+            writer.write_all(records=estates)
+
+        if extension == "parquet":
+            table = pyarrow.parquet.read_table(results_file)
+        else:
+            table = pyarrow.ipc.open_file(results_file).read_all()
+
+        assert table.column("price").to_pylist() == [None, 100.0]
+        assert table.column("street").to_pylist() == [None, "Długa"]
+        assert table.column("features").to_pylist() == [[], ["balcony"]]
+        assert table.schema.field("rooms").type == pyarrow.int64()
+        assert table.schema.field("profiles").type == pyarrow.list_(
+            pyarrow.string()
+        )
+
+    def test_if_price_and_size_strings_converted_to_numbers(self):
+        assert to_number("545 000") == 545000.0
+        assert to_number("52,70") == 52.7
+        assert to_number("Zapytaj o cenę") is None